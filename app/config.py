@@ -28,6 +28,10 @@ class Settings(BaseSettings):
     # NLP 설정 (환경변수 필수!)
     SPACY_MODEL: str
     NLP_CONFIDENCE_THRESHOLD: float
+    # 로컬 의도 분류기 모델 경로 (없으면 app/data/intent_model.json)
+    INTENT_MODEL_PATH: Optional[str] = None
+    # 의도 분석 캐시 유효 시간 (초)
+    NLP_CACHE_TTL: int = 86400
 
     # API 설정 (환경변수 필수!)
     API_V1_STR: str
@@ -46,6 +50,56 @@ class Settings(BaseSettings):
     # 검색 설정 (환경변수 필수!)
     MAX_SEARCH_RESULTS: int
     SEARCH_TIMEOUT: int
+    # Gemini 응답을 이 시간(초)까지만 기다리고, 넘으면 규칙 기반 결과를 먼저 반환
+    SEARCH_HEDGE_SECONDS: float = 1.5
+    # 검색 결과 캐시 유효 시간 (초)
+    RESULT_CACHE_TTL: int = 300
+
+    # 검색어 로그 (없으면 logs/query_log.jsonl), 시작 시 캐시를 채울 상위 검색어 수
+    QUERY_LOG_PATH: Optional[str] = None
+    CACHE_WARMUP_TOP_N: int = 50
+
+    # 공유 메모리 거래내역 저장소 이름 (설정하면 워커가 로더 프로세스의 데이터를 읽기 전용으로 공유)
+    SHARED_STORE_NAME: Optional[str] = None
+    # 거래내역 추가 API 인증 토큰 (X-Append-Token 헤더 값이 같아야 추가, 없으면 API를 끔)
+    TRANSACTION_APPEND_TOKEN: Optional[str] = None
+
+    # 카드/대출 메뉴로 이동하면 맞춤 설명을 미리 생성 (Gemini 호출이 늘어나므로 기본 끔)
+    EXPLANATION_PREFETCH: bool = False
+    EXPLANATION_PREFETCH_QUEUE_SIZE: int = 8
+    # 맞춤 설명 캐시 유효 시간 (초)
+    EXPLANATION_CACHE_TTL: int = 600
+
+    # 전체 계좌 검색 시 계좌별 검색을 병렬 실행하는 스레드 수
+    ACCOUNT_FANOUT_WORKERS: int = 4
+
+    # LLM 게이트웨이 전체 동시 호출 수
+    LLM_MAX_CONCURRENCY: int = 4
+    # Gemini 호출 한 번을 기다리는 최대 시간 (초, 호출자가 마감 시각을 주면 그보다 짧게)
+    LLM_REQUEST_TIMEOUT: float = 30.0
+
+    # 클라이언트별 요청 제한 (초당 개수, 버스트): Gemini를 쓰는 요청 / 로컬 처리까지 포함한 전체 요청 (넘으면 429)
+    ADMISSION_RATE: float = 2.0
+    ADMISSION_BURST: int = 10
+    ADMISSION_HARD_RATE: float = 20.0
+    ADMISSION_HARD_BURST: int = 40
+    # X-Forwarded-For를 믿을 프록시 주소 (쉼표 구분, 없으면 헤더를 무시하고 직접 연결한 주소로 클라이언트 구분)
+    TRUSTED_PROXIES: Optional[str] = None
+    # 과부하 판단: LLM 대기열 길이, 최근 30초 Gemini 실패율
+    OVERLOAD_QUEUE_DEPTH: int = 8
+    OVERLOAD_FAILURE_RATIO: float = 0.5
+
+    # 요청별 프로파일링: X-Profile 헤더 값이 이 토큰과 같으면 프로파일 (없으면 헤더로는 끔)
+    PROFILE_TOKEN: Optional[str] = None
+    # 검색/설명 요청 N개 중 1개를 자동으로 샘플링 프로파일 (0이면 끔)
+    PROFILE_SAMPLE_EVERY: int = 0
+    # 프로파일 저장 경로 (없으면 logs/profiles)
+    PROFILE_DIR: Optional[str] = None
+
+    # 검색 응답에 구간별 소요 시간(Server-Timing 헤더)을 붙임
+    SERVER_TIMING_ENABLED: bool = True
+    # 요청별 구간을 Chrome trace 형식으로 저장할 파일 (없으면 저장하지 않음)
+    TRACE_EXPORT_PATH: Optional[str] = None
 
 
     class Config:
@@ -59,6 +113,12 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
         return self.ALLOWED_ORIGINS
 
+    def get_trusted_proxies(self) -> List[str]:
+        """신뢰하는 프록시 주소를 리스트로 변환"""
+        if not self.TRUSTED_PROXIES:
+            return []
+        return [proxy.strip() for proxy in self.TRUSTED_PROXIES.split(",") if proxy.strip()]
+
 
 def get_settings() -> Settings:
     """설정 인스턴스 생성"""
@@ -1,6 +1,7 @@
-from .mock_data import MOCK_USER_INFO, MOCK_TRANSACTIONS
+from .mock_data import MOCK_USER_INFO, MOCK_TRANSACTIONS, MOCK_ACCOUNT_TRANSACTIONS
 
 __all__ = [
     "MOCK_USER_INFO",
-    "MOCK_TRANSACTIONS"
+    "MOCK_TRANSACTIONS",
+    "MOCK_ACCOUNT_TRANSACTIONS"
 ]
\ No newline at end of file
@@ -5,7 +5,12 @@ MOCK_USER_INFO = {
     "job": "대학생",
     "account_number": "3333-01-1234567",
     "bank_name": "Mock Sol Bank",
-    "balance": 1450000
+    "balance": 1450000,
+    # 보유 계좌 (첫 번째가 주 계좌 = account_number, 거래내역은 MOCK_TRANSACTIONS)
+    "accounts": [
+        {"account_number": "3333-01-1234567", "account_name": "쏠편한 입출금통장", "balance": 1450000},
+        {"account_number": "110-987-654321", "account_name": "신한 주거래 우대통장", "balance": 820000}
+    ]
 }
 
 # 더미 거래내역 데이터 (프론트엔드와 동일)
@@ -122,4 +127,43 @@ MOCK_TRANSACTIONS = [
     }
 ]
 
-# MOCK_CONTACTS 제거 - MOCK_TRANSACTIONS에서 추출하여 사용
\ No newline at end of file
+# 주 계좌 외 계좌별 거래내역 (계좌번호 -> 거래내역, 전체 계좌 검색에 사용)
+MOCK_ACCOUNT_TRANSACTIONS = {
+    "110-987-654321": [
+        {
+            "id": "101",
+            "type": "deposit",
+            "amount": 200000,
+            "balance": 820000,
+            "description": "적금만기",
+            "bank": None,
+            "accountNumber": None,
+            "date": "2025-08-05",
+            "time": "09:10"
+        },
+        {
+            "id": "102",
+            "type": "withdrawal",
+            "amount": 30000,
+            "balance": 620000,
+            "description": "이영희",
+            "bank": "국민은행",
+            "accountNumber": "123-45-678901",
+            "date": "2025-07-28",
+            "time": "20:15"
+        },
+        {
+            "id": "103",
+            "type": "withdrawal",
+            "amount": 45000,
+            "balance": 650000,
+            "description": "교촌치킨",
+            "bank": None,
+            "accountNumber": None,
+            "date": "2025-07-20",
+            "time": "19:40"
+        }
+    ]
+}
+
+# MOCK_CONTACTS 제거 - MOCK_TRANSACTIONS에서 추출하여 사용
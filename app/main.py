@@ -1,9 +1,21 @@
-from fastapi import FastAPI, Query
+import hmac
+import threading
+
+from typing import Iterator, Optional, Tuple
+
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 
-from app.models import SearchRequest, ExplanationRequest, SearchResponse, PersonalizedExplanationResponse, ErrorResponse
-from app.services import SearchService, PersonalizedService
+from app.models import SearchRequest, ExplanationRequest, TransactionAppendRequest, SearchResponse, PersonalizedExplanationResponse, ErrorResponse
+from app.config import settings
+from app.profiling import ProfilingMiddleware, follow_profile, profiling_enabled
+from app.responses import search_json_response, json_response, sse_response
+from app.tracing import TracingMiddleware, span
+from app.services import SearchService, PersonalizedService, SuggestService
 from app.services.user_service import UserService
+from app.services.llm_gateway import get_llm_gateway, track_llm_calls
+from app.services.admission import AdmissionController, FULL, REJECT
 
 app = FastAPI(
     title="SOL Bank API",
@@ -18,9 +30,82 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 요청별 프로파일링 (X-Profile 헤더 또는 1-in-N 샘플링, 설정하지 않으면 등록하지 않음)
+if profiling_enabled():
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.PROFILE_TOKEN,
+        sample_every=settings.PROFILE_SAMPLE_EVERY,
+        directory=settings.PROFILE_DIR,
+    )
+# 검색 요청 구간별 소요 시간 (Server-Timing 헤더, 설정 시 Chrome trace 파일)
+if settings.SERVER_TIMING_ENABLED or settings.TRACE_EXPORT_PATH:
+    app.add_middleware(
+        TracingMiddleware,
+        server_timing=settings.SERVER_TIMING_ENABLED,
+        export_path=settings.TRACE_EXPORT_PATH,
+    )
 
 search_service = SearchService()
 user_service = UserService()
+# 자동완성 트라이는 시작 시 거래내역/메뉴로 한 번 구성
+suggest_service = SuggestService(search_service.transaction_repo)
+personalized_service = PersonalizedService()
+# 클라이언트별 요청 제한 + 과부하 시 로컬 처리로 전환
+admission = AdmissionController()
+trusted_proxies = frozenset(settings.get_trusted_proxies())
+
+
+def _client_id(http_request: Request) -> str:
+    """요청 제한에 쓸 클라이언트 주소
+
+    X-Forwarded-For는 누구나 보낼 수 있으므로 직접 연결한 주소가 신뢰하는 프록시일 때만 읽고,
+    뒤에서부터 신뢰하는 프록시가 아닌 첫 주소를 클라이언트로 봄 (앞쪽 주소는 클라이언트가 꾸밀 수 있음)
+    """
+    peer = http_request.client.host if http_request.client else "unknown"
+    if peer not in trusted_proxies:
+        return peer
+    forwarded = http_request.headers.get("x-forwarded-for")
+    if not forwarded:
+        return peer
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if hop not in trusted_proxies:
+            return hop
+    return hops[0] if hops else peer
+
+
+def _admit(http_request: Request) -> Tuple[str, str]:
+    """요청 처리 방식 결정 (로컬 처리 한도까지 넘으면 바로 429) - (클라이언트, 처리 방식)"""
+    client_id = _client_id(http_request)
+    decision = admission.admit(client_id)
+    if decision == REJECT:
+        raise HTTPException(status_code=429, detail="요청이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+                            headers={"Retry-After": "1"})
+    return client_id, decision
+
+
+def _settle_after(events: Iterator, client_id: str, decision: str, llm_calls) -> Iterator:
+    """스트림이 끝나면 요청 수락 정산 (Gemini를 부르지 않았으면 LLM 토큰 반환)"""
+    try:
+        yield from events
+    finally:
+        admission.settle(client_id, decision, llm_calls[0])
+
+
+async def _run_blocking(func, *args, **kwargs):
+    """Gemini 호출/대기가 있는 처리를 스레드 풀에서 실행 (이벤트 루프를 막지 않아 다른 요청이 계속 처리됨)"""
+    return await run_in_threadpool(follow_profile(func), *args, **kwargs)
+
+@app.on_event("startup")
+async def warm_up_caches():
+    """검색어 로그 상위 검색어로 의도/결과 캐시 워밍업 (요청 처리를 막지 않도록 백그라운드)"""
+    threading.Thread(target=search_service.warm_up, name="cache-warmup", daemon=True).start()
+
+@app.on_event("shutdown")
+async def shut_down_executors():
+    """대기 중인 Gemini 의도 분석 취소 (hedge 후 남은 호출 때문에 종료가 늦어지지 않도록)"""
+    search_service.close()
 
 @app.get("/")
 async def root():
@@ -30,6 +115,11 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/api/llm/metrics")
+async def llm_metrics():
+    """LLM 게이트웨이 지표 (우선순위 클래스별 대기열 길이, 대기 시간, 타임아웃) + 요청 제한 현황"""
+    return json_response(dict(get_llm_gateway().metrics(), admission=admission.stats()))
+
 # User API
 @app.get("/api/user/info")
 async def get_user_info():
@@ -37,18 +127,111 @@ async def get_user_info():
 
 
 @app.post("/api/search", response_model=SearchResponse)
-async def search(request: SearchRequest):
-    result = search_service.process_query(request.query)
-    return SearchResponse(**result)
+async def search(request: SearchRequest, http_request: Request):
+    client_id, decision = _admit(http_request)
+    llm_calls = track_llm_calls()
+    result = await _run_blocking(search_service.process_query, request.query, allow_llm=decision == FULL)
+    # 캐시/로컬 분류기로 끝나 Gemini를 부르지 않았으면 LLM 토큰을 돌려줌
+    admission.settle(client_id, decision, llm_calls[0])
+    if result.get("success"):
+        # 자주/최근 쓴 검색어 자동완성용 기록
+        suggest_service.record_query(request.query)
+    if result.get("action_type") == "menu" and decision == FULL:
+        # 카드/대출 메뉴로 이동하면 다음에 요청할 맞춤 설명을 미리 생성 (설정으로 켠 경우)
+        personalized_service.prefetch_for_route(result.get("redirect_url"))
+    # 내부 결과는 재검증 없이 바로 인코딩 (response_model은 문서화 용도)
+    with span("serialize"):
+        return search_json_response(result)
 
 
-personalized_service = PersonalizedService()
+@app.get("/api/search/suggest")
+async def search_suggest(
+        q: str = Query("", description="입력 중인 검색어 (초성 검색 지원)"),
+        limit: int = Query(10, ge=1, le=10)
+):
+    """검색어 자동완성 API (LLM 호출 없음)"""
+    return json_response({"query": q, "suggestions": suggest_service.suggest(q, limit)})
+
+
+def _check_append_token(token: Optional[str]):
+    """거래내역 추가 API 인증 (토큰을 설정하지 않으면 API 자체를 끔)
+
+    추가한 거래는 검색 결과와 송금 연락처(최근 받는 사람 계좌)에 바로 반영되므로 내부 적재용으로만 엽니다.
+    """
+    expected = settings.TRANSACTION_APPEND_TOKEN
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="거래내역 추가 권한이 없습니다.")
+
+
+def _append_transactions(items):
+    """거래내역 추가 + 자동완성 반영 (새 스냅샷 구성이 거래 수에 비례하므로 스레드 풀에서 실행)"""
+    records = search_service.append_transactions(items)
+    for record in records:
+        suggest_service.add_transaction(record)
+    return records
+
+
+@app.post("/api/transactions")
+async def append_transactions(request: TransactionAppendRequest,
+                              x_append_token: Optional[str] = Header(None)):
+    """새 거래내역 추가 API (검색/연락처/집계/자동완성에 바로 반영, X-Append-Token 필요)"""
+    _check_append_token(x_append_token)
+    try:
+        records = await _run_blocking(_append_transactions, [item.dict() for item in request.transactions])
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return json_response({
+        "success": True,
+        "appended": len(records),
+        "total_count": len(search_service.transaction_repo),
+        "transactions": records
+    })
+
+
+@app.get("/api/analytics")
+async def analytics(
+        group_by: str = Query("month", description="month, weekday, hour, merchant, recipient, category, pattern"),
+        date_from: Optional[str] = Query(None, description="시작일 (YYYY-MM-DD)"),
+        date_to: Optional[str] = Query(None, description="종료일 (YYYY-MM-DD)"),
+        flow: str = Query("expense", regex="^(expense|income|all)$"),
+        limit: Optional[int] = Query(None, ge=1, le=1000)
+):
+    """거래내역 집계 API (월별/요일별/시간대별/가맹점별/받는 사람별/카테고리별, pattern = 요일별 + 시간대별)"""
+    try:
+        if group_by == "pattern":
+            result = search_service.analytics.spending_pattern(date_from, date_to)
+        else:
+            result = search_service.analytics.summarize(group_by, date_from, date_to, flow, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response(result)
+
 
 @app.post("/api/personalized-explanation", response_model=PersonalizedExplanationResponse)
-async def get_personalized_explanation(request: ExplanationRequest):
+async def get_personalized_explanation(request: ExplanationRequest, http_request: Request):
     """맞춤형 상품 설명 API"""
-    result = personalized_service.get_personalized_explanation(
+    client_id, decision = _admit(http_request)
+    llm_calls = track_llm_calls()
+    result = await _run_blocking(
+        personalized_service.get_personalized_explanation,
+        product_type=request.product_type,
+        product_id=request.product_id,
+        allow_llm=decision == FULL,
+    )
+    admission.settle(client_id, decision, llm_calls[0])
+    return PersonalizedExplanationResponse(**result)
+
+
+@app.post("/api/personalized-explanation/stream")
+async def stream_personalized_explanation(request: ExplanationRequest, http_request: Request):
+    """맞춤형 상품 설명 스트리밍 API (SSE: context → explanation 조각 → key_point/recommendation/easy_term → done)"""
+    client_id, decision = _admit(http_request)
+    llm_calls = track_llm_calls()
+    events = personalized_service.stream_personalized_explanation(
         product_type=request.product_type,
         product_id=request.product_id,
+        allow_llm=decision == FULL,
     )
-    return PersonalizedExplanationResponse(**result)
\ No newline at end of file
+    return sse_response(_settle_after(events, client_id, decision, llm_calls))
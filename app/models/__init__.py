@@ -1,11 +1,15 @@
-from .request import SearchRequest, ExplanationRequest
+from .request import SearchRequest, ExplanationRequest, TransactionAppendRequest
 from .response import SearchResponse, PersonalizedExplanationResponse, ErrorResponse
+from .transaction import AccountTransaction, TransactionRecord
 
 # 자주 사용되는 모델들을 패키지 레벨에서 import 가능하게
 __all__ = [
     "SearchRequest",
     "ExplanationRequest",
+    "TransactionAppendRequest",
     "SearchResponse",
     "PersonalizedExplanationResponse",
-    "ErrorResponse"
+    "ErrorResponse",
+    "TransactionRecord",
+    "AccountTransaction"
 ]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class SearchRequest(BaseModel):
     query: str
@@ -20,4 +20,41 @@ class ExplanationRequest(BaseModel):
                 "product_type": "card",
                 "product_id": "shinhan-check"
             }
-        }
\ No newline at end of file
+        }
+
+class TransactionInput(BaseModel):
+    """추가할 거래내역 한 건 (프론트엔드 거래내역 형식)"""
+    id: str
+    type: str  # "deposit", "withdrawal", "결제", "송금" 등
+    amount: int
+    balance: int
+    description: str
+    bank: Optional[str] = None
+    accountNumber: Optional[str] = None
+    date: str  # YYYY-MM-DD
+    time: str  # HH:MM
+    category: Optional[str] = None
+    merchant: Optional[str] = None
+    memo: Optional[str] = None
+
+
+class TransactionAppendRequest(BaseModel):
+    transactions: List[TransactionInput]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "transactions": [
+                    {
+                        "id": "1001",
+                        "type": "결제",
+                        "amount": 5600,
+                        "balance": 1234400,
+                        "description": "스타벅스 강남점",
+                        "date": "2025-08-10",
+                        "time": "09:12",
+                        "category": "카페"
+                    }
+                ]
+            }
+        }
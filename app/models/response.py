@@ -15,6 +15,8 @@ class SearchResponse(BaseModel):
     confidence: Optional[float] = None
     message: Optional[str] = None
     suggestions: Optional[List[str]] = []
+    # 요청 제한/과부하로 Gemini 없이 로컬 파서로 처리한 결과
+    degraded: bool = False
 
     class Config:
         schema_extra = {
@@ -41,6 +43,8 @@ class PersonalizedExplanationResponse(BaseModel):
     key_points: List[str]
     recommendations: List[str]
     user_context: Dict[str, Any]
+    # 요청 제한/과부하로 Gemini 없이 기본 설명을 반환한 경우
+    degraded: bool = False
 
     class Config:
         schema_extra = {
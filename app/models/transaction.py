@@ -0,0 +1,175 @@
+from typing import Any, Dict, Optional, Tuple
+
+# 송금(계좌로 보낸 출금)으로 취급하는 거래 타입
+TRANSFER_TYPES = frozenset({"withdrawal", "송금"})
+# 돈이 빠져나가는 거래 타입 (프론트엔드 형식은 금액이 양수로 저장됨)
+OUTFLOW_TYPES = frozenset({"withdrawal", "결제", "송금"})
+
+
+class TransactionRecord:
+    """불변 거래내역 레코드
+
+    레포지토리와 SearchService가 같은 객체를 공유합니다.
+    __slots__로 행당 메모리를 줄이고, 변경이 불가능하므로 방어적 복사 없이 그대로 반환합니다.
+    dict 변환은 응답 직렬화 시점(to_dict)에만 합니다.
+    """
+
+    __slots__ = (
+        "id", "type", "amount", "balance", "description", "bank", "accountNumber",
+        "date", "time", "category", "merchant", "memo",
+    )
+
+    # 값이 있을 때만 응답에 포함되는 확장 필드
+    _OPTIONAL_FIELDS = ("category", "merchant", "memo")
+
+    def __init__(self, id: str, type: str, amount: int, balance: int, description: str,
+                 bank: Optional[str], accountNumber: Optional[str], date: str, time: str,
+                 category: Optional[str] = None, merchant: Optional[str] = None, memo: Optional[str] = None):
+        setter = object.__setattr__
+        setter(self, "id", id)
+        setter(self, "type", type)
+        setter(self, "amount", amount)
+        setter(self, "balance", balance)
+        setter(self, "description", description)
+        setter(self, "bank", bank)
+        setter(self, "accountNumber", accountNumber)
+        setter(self, "date", date)
+        setter(self, "time", time)
+        setter(self, "category", category)
+        setter(self, "merchant", merchant)
+        setter(self, "memo", memo)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("TransactionRecord는 변경할 수 없습니다")
+
+    def __delattr__(self, name: str):
+        raise AttributeError("TransactionRecord는 변경할 수 없습니다")
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, TransactionRecord):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __repr__(self) -> str:
+        return f"TransactionRecord(id={self.id!r}, date={self.date!r}, time={self.time!r}, " \
+               f"type={self.type!r}, amount={self.amount!r}, description={self.description!r})"
+
+    @property
+    def is_transfer(self) -> bool:
+        """계좌 정보가 남아 있는 송금 거래인지 여부"""
+        return (self.type in TRANSFER_TYPES
+                and self.bank is not None
+                and self.accountNumber is not None)
+
+    @property
+    def sort_key(self) -> Tuple[str, str, Tuple[int, Any]]:
+        """(날짜, 시간, ID) 정렬 키 - 숫자 ID는 숫자 순서로 비교"""
+        id_key = (0, int(self.id)) if self.id.isdigit() else (1, self.id)
+        return self.date, self.time, id_key
+
+    @property
+    def signed_amount(self) -> int:
+        """입금은 양수, 출금은 음수인 금액"""
+        if self.type in OUTFLOW_TYPES:
+            return -abs(self.amount)
+        return abs(self.amount)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TransactionRecord":
+        """거래내역 dict를 레코드로 변환
+
+        프론트엔드 형식(description/bank/accountNumber)과
+        기존 레포지토리 형식(merchant/recipient_name/recipient_bank/recipient_account)을 모두 지원합니다.
+        """
+        if "description" in data:
+            return cls(
+                id=str(data["id"]),
+                type=data["type"],
+                amount=data["amount"],
+                balance=data["balance"],
+                description=data["description"],
+                bank=data.get("bank"),
+                accountNumber=data.get("accountNumber"),
+                date=data["date"],
+                time=data["time"],
+                category=data.get("category"),
+                merchant=data.get("merchant"),
+                memo=data.get("memo"),
+            )
+
+        return cls(
+            id=str(data["id"]),
+            type=data["type"],
+            amount=data["amount"],
+            balance=data["balance"],
+            description=data.get("merchant") or data.get("recipient_name") or "",
+            bank=data.get("recipient_bank"),
+            accountNumber=data.get("recipient_account"),
+            date=data["date"],
+            time=data["time"],
+            category=data.get("category"),
+            merchant=data.get("merchant"),
+            memo=data.get("memo"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """응답용 dict로 변환 (프론트엔드 거래내역 형식)"""
+        data = {
+            "id": self.id,
+            "type": self.type,
+            "amount": self.amount,
+            "balance": self.balance,
+            "description": self.description,
+            "bank": self.bank,
+            "accountNumber": self.accountNumber,
+            "date": self.date,
+            "time": self.time,
+        }
+        for name in self._OPTIONAL_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        return data
+
+
+class AccountTransaction:
+    """어느 계좌의 거래인지 표시한 거래내역 (여러 계좌 검색 결과 병합용)
+
+    레코드 필드(date, amount, sort_key 등)는 그대로 읽을 수 있고, 응답에는 "account" 필드가 추가됩니다.
+    accountNumber는 송금 상대 계좌이므로 거래가 속한 계좌는 account로 구분합니다.
+    """
+
+    __slots__ = ("account", "record")
+
+    def __init__(self, account: str, record: TransactionRecord):
+        object.__setattr__(self, "account", account)
+        object.__setattr__(self, "record", record)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.record, name)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("AccountTransaction은 변경할 수 없습니다")
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, AccountTransaction):
+            return NotImplemented
+        return self.account == other.account and self.record == other.record
+
+    def __hash__(self) -> int:
+        return hash((self.account, self.record))
+
+    def __repr__(self) -> str:
+        return f"AccountTransaction(account={self.account!r}, record={self.record!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """응답용 dict로 변환 (거래내역 형식 + account)"""
+        data = self.record.to_dict()
+        data["account"] = self.account
+        return data
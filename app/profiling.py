@@ -0,0 +1,204 @@
+"""
+요청별 프로파일링 미들웨어
+
+운영에서 특정 검색어가 느릴 때 어디서 시간이 드는지 보기 위한 opt-in 프로파일러입니다.
+- X-Profile 헤더 값이 PROFILE_TOKEN과 같으면 그 요청을 프로파일
+  (X-Profile-Mode: cprofile이면 결정적 프로파일러(pstats), 기본은 샘플링(collapsed stacks))
+- PROFILE_SAMPLE_EVERY=N이면 N개 요청 중 1개를 자동으로 샘플링 프로파일
+- 결과는 PROFILE_DIR(없으면 logs/profiles)에 <id>.prof 또는 <id>.collapsed로 저장하고
+  응답의 X-Profile-Id 헤더로 id를 돌려줌
+
+collapsed stacks는 flamegraph.pl, speedscope로, pstats는 snakeviz나 python -m pstats로 볼 수 있습니다.
+대상은 검색/맞춤 설명 요청의 이벤트 루프 스레드 처리와, follow_profile로 감싸 스레드 풀에 넘긴 처리입니다
+(스트리밍 응답 본문은 제외).
+토큰과 자동 샘플링이 모두 꺼져 있으면 미들웨어를 등록하지 않습니다.
+"""
+import contextvars
+import cProfile
+import hmac
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from typing import List, Optional
+
+from app.config import settings
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs", "profiles")
+PROFILE_HEADER = b"x-profile"
+PROFILE_MODE_HEADER = b"x-profile-mode"
+PROFILE_ID_HEADER = b"x-profile-id"
+# 프로파일 대상 경로
+PROFILED_PATHS = ("/api/search", "/api/personalized-explanation")
+# 샘플링 간격 (초)
+SAMPLE_INTERVAL = 0.005
+
+
+class StackSampler:
+    """지정한 스레드들의 호출 스택을 주기적으로 샘플링해 collapsed stacks로 모음"""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_ids = {thread_id}
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def add_thread(self, thread_id: int):
+        self.thread_ids = self.thread_ids | {thread_id}
+
+    def remove_thread(self, thread_id: int):
+        self.thread_ids = self.thread_ids - {thread_id}
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in self.thread_ids:
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if stack:
+                    self.stacks[";".join(reversed(stack))] += 1
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class _ProfileSession:
+    """요청 하나의 프로파일 (이벤트 루프 스레드 + 이 요청이 스레드 풀에 넘긴 처리)"""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.sampler: Optional[StackSampler] = None
+        # cProfile은 스레드마다 따로 켜고 저장할 때 합침
+        self.profiles: List[cProfile.Profile] = []
+
+    def start(self):
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            self.profiles.append(profiler)
+        else:
+            self.sampler = StackSampler(threading.get_ident())
+            self.sampler.start()
+
+    @contextmanager
+    def thread(self):
+        """현재(스레드 풀) 스레드의 실행을 이 요청의 프로파일에 포함"""
+        thread_id = threading.get_ident()
+        if self.sampler is not None:
+            self.sampler.add_thread(thread_id)
+            try:
+                yield
+            finally:
+                self.sampler.remove_thread(thread_id)
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self.profiles.append(profiler)
+
+    def save(self, directory: str, profile_id: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        if self.sampler is not None:
+            self.sampler.stop()
+            path = os.path.join(directory, f"{profile_id}.collapsed")
+            self.sampler.dump(path)
+            return path
+        self.profiles[0].disable()
+        stats = pstats.Stats(self.profiles[0])
+        for profiler in self.profiles[1:]:
+            stats.add(profiler)
+        path = os.path.join(directory, f"{profile_id}.prof")
+        stats.dump_stats(path)
+        return path
+
+
+_session: contextvars.ContextVar[Optional[_ProfileSession]] = contextvars.ContextVar("profile_session", default=None)
+
+
+def follow_profile(func):
+    """스레드 풀에서 실행할 함수를 감쌈 (프로파일 중인 요청이면 그 스레드도 프로파일에 포함)"""
+    session = _session.get()
+    if session is None:
+        return func
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with session.thread():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class ProfilingMiddleware:
+    """헤더 또는 1-in-N 샘플링으로 요청을 프로파일하는 ASGI 미들웨어"""
+
+    def __init__(self, app, token: Optional[str] = None, sample_every: int = 0, directory: Optional[str] = None):
+        self.app = app
+        self.token = token.encode("utf-8") if token else None
+        self.sample_every = sample_every
+        self.directory = directory or DEFAULT_PROFILE_DIR
+        self._counter = itertools.count(1)
+
+    def _mode(self, scope) -> Optional[str]:
+        """프로파일 방식 ("sample", "cprofile"), 대상이 아니면 None"""
+        if scope["type"] != "http" or scope["path"] not in PROFILED_PATHS:
+            return None
+        if self.token is not None:
+            headers = dict(scope["headers"])
+            value = headers.get(PROFILE_HEADER)
+            if value is not None and hmac.compare_digest(value, self.token):
+                return "cprofile" if headers.get(PROFILE_MODE_HEADER) == b"cprofile" else "sample"
+        if self.sample_every and next(self._counter) % self.sample_every == 0:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        mode = self._mode(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(PROFILE_ID_HEADER, profile_id.encode())]
+            await send(message)
+
+        session = _ProfileSession(mode)
+        session.start()
+        token = _session.set(session)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _session.reset(token)
+            elapsed = time.perf_counter() - started
+            path = session.save(self.directory, profile_id)
+            print(f"🔬 프로파일 저장 ({mode}, {scope['path']}, {elapsed * 1000:.1f}ms): {path}")
+
+
+def profiling_enabled() -> bool:
+    return bool(settings.PROFILE_TOKEN or settings.PROFILE_SAMPLE_EVERY)
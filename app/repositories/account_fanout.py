@@ -0,0 +1,94 @@
+"""
+계좌별 파티션 검색 (fan-out + k-way merge)
+
+고객의 계좌마다 거래내역 레포지토리가 따로 있을 때, 같은 필터를 계좌별로 병렬 실행하고
+최신순 부분 결과를 (날짜, 시간) 기준 k-way merge로 합칩니다.
+- 계좌마다 offset+limit건만 쿼리 플래너의 상위 k 힙으로 뽑으므로 계좌별 전체 결과를 만들지 않음
+- 합칠 때도 heapq.merge로 필요한 만큼만 꺼냄
+- 병합한 거래에는 어느 계좌의 거래인지(AccountTransaction.account) 표시
+- 건수와 facet은 계좌별 비트맵 popcount의 합
+- 계좌가 하나면 스레드 풀을 거치지 않음
+"""
+import contextvars
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.models.transaction import AccountTransaction, TransactionRecord
+from app.repositories.transaction_repo import TransactionRepository
+
+
+def _tagged(account: str, records: List[TransactionRecord]) -> Iterator[Tuple[str, TransactionRecord]]:
+    for record in records:
+        yield account, record
+
+
+def merge_recent(partials: Dict[str, List[TransactionRecord]]) -> Iterator[AccountTransaction]:
+    """최신순으로 정렬된 계좌별 결과(계좌번호 -> 거래)를 계좌를 표시한 하나의 최신순 스트림으로 병합
+
+    계좌 표시는 꺼낸 거래에만 붙이므로 페이지 밖의 거래는 감싸지 않습니다.
+    """
+    merged = heapq.merge(*(_tagged(account, records) for account, records in partials.items()),
+                         key=lambda item: item[1].sort_key, reverse=True)
+    return (AccountTransaction(account, record) for account, record in merged)
+
+
+class AccountFanout:
+    """계좌별 레포지토리에 같은 검색을 병렬 실행하고 결과를 병합"""
+
+    def __init__(self, partitions_getter: Callable[[], Dict[str, TransactionRepository]], max_workers: int = 4):
+        # 계좌번호 -> 레포지토리 (거래 추가/공유 저장소 교체를 따라가도록 매번 getter로 가져옴)
+        self._get_partitions = partitions_getter
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="account-fanout")
+
+    def accounts(self) -> List[str]:
+        return list(self._get_partitions())
+
+    def query(self, filters: Dict[str, Any], offset: int = 0, limit: int = 20, with_facets: bool = False,
+              accounts: Optional[List[str]] = None) -> Dict[str, Any]:
+        """전체(또는 지정한) 계좌의 거래내역을 최신순 페이지로 반환
+
+        TransactionRepository.query와 같은 형식이며, transactions의 각 거래는 계좌를 표시한 AccountTransaction입니다.
+        """
+        partitions = self._get_partitions()
+        if accounts:
+            partitions = {account: repo for account, repo in partitions.items() if account in accounts}
+        window = offset + limit
+
+        if len(partitions) == 1:
+            ((account, repo),) = partitions.items()
+            partials = {account: repo.query(filters, 0, window, with_facets)}
+        else:
+            # 요청 추적 컨텍스트를 넘기기 위해 작업마다 컨텍스트 복사
+            futures = {
+                account: self._executor.submit(contextvars.copy_context().run, repo.query, filters, 0, window, with_facets)
+                for account, repo in partitions.items()
+            }
+            partials = {account: future.result() for account, future in futures.items()}
+
+        merged = merge_recent({account: partial["transactions"] for account, partial in partials.items()})
+        result = {
+            "transactions": list(islice(merged, offset, window)),
+            "total_count": sum(partial["total_count"] for partial in partials.values()),
+            "offset": offset,
+            "limit": limit,
+            "accounts": {account: partial["total_count"] for account, partial in partials.items()},
+            "explain": {
+                "merge": "k-way",
+                "accounts": {account: partial["explain"] for account, partial in partials.items()}
+            }
+        }
+        if with_facets:
+            result["facets"] = _sum_facets(partial["facets"] for partial in partials.values())
+        return result
+
+
+def _sum_facets(facets_list: Iterable[Dict[str, Dict[str, int]]]) -> Dict[str, Dict[str, int]]:
+    totals: Dict[str, Dict[str, int]] = {}
+    for facets in facets_list:
+        for field, counts in facets.items():
+            field_totals = totals.setdefault(field, {})
+            for value, count in counts.items():
+                field_totals[value] = field_totals.get(value, 0) + count
+    return totals
@@ -0,0 +1,221 @@
+"""
+Roaring 방식 압축 비트맵
+
+rowid의 상위 16비트로 컨테이너를 나누고, 컨테이너마다
+원소가 적으면 정렬된 배열(list), 많으면 65536비트 비트맵(int)으로 저장합니다.
+거래 타입/카테고리/은행처럼 값 종류가 적은 컬럼의 인덱스에 사용하며,
+AND/OR 연산과 popcount(int.bit_count)로 건수를 빠르게 계산합니다.
+"""
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Union
+
+# 배열 컨테이너의 최대 원소 수 (이보다 많으면 비트맵 컨테이너로 변환)
+ARRAY_LIMIT = 4096
+_LOW_MASK = 0xFFFF
+
+Container = Union[List[int], int]
+
+# 바이트 값 -> 켜진 비트 위치
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def _to_bitmap(values: List[int]) -> int:
+    bits = 0
+    for value in values:
+        bits |= 1 << value
+    return bits
+
+
+def _to_array(bits: int) -> List[int]:
+    """비트맵 컨테이너를 정렬된 배열로 변환 (바이트 단위 테이블 조회)"""
+    values = []
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for index, byte in enumerate(data):
+        if byte:
+            base = index << 3
+            values.extend(base + bit for bit in _BYTE_BITS[byte])
+    return values
+
+
+def _copy(container: Container) -> Container:
+    """배열 컨테이너는 리스트를 복사 (비트맵 컨테이너는 int라 불변)"""
+    return list(container) if isinstance(container, list) else container
+
+
+def _cardinality(container: Container) -> int:
+    return len(container) if isinstance(container, list) else container.bit_count()
+
+
+def _normalize(container: Container) -> Container:
+    """원소 수에 맞는 컨테이너 형태로 변환"""
+    if isinstance(container, int) and container.bit_count() <= ARRAY_LIMIT:
+        return _to_array(container)
+    if isinstance(container, list) and len(container) > ARRAY_LIMIT:
+        return _to_bitmap(container)
+    return container
+
+
+def _and(left: Container, right: Container) -> Container:
+    if isinstance(left, int) and isinstance(right, int):
+        return _normalize(left & right)
+    if isinstance(left, int):
+        left, right = right, left
+    if isinstance(right, int):
+        return [value for value in left if right >> value & 1]
+    if len(left) > len(right):
+        left, right = right, left
+    members = set(right)
+    return [value for value in left if value in members]
+
+
+def _and_cardinality(left: Container, right: Container) -> int:
+    if isinstance(left, int) and isinstance(right, int):
+        return (left & right).bit_count()
+    if isinstance(left, int):
+        left, right = right, left
+    if isinstance(right, int):
+        return sum(1 for value in left if right >> value & 1)
+    if len(left) > len(right):
+        left, right = right, left
+    members = set(right)
+    return sum(1 for value in left if value in members)
+
+
+def _or(left: Container, right: Container) -> Container:
+    if isinstance(left, list) and isinstance(right, list):
+        return _normalize(sorted(set(left).union(right)))
+    left_bits = left if isinstance(left, int) else _to_bitmap(left)
+    right_bits = right if isinstance(right, int) else _to_bitmap(right)
+    return left_bits | right_bits
+
+
+class RoaringBitmap:
+    """rowid 집합을 저장하는 압축 비트맵"""
+
+    __slots__ = ("_containers",)
+
+    def __init__(self, values: Iterable[int] = ()):
+        self._containers: Dict[int, Container] = {}
+        for value in values:
+            self.add(value)
+
+    @classmethod
+    def _from_containers(cls, containers: Dict[int, Container]) -> "RoaringBitmap":
+        bitmap = cls()
+        bitmap._containers = {key: value for key, value in containers.items() if _cardinality(value)}
+        return bitmap
+
+    def add(self, value: int):
+        key, low = value >> 16, value & _LOW_MASK
+        container = self._containers.get(key)
+        if container is None:
+            self._containers[key] = [low]
+        elif isinstance(container, int):
+            self._containers[key] = container | (1 << low)
+        else:
+            # rowid는 대부분 증가하는 순서로 들어오므로 끝에 붙이는 경우를 먼저 처리
+            if not container or container[-1] < low:
+                container.append(low)
+            else:
+                position = bisect_left(container, low)
+                if position < len(container) and container[position] == low:
+                    return
+                container.insert(position, low)
+            if len(container) > ARRAY_LIMIT:
+                self._containers[key] = _to_bitmap(container)
+
+    def discard(self, value: int):
+        key, low = value >> 16, value & _LOW_MASK
+        container = self._containers.get(key)
+        if container is None:
+            return
+        if isinstance(container, int):
+            container &= ~(1 << low)
+        else:
+            position = bisect_left(container, low)
+            if position < len(container) and container[position] == low:
+                container = container[:position] + container[position + 1:]
+        container = _normalize(container)
+        if _cardinality(container):
+            self._containers[key] = container
+        else:
+            del self._containers[key]
+
+    def copy(self) -> "RoaringBitmap":
+        return RoaringBitmap._from_containers({key: _copy(value) for key, value in self._containers.items()})
+
+    def __contains__(self, value: int) -> bool:
+        container = self._containers.get(value >> 16)
+        if container is None:
+            return False
+        low = value & _LOW_MASK
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+        position = bisect_left(container, low)
+        return position < len(container) and container[position] == low
+
+    def __len__(self) -> int:
+        return sum(_cardinality(container) for container in self._containers.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._containers)
+
+    def __iter__(self) -> Iterator[int]:
+        for key in sorted(self._containers):
+            base = key << 16
+            container = self._containers[key]
+            values = _to_array(container) if isinstance(container, int) else container
+            for low in values:
+                yield base | low
+
+    def __and__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        containers = {}
+        for key, container in self._containers.items():
+            other_container = other._containers.get(key)
+            if other_container is not None:
+                containers[key] = _and(container, other_container)
+        return RoaringBitmap._from_containers(containers)
+
+    def __or__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        containers = {key: _copy(container) for key, container in self._containers.items()}
+        for key, container in other._containers.items():
+            current = containers.get(key)
+            containers[key] = _copy(container) if current is None else _or(current, container)
+        return RoaringBitmap._from_containers(containers)
+
+    def and_cardinality(self, other: "RoaringBitmap") -> int:
+        """교집합을 만들지 않고 교집합 건수만 계산"""
+        count = 0
+        for key, container in self._containers.items():
+            other_container = other._containers.get(key)
+            if other_container is not None:
+                count += _and_cardinality(container, other_container)
+        return count
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RoaringBitmap):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"RoaringBitmap(cardinality={len(self)}, containers={len(self._containers)})"
+
+    @staticmethod
+    def union_all(bitmaps: Iterable["RoaringBitmap"]) -> "RoaringBitmap":
+        """여러 비트맵의 합집합 (컨테이너 키별로 한 번에 병합해 중간 결과를 반복 복사하지 않음)"""
+        grouped: Dict[int, List[Container]] = {}
+        for bitmap in bitmaps:
+            for key, container in bitmap._containers.items():
+                grouped.setdefault(key, []).append(container)
+        containers = {}
+        for key, parts in grouped.items():
+            if len(parts) == 1:
+                containers[key] = _copy(parts[0])
+            elif all(isinstance(part, list) for part in parts) and sum(map(len, parts)) <= ARRAY_LIMIT:
+                containers[key] = sorted(set().union(*parts))
+            else:
+                bits = 0
+                for part in parts:
+                    bits |= part if isinstance(part, int) else _to_bitmap(part)
+                containers[key] = _normalize(bits)
+        return RoaringBitmap._from_containers(containers)
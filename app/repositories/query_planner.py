@@ -0,0 +1,136 @@
+"""
+거래내역 다중 조건 쿼리 플래너
+
+가맹점, 받는 사람, 기간, 거래 타입, 금액 범위, 카테고리, 은행 조건을 한 번에 받아
+선택도가 가장 높은(후보가 가장 적은) 인덱스부터 후보 집합을 만들고,
+나머지 조건은 비트맵 교집합 또는 행 단위 필터 중 싼 쪽으로 적용합니다.
+"""
+import heapq
+from itertools import islice
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from app.models.transaction import TransactionRecord
+from .bitmap import RoaringBitmap
+
+# 지원하는 필터 키
+FILTER_KEYS = ("merchant", "recipient", "date_from", "date_to", "type", "min_amount", "max_amount", "category", "bank")
+
+
+class AccessPath(NamedTuple):
+    """하나의 조건을 처리하는 방법"""
+    name: str                                           # explain에 표시할 인덱스/조건 이름
+    estimate: int                                       # 예상 후보 수
+    fetch_cost: int                                     # 후보 집합을 만드는 비용 (0이면 이미 만들어진 집합)
+    fetch: Optional[Callable[[], RoaringBitmap]]        # 후보 rowid 비트맵 생성 (인덱스가 없으면 None)
+    predicate: Callable[[TransactionRecord], bool]      # 행 단위 검사
+
+
+class QueryPlanner:
+    """TransactionRepository 인덱스 위에서 동작하는 쿼리 플래너"""
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    def plan(self, filters: Dict[str, Any]) -> List[AccessPath]:
+        """조건별 접근 경로를 예상 후보 수가 적은 순서로 반환"""
+        repo = self.repository
+        paths: List[AccessPath] = []
+
+        merchant = filters.get("merchant")
+        if merchant:
+            paths.append(repo.merchant_access_path(merchant))
+
+        recipient = filters.get("recipient")
+        if recipient:
+            paths.append(repo.recipient_access_path(recipient))
+
+        if filters.get("date_from") or filters.get("date_to"):
+            paths.append(repo.date_access_path(filters.get("date_from"), filters.get("date_to")))
+
+        transaction_type = filters.get("type")
+        if transaction_type and transaction_type != "all":
+            paths.append(repo.type_access_path(transaction_type))
+
+        category = filters.get("category")
+        if category:
+            paths.append(repo.category_access_path(category))
+
+        bank = filters.get("bank")
+        if bank:
+            paths.append(repo.bank_access_path(bank))
+
+        if filters.get("min_amount") is not None or filters.get("max_amount") is not None:
+            paths.append(repo.amount_access_path(filters.get("min_amount"), filters.get("max_amount")))
+
+        # 인덱스가 있는 경로를 우선, 그 안에서는 예상 후보 수가 적은 순서
+        paths.sort(key=lambda path: (path.fetch is None, path.estimate))
+        return paths
+
+    def execute(self, filters: Dict[str, Any], offset: int = 0, limit: int = 20,
+                with_facets: bool = False) -> Dict[str, Any]:
+        """조건에 맞는 거래내역을 최신순으로 페이지 단위 반환"""
+        repo = self.repository
+        paths = self.plan(filters)
+        steps: List[Dict[str, Any]] = []
+
+        candidates: Optional[RoaringBitmap] = None
+        residual: List[AccessPath] = []
+
+        for path in paths:
+            if candidates is None:
+                if path.fetch is None:
+                    residual.append(path)
+                    continue
+                candidates = path.fetch()
+                steps.append({"index": path.name, "estimate": path.estimate,
+                              "method": "scan-index", "candidates": len(candidates)})
+            elif path.fetch is not None and path.fetch_cost <= len(candidates):
+                # 비트맵 AND로 교집합
+                candidates = candidates & path.fetch()
+                steps.append({"index": path.name, "estimate": path.estimate,
+                              "method": "intersect", "candidates": len(candidates)})
+            else:
+                residual.append(path)
+
+            if not candidates:
+                break
+
+        # 인덱스로 처리하지 않은 조건은 행 단위로 검사 (인덱스 후보가 없으면 전체 순회)
+        if residual:
+            predicates = [path.predicate for path in residual]
+            rowids = candidates if candidates is not None else range(len(repo))
+            candidates = RoaringBitmap(
+                rowid for rowid in rowids
+                if all(predicate(repo.row(rowid)) for predicate in predicates)
+            )
+            for path in residual:
+                steps.append({"index": path.name, "estimate": path.estimate,
+                              "method": "filter", "candidates": len(candidates)})
+
+        if candidates is None:
+            # 조건이 없으면 정렬 순서대로 필요한 만큼만 순회
+            transactions = list(islice(repo.iter_recent(), offset, offset + limit))
+            total_count = len(repo)
+            order = "ordered-scan"
+        else:
+            # 후보 중 최신순 상위 offset+limit건만 힙으로 선택 (전체 정렬 없음)
+            top = heapq.nlargest(offset + limit, candidates, key=lambda rowid: repo.row(rowid).sort_key)
+            transactions = [repo.row(rowid) for rowid in top[offset:]]
+            # 건수는 비트맵 popcount
+            total_count = len(candidates)
+            order = "top-k-heap"
+
+        result = {
+            "transactions": transactions,
+            "total_count": total_count,
+            "offset": offset,
+            "limit": limit,
+            "explain": {
+                "indexes_used": [step["index"] for step in steps if step["method"] != "filter"],
+                "steps": steps,
+                "order": order
+            }
+        }
+        if with_facets:
+            result["facets"] = repo.facet_counts(candidates)
+        return result
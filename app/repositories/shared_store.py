@@ -0,0 +1,437 @@
+"""
+공유 메모리 거래내역 저장소
+
+uvicorn/gunicorn 워커마다 거래내역과 정렬 인덱스를 따로 만들지 않도록,
+로더 프로세스 하나가 컬럼 데이터와 정렬 인덱스를 multiprocessing.shared_memory에 만들고
+워커는 읽기 전용으로 붙어서(attach) 사용합니다.
+
+세그먼트 구성:
+    {prefix}_ctl      제어 블록 (현재 버전 번호, seqlock 카운터)
+    {prefix}_v{N}     N번째 버전의 데이터 (헤더 + 컬럼 + 정렬 인덱스 + 문자열 사전)
+
+버전 교체 프로토콜:
+    1. 로더가 새 버전 데이터 세그먼트를 끝까지 쓴다
+    2. 제어 블록 seq를 홀수로 올리고 버전 번호를 쓴 뒤 seq를 짝수로 올린다
+    3. 워커는 요청마다 제어 블록을 읽어 버전이 바뀌었으면 새 세그먼트에 붙는다
+    4. 로더는 이전 버전 세그먼트를 유예 시간 뒤 unlink (이미 매핑한 워커는 계속 읽을 수 있음)
+
+실행 (로더):
+    python -m app.repositories.shared_store --name sol_txn [--source transactions.json]
+"""
+import argparse
+import atexit
+import json
+import os
+import struct
+import time
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.models.transaction import TransactionRecord
+
+_MAGIC = b"SOLTXN01"
+# magic, 행 수, 문자열 수, 문자열 바이트 수
+_HEADER = struct.Struct("<8sqqq")
+# 제어 블록: magic(8) + seq(seqlock, 8) + 현재 버전(8)
+_CONTROL_SIZE = 24
+_CONTROL_MAGIC = b"SOLCTL01"
+_SEQ_OFFSET = 8
+_VERSION_OFFSET = 16
+_U64 = struct.Struct("<Q")
+
+# 문자열 사전으로 저장하는 컬럼 (-1은 None)
+STRING_COLUMNS = ("id", "type", "description", "bank", "accountNumber", "date", "time", "category", "merchant", "memo")
+INT_COLUMNS = ("amount", "balance")
+
+# 이전 버전 세그먼트를 지우기 전까지 기다리는 시간 (초)
+RETIRE_GRACE_SECONDS = 30.0
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _layout(row_count: int, string_count: int) -> Dict[str, Tuple[int, int, str]]:
+    """섹션 이름 -> (시작 오프셋, 원소 수, 타입 코드)"""
+    sections = {}
+    offset = _align(_HEADER.size)
+    for name in INT_COLUMNS:
+        sections[name] = (offset, row_count, "q")
+        offset = _align(offset + row_count * 8)
+    for name in STRING_COLUMNS:
+        sections[name] = (offset, row_count, "i")
+        offset = _align(offset + row_count * 4)
+    # 정렬 인덱스: (날짜, 시간, ID) 순 rowid, (금액 절댓값, rowid) 순 rowid
+    for name in ("order", "amount_order"):
+        sections[name] = (offset, row_count, "i")
+        offset = _align(offset + row_count * 4)
+    sections["string_offsets"] = (offset, string_count + 1, "q")
+    offset = _align(offset + (string_count + 1) * 8)
+    sections["strings"] = (offset, 0, "B")
+    return sections
+
+
+def data_segment_name(prefix: str, version: int) -> str:
+    return f"{prefix}_v{version}"
+
+
+def control_segment_name(prefix: str) -> str:
+    return f"{prefix}_ctl"
+
+
+def encode_transactions(records: List[TransactionRecord]) -> bytes:
+    """레코드 목록을 공유 메모리 레이아웃의 바이트로 인코딩"""
+    strings: List[bytes] = []
+    codes: Dict[str, int] = {}
+
+    def code_of(value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(strings)
+            strings.append(value.encode("utf-8"))
+        return code
+
+    row_count = len(records)
+    string_columns = {name: [code_of(getattr(record, name)) for record in records] for name in STRING_COLUMNS}
+    order = sorted(range(row_count), key=lambda rowid: records[rowid].sort_key)
+    amount_order = sorted(range(row_count), key=lambda rowid: (abs(records[rowid].amount), rowid))
+
+    string_offsets = [0]
+    for value in strings:
+        string_offsets.append(string_offsets[-1] + len(value))
+    blob = b"".join(strings)
+
+    sections = _layout(row_count, len(strings))
+    size = sections["strings"][0] + len(blob)
+    buffer = bytearray(max(size, 1))
+    _HEADER.pack_into(buffer, 0, _MAGIC, row_count, len(strings), len(blob))
+
+    def write(name: str, values: Sequence[int]):
+        offset, count, code = sections[name]
+        struct.pack_into(f"<{count}{code}", buffer, offset, *values)
+
+    for name in INT_COLUMNS:
+        write(name, [getattr(record, name) for record in records])
+    for name in STRING_COLUMNS:
+        write(name, string_columns[name])
+    write("order", order)
+    write("amount_order", amount_order)
+    write("string_offsets", string_offsets)
+    buffer[sections["strings"][0]:size] = blob
+    return bytes(buffer)
+
+
+# 이 프로세스가 만든 세그먼트 이름 (로더와 워커가 같은 프로세스일 때 등록 해제하지 않도록)
+_OWNED_SEGMENTS = set()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """기존 세그먼트에 붙기 (워커 종료 시 resource_tracker가 지우지 않도록 등록 해제)"""
+    segment = shared_memory.SharedMemory(name=name)
+    if name not in _OWNED_SEGMENTS:
+        try:
+            resource_tracker.unregister(segment._name, "shared_memory")
+        except Exception:
+            pass
+    return segment
+
+
+class _ColumnView(Sequence):
+    """rowid -> 값 읽기 전용 뷰"""
+
+    def __init__(self, store: "SharedTransactionStore", getter):
+        self._store = store
+        self._getter = getter
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._getter(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self._getter(index)
+
+
+class SharedTransactionStore:
+    """공유 메모리 세그먼트 한 버전에 대한 읽기 전용 뷰"""
+
+    def __init__(self, segment: shared_memory.SharedMemory, version: int):
+        self.segment = segment
+        self.version = version
+        buffer = segment.buf
+
+        magic, self.row_count, string_count, blob_size = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"알 수 없는 공유 메모리 형식입니다: {segment.name}")
+
+        sections = _layout(self.row_count, string_count)
+        self._columns = {}
+        for name, (offset, count, code) in sections.items():
+            if name == "strings":
+                self._strings = buffer[offset:offset + blob_size]
+            else:
+                self._columns[name] = buffer[offset:offset + count * struct.calcsize(code)].cast(code)
+        self._string_offsets = self._columns.pop("string_offsets")
+
+        # TransactionRepository가 그대로 사용할 수 있는 시퀀스 뷰
+        self.rows = _ColumnView(self, self.record)
+        self.order = self._columns["order"]
+        self.order_keys = _ColumnView(self, lambda position: self.record(self.order[position]).sort_key)
+        self.amount_keys = _ColumnView(self, self._amount_key)
+
+    @classmethod
+    def attach(cls, prefix: str, version: Optional[int] = None) -> "SharedTransactionStore":
+        """현재(또는 지정한) 버전 세그먼트에 붙기"""
+        if version is None:
+            version = read_current_version(prefix)
+        if version is None:
+            raise FileNotFoundError(f"공유 저장소가 아직 게시되지 않았습니다: {prefix}")
+        return cls(_attach(data_segment_name(prefix, version)), version)
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def _string(self, code: int) -> Optional[str]:
+        if code < 0:
+            return None
+        start, stop = self._string_offsets[code], self._string_offsets[code + 1]
+        return bytes(self._strings[start:stop]).decode("utf-8")
+
+    def value(self, name: str, rowid: int) -> Any:
+        """단일 컬럼 값 (레코드를 만들지 않고 읽기)"""
+        raw = self._columns[name][rowid]
+        return raw if name in INT_COLUMNS else self._string(raw)
+
+    def record(self, rowid: int) -> TransactionRecord:
+        """rowid의 레코드를 공유 메모리에서 디코딩"""
+        columns = self._columns
+        values = {name: self._string(columns[name][rowid]) for name in STRING_COLUMNS}
+        return TransactionRecord(
+            amount=columns["amount"][rowid],
+            balance=columns["balance"][rowid],
+            **values
+        )
+
+    def _amount_key(self, position: int) -> Tuple[int, int]:
+        rowid = self._columns["amount_order"][position]
+        return abs(self._columns["amount"][rowid]), rowid
+
+    def iter_records(self) -> Iterator[TransactionRecord]:
+        for rowid in range(self.row_count):
+            yield self.record(rowid)
+
+    def close(self):
+        """세그먼트 분리 (뷰를 먼저 해제해야 close 가능)"""
+        for view in self._columns.values():
+            view.release()
+        self._string_offsets.release()
+        self._strings.release()
+        try:
+            self.segment.close()
+        except BufferError:
+            # 아직 응답 중인 요청이 뷰를 잡고 있으면 GC가 정리
+            pass
+
+
+# ===== 제어 블록 (버전 교체) =====
+
+class SharedStoreWatcher:
+    """워커 쪽 제어 블록 감시 (제어 세그먼트를 한 번만 열어 두고 버전만 읽음)"""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._control: Optional[shared_memory.SharedMemory] = None
+
+    def current_version(self) -> Optional[int]:
+        """seqlock으로 일관된 현재 버전 번호 읽기 (게시 전이면 None)"""
+        if self._control is None:
+            try:
+                self._control = _attach(control_segment_name(self.prefix))
+            except FileNotFoundError:
+                return None
+        buffer = self._control.buf
+        if bytes(buffer[:8]) != _CONTROL_MAGIC:
+            return None
+        while True:
+            seq_before = _U64.unpack_from(buffer, _SEQ_OFFSET)[0]
+            version = _U64.unpack_from(buffer, _VERSION_OFFSET)[0]
+            seq_after = _U64.unpack_from(buffer, _SEQ_OFFSET)[0]
+            if seq_before == seq_after and seq_before % 2 == 0:
+                return version or None
+
+    def close(self):
+        if self._control is not None:
+            self._control.close()
+            self._control = None
+
+
+def read_current_version(prefix: str) -> Optional[int]:
+    """현재 버전 번호를 한 번 읽기"""
+    watcher = SharedStoreWatcher(prefix)
+    try:
+        return watcher.current_version()
+    finally:
+        watcher.close()
+
+
+class SharedRepositoryProvider:
+    """워커용 레포지토리 제공자
+
+    요청마다 제어 블록의 버전만 확인하고, 바뀌었을 때만 새 버전 세그먼트에 붙어
+    레포지토리를 다시 만듭니다. 교체는 참조 대입 한 번이라 진행 중인 요청은 이전 버전을 계속 읽습니다.
+    이전 버전 세그먼트는 그 레포지토리를 잡은 마지막 요청이 끝나 레포지토리가 해제될 때 분리합니다
+    (교체 즉시 닫으면 진행 중인 요청이 해제된 memoryview를 읽게 됨).
+    """
+
+    def __init__(self, prefix: str):
+        self.watcher = SharedStoreWatcher(prefix)
+        self._store: Optional[SharedTransactionStore] = None
+        self._repository = None
+        # 종료 시 뷰를 먼저 해제해야 세그먼트를 닫을 수 있음
+        atexit.register(self.close)
+
+    def get(self):
+        from .transaction_repo import TransactionRepository
+
+        version = self.watcher.current_version()
+        if version is None:
+            if self._repository is None:
+                raise FileNotFoundError(f"공유 저장소가 아직 게시되지 않았습니다: {self.watcher.prefix}")
+            return self._repository
+
+        if self._store is None or self._store.version != version:
+            try:
+                store = SharedTransactionStore.attach(self.watcher.prefix, version)
+            except FileNotFoundError:
+                # 붙는 사이 다음 버전으로 교체되고 정리된 경우 - 기존 버전으로 응답
+                if self._repository is None:
+                    raise
+                return self._repository
+            repository = TransactionRepository.from_shared_store(store)
+            # 레포지토리를 참조하는 요청이 모두 끝나면(참조 수 0) 세그먼트 분리
+            weakref.finalize(repository, store.close)
+            self._repository = repository
+            self._store = store
+            print(f"📦 공유 저장소 v{version} 연결: {len(store)}건")
+        return self._repository
+
+    def close(self):
+        # 현재 버전 세그먼트는 레포지토리 finalizer가 분리 (종료 시에도 실행됨)
+        self._repository = None
+        self._store = None
+        self.watcher.close()
+
+
+class SharedStorePublisher:
+    """로더 프로세스: 새 버전을 만들고 제어 블록을 교체"""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.version = 0
+        self._segments: Dict[int, shared_memory.SharedMemory] = {}
+        self._retired: List[Tuple[float, int]] = []
+        self._control = self._create(control_segment_name(prefix), _CONTROL_SIZE)
+        self._control.buf[:_CONTROL_SIZE] = bytes(_CONTROL_SIZE)
+        self._control.buf[:8] = _CONTROL_MAGIC
+
+    @staticmethod
+    def _create(name: str, size: int) -> shared_memory.SharedMemory:
+        try:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+        _OWNED_SEGMENTS.add(name)
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+    def publish(self, transactions: List[Any]) -> int:
+        """거래내역을 새 버전으로 게시하고 버전 번호 반환"""
+        records = [t if isinstance(t, TransactionRecord) else TransactionRecord.from_dict(t) for t in transactions]
+        payload = encode_transactions(records)
+
+        version = self.version + 1
+        segment = self._create(data_segment_name(self.prefix, version), len(payload))
+        segment.buf[:len(payload)] = payload
+        self._segments[version] = segment
+
+        # seqlock: seq가 홀수인 동안은 쓰는 중
+        buffer = self._control.buf
+        seq = _U64.unpack_from(buffer, _SEQ_OFFSET)[0]
+        _U64.pack_into(buffer, _SEQ_OFFSET, seq + 1)
+        _U64.pack_into(buffer, _VERSION_OFFSET, version)
+        _U64.pack_into(buffer, _SEQ_OFFSET, seq + 2)
+
+        if self.version:
+            self._retired.append((time.monotonic(), self.version))
+        self.version = version
+        self.retire_old_versions()
+        print(f"📦 공유 저장소 v{version} 게시: {len(records)}건, {len(payload):,} bytes")
+        return version
+
+    def retire_old_versions(self, grace_seconds: float = RETIRE_GRACE_SECONDS):
+        """유예 시간이 지난 이전 버전 세그먼트 삭제"""
+        now = time.monotonic()
+        remaining = []
+        for retired_at, version in self._retired:
+            if now - retired_at >= grace_seconds:
+                segment = self._segments.pop(version)
+                segment.close()
+                segment.unlink()
+                _OWNED_SEGMENTS.discard(data_segment_name(self.prefix, version))
+            else:
+                remaining.append((retired_at, version))
+        self._retired = remaining
+
+    def close(self):
+        """모든 세그먼트 삭제"""
+        for version, segment in self._segments.items():
+            segment.close()
+            segment.unlink()
+            _OWNED_SEGMENTS.discard(data_segment_name(self.prefix, version))
+        self._segments.clear()
+        self._control.close()
+        self._control.unlink()
+        _OWNED_SEGMENTS.discard(control_segment_name(self.prefix))
+
+
+def _load_source(source: Optional[str]) -> List[Dict[str, Any]]:
+    if source:
+        with open(source, encoding="utf-8") as f:
+            return json.load(f)
+    from app.data import MOCK_TRANSACTIONS
+    return MOCK_TRANSACTIONS
+
+
+def run_loader(prefix: str, source: Optional[str] = None, poll_interval: float = 1.0):
+    """로더 프로세스 실행: 게시 후 원본 파일이 바뀌면 새 버전으로 다시 게시"""
+    publisher = SharedStorePublisher(prefix)
+    try:
+        publisher.publish(_load_source(source))
+        last_mtime = os.path.getmtime(source) if source else None
+        while True:
+            time.sleep(poll_interval)
+            publisher.retire_old_versions()
+            if source:
+                mtime = os.path.getmtime(source)
+                if mtime != last_mtime:
+                    last_mtime = mtime
+                    publisher.publish(_load_source(source))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공유 메모리 거래내역 저장소 로더")
+    parser.add_argument("--name", required=True, help="공유 메모리 세그먼트 이름 접두사")
+    parser.add_argument("--source", help="거래내역 JSON 파일 (없으면 MOCK_TRANSACTIONS)")
+    parser.add_argument("--interval", type=float, default=1.0, help="원본 파일 변경 확인 주기 (초)")
+    args = parser.parse_args()
+    run_loader(args.name, args.source, args.interval)
@@ -1,192 +1,394 @@
-from typing import List, Dict, Any, Optional
+import copy
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from itertools import count, islice
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, Sequence, Tuple
 from datetime import datetime, timedelta
 from .base import BaseRepository
+from app.models.transaction import TransactionRecord
+from .bitmap import RoaringBitmap
+from .query_planner import AccessPath, QueryPlanner
+from app.tracing import traced
+
+# 같은 날짜의 모든 정렬 키보다 큰 값 (날짜 범위의 끝 경계용)
+_MAX_KEY = "\U0010ffff"
+
+# 금액 분포 구간 경계 (원): 0~1만, 1만~3만, 3만~5만, 5만~10만, 10만~30만, 30만~50만, 50만~100만, 100만 이상
+AMOUNT_BUCKET_EDGES = [0, 10_000, 30_000, 50_000, 100_000, 300_000, 500_000, 1_000_000]
+
+# 레포지토리 계보 번호 (appended()로 만든 다음 세대는 같은 계보를 이어받음)
+_LINEAGES = count(1)
 
 
 class TransactionRepository(BaseRepository):
     """거래내역 관리 레포지토리"""
 
-    def __init__(self):
+    def __init__(self, transactions: Optional[List[Dict[str, Any]]] = None):
         super().__init__()
-        # 더미 거래내역
-        self.transactions = [
-            {
-                "id": 1,
-                "date": "2024-01-15",
-                "time": "14:30",
-                "merchant": "스타벅스 강남점",
-                "category": "카페",
-                "amount": -4500,
-                "type": "결제",
-                "balance": 1245000,
-                "memo": "아메리카노 2잔",
-                "recipient_name": None,
-                "recipient_account": None,
-                "recipient_bank": None
-            },
-            {
-                "id": 2,
-                "date": "2024-01-15",
-                "time": "10:15",
-                "merchant": None,
-                "category": "송금",
-                "amount": -100000,
-                "type": "송금",
-                "balance": 1249500,
-                "memo": "용돈",
-                "recipient_name": "김네모",
-                "recipient_account": "110-123-456789",
-                "recipient_bank": "하나은행"
-            },
-            {
-                "id": 3,
-                "date": "2024-01-14",
-                "time": "19:20",
-                "merchant": "무신사",
-                "category": "쇼핑",
-                "amount": -89000,
-                "type": "결제",
-                "balance": 1349500,
-                "memo": "티셔츠 구매",
-                "recipient_name": None,
-                "recipient_account": None,
-                "recipient_bank": None
-            },
-            {
-                "id": 4,
-                "date": "2024-01-13",
-                "time": "16:45",
-                "merchant": None,
-                "category": "송금",
-                "amount": -50000,
-                "type": "송금",
-                "balance": 1438500,
-                "memo": "생일 축하금",
-                "recipient_name": "박세모",
-                "recipient_account": "555-777-888999",
-                "recipient_bank": "국민은행"
-            },
-            {
-                "id": 5,
-                "date": "2024-01-12",
-                "time": "16:45",
-                "merchant": "GS25 역삼점",
-                "category": "편의점",
-                "amount": -12000,
-                "type": "결제",
-                "balance": 1450500,
-                "memo": "생필품",
-                "recipient_name": None,
-                "recipient_account": None,
-                "recipient_bank": None
-            },
-            {
-                "id": 6,
-                "date": "2024-01-11",
-                "time": "09:20",
-                "merchant": None,
-                "category": "송금",
-                "amount": -200000,
-                "type": "송금",
-                "balance": 1462500,
-                "memo": "월세",
-                "recipient_name": "이동그라미",
-                "recipient_account": "987-654-321098",
-                "recipient_bank": "신한은행"
-            },
-            {
-                "id": 7,
-                "date": "2024-01-10",
-                "time": "12:30",
-                "merchant": "교촌치킨",
-                "category": "음식",
-                "amount": -28000,
-                "type": "결제",
-                "balance": 1478500,
-                "memo": "점심 배달",
-                "recipient_name": None,
-                "recipient_account": None,
-                "recipient_bank": None
-            },
-            {
-                "id": 8,
-                "date": "2024-01-09",
-                "time": "14:15",
-                "merchant": None,
-                "category": "송금",
-                "amount": -30000,
-                "type": "송금",
-                "balance": 1506500,
-                "memo": "용돈",
-                "recipient_name": "최삼각",
-                "recipient_account": "111-222-333444",
-                "recipient_bank": "우리은행"
-            },
-            {
-                "id": 9,
-                "date": "2024-01-08",
-                "time": "09:15",
-                "merchant": "이마트",
-                "category": "마트",
-                "amount": -45000,
-                "type": "결제",
-                "balance": 1536500,
-                "memo": "장보기",
-                "recipient_name": None,
-                "recipient_account": None,
-                "recipient_bank": None
-            },
-            {
-                "id": 10,
-                "date": "2024-01-07",
-                "time": "11:30",
-                "merchant": None,
-                "category": "송금",
-                "amount": -25000,
-                "type": "송금",
-                "balance": 1581500,
-                "memo": "택시비",
-                "recipient_name": "정오각",
-                "recipient_account": "666-777-888999",
-                "recipient_bank": "신한은행"
-            }
-        ]
+        if transactions is None:
+            # 더미 거래내역
+            transactions = [
+                {
+                    "id": 1,
+                    "date": "2024-01-15",
+                    "time": "14:30",
+                    "merchant": "스타벅스 강남점",
+                    "category": "카페",
+                    "amount": -4500,
+                    "type": "결제",
+                    "balance": 1245000,
+                    "memo": "아메리카노 2잔",
+                    "recipient_name": None,
+                    "recipient_account": None,
+                    "recipient_bank": None
+                },
+                {
+                    "id": 2,
+                    "date": "2024-01-15",
+                    "time": "10:15",
+                    "merchant": None,
+                    "category": "송금",
+                    "amount": -100000,
+                    "type": "송금",
+                    "balance": 1249500,
+                    "memo": "용돈",
+                    "recipient_name": "김네모",
+                    "recipient_account": "110-123-456789",
+                    "recipient_bank": "하나은행"
+                },
+                {
+                    "id": 3,
+                    "date": "2024-01-14",
+                    "time": "19:20",
+                    "merchant": "무신사",
+                    "category": "쇼핑",
+                    "amount": -89000,
+                    "type": "결제",
+                    "balance": 1349500,
+                    "memo": "티셔츠 구매",
+                    "recipient_name": None,
+                    "recipient_account": None,
+                    "recipient_bank": None
+                },
+                {
+                    "id": 4,
+                    "date": "2024-01-13",
+                    "time": "16:45",
+                    "merchant": None,
+                    "category": "송금",
+                    "amount": -50000,
+                    "type": "송금",
+                    "balance": 1438500,
+                    "memo": "생일 축하금",
+                    "recipient_name": "박세모",
+                    "recipient_account": "555-777-888999",
+                    "recipient_bank": "국민은행"
+                },
+                {
+                    "id": 5,
+                    "date": "2024-01-12",
+                    "time": "16:45",
+                    "merchant": "GS25 역삼점",
+                    "category": "편의점",
+                    "amount": -12000,
+                    "type": "결제",
+                    "balance": 1450500,
+                    "memo": "생필품",
+                    "recipient_name": None,
+                    "recipient_account": None,
+                    "recipient_bank": None
+                },
+                {
+                    "id": 6,
+                    "date": "2024-01-11",
+                    "time": "09:20",
+                    "merchant": None,
+                    "category": "송금",
+                    "amount": -200000,
+                    "type": "송금",
+                    "balance": 1462500,
+                    "memo": "월세",
+                    "recipient_name": "이동그라미",
+                    "recipient_account": "987-654-321098",
+                    "recipient_bank": "신한은행"
+                },
+                {
+                    "id": 7,
+                    "date": "2024-01-10",
+                    "time": "12:30",
+                    "merchant": "교촌치킨",
+                    "category": "음식",
+                    "amount": -28000,
+                    "type": "결제",
+                    "balance": 1478500,
+                    "memo": "점심 배달",
+                    "recipient_name": None,
+                    "recipient_account": None,
+                    "recipient_bank": None
+                },
+                {
+                    "id": 8,
+                    "date": "2024-01-09",
+                    "time": "14:15",
+                    "merchant": None,
+                    "category": "송금",
+                    "amount": -30000,
+                    "type": "송금",
+                    "balance": 1506500,
+                    "memo": "용돈",
+                    "recipient_name": "최삼각",
+                    "recipient_account": "111-222-333444",
+                    "recipient_bank": "우리은행"
+                },
+                {
+                    "id": 9,
+                    "date": "2024-01-08",
+                    "time": "09:15",
+                    "merchant": "이마트",
+                    "category": "마트",
+                    "amount": -45000,
+                    "type": "결제",
+                    "balance": 1536500,
+                    "memo": "장보기",
+                    "recipient_name": None,
+                    "recipient_account": None,
+                    "recipient_bank": None
+                },
+                {
+                    "id": 10,
+                    "date": "2024-01-07",
+                    "time": "11:30",
+                    "merchant": None,
+                    "category": "송금",
+                    "amount": -25000,
+                    "type": "송금",
+                    "balance": 1581500,
+                    "memo": "택시비",
+                    "recipient_name": "정오각",
+                    "recipient_account": "666-777-888999",
+                    "recipient_bank": "신한은행"
+                }
+            ]
+
+        # 행 저장소: rowid(추가된 순서) -> 레코드
+        self._rows: Sequence[TransactionRecord] = []
+        # (날짜, 시간, ID) 오름차순으로 유지되는 rowid 목록과 정렬 키
+        self._order: Sequence[int] = []
+        self._order_keys: Sequence[Tuple] = []
+        # 금액(절댓값) 순 보조 인덱스: (금액, rowid) 오름차순
+        self._amount_keys: Sequence[Tuple[int, int]] = []
+        # 공유 메모리 저장소에 붙은 경우 (읽기 전용)
+        self.shared_store = None
+        # 세대: 같은 계보의 세대는 앞 세대의 행 뒤에 행을 추가한 것 (행은 추가만 됨)
+        self.lineage = next(_LINEAGES)
+        self.generation = 0
+        # 이번 세대에서 만든(앞 세대와 공유하지 않는) 비트맵 id, None이면 모두 이 레포지토리 소유
+        self._owned_bitmaps: Optional[set] = None
+
+        self._init_indexes()
+
+        for transaction in transactions:
+            self.append(transaction)
+
+    @classmethod
+    def from_shared_store(cls, store) -> "TransactionRepository":
+        """공유 메모리 저장소 위의 읽기 전용 레포지토리
+
+        행, 날짜 순서, 금액 순서는 공유 메모리를 그대로 읽고(워커 간 공유),
+        크기가 작은 비트맵 인덱스와 금액 분포만 워커에서 한 번 만듭니다.
+        """
+        repository = cls([])
+        repository.shared_store = store
+        repository._rows = store.rows
+        repository._order = store.order
+        repository._order_keys = store.order_keys
+        repository._amount_keys = store.amount_keys
+        for rowid in range(len(store)):
+            repository._index_row(rowid, store.record(rowid), sorted_indexes=False)
+        return repository
+
+    def _init_indexes(self):
+        """보조 인덱스 초기화"""
+        # 보조 인덱스: 값 -> rowid 비트맵
+        self._by_description: Dict[str, RoaringBitmap] = {}
+        # 값 종류가 적은 컬럼의 비트맵 인덱스 (AND/OR + popcount로 건수 계산)
+        self._by_type: Dict[str, RoaringBitmap] = {}
+        self._by_category: Dict[str, RoaringBitmap] = {}
+        self._by_bank: Dict[str, RoaringBitmap] = {}
+        # 월(YYYY-MM)별 비트맵과 정렬된 월 목록 (기간 조건은 가운데 달 비트맵을 합쳐 후보를 만듦)
+        self._by_month: Dict[str, RoaringBitmap] = {}
+        self._months: List[str] = []
+        self._transfers = RoaringBitmap()
+        # 연락처 디렉터리: 받는 사람 -> 가장 최근 송금 rowid
+        self._contacts: Dict[str, int] = {}
+
+        # 금액 구간별 건수 (전체 + 거래 타입별), 추가 시 갱신
+        self._amount_histogram: Dict[str, List[int]] = {"all": [0] * len(AMOUNT_BUCKET_EDGES)}
+
+        self.planner = QueryPlanner(self)
+
+    @property
+    def transactions(self) -> List[TransactionRecord]:
+        """전체 거래내역 (최신순)"""
+        return self.find_all()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def snapshot(self) -> Tuple[int, int]:
+        """데이터 스냅샷 식별자 (계보, 세대) - 결과 캐시 무효화용"""
+        return self.lineage, self.generation
+
+    def append(self, transaction: Any) -> TransactionRecord:
+        """거래내역 추가 (정렬 순서를 유지하며 삽입)
+
+        제자리에서 수정하므로 아직 공개되지 않은(구성 중인) 레포지토리에만 사용합니다.
+        서비스 중인 레포지토리에는 appended()로 다음 세대를 만들어 교체합니다.
+        """
+        if self.shared_store is not None:
+            raise RuntimeError("공유 메모리 저장소는 읽기 전용입니다. 로더에서 새 버전을 게시하세요")
+        return self._insert(transaction)
+
+    def appended(self, transactions: Iterable[Any]) -> "TransactionRepository":
+        """거래내역을 추가한 다음 세대 레포지토리 반환 (copy-on-write)
+
+        현재 세대는 전혀 바뀌지 않으므로, 이미 이 세대를 잡은 요청은 락 없이 일관된 스냅샷을 읽습니다.
+        행 목록과 정렬 인덱스는 복사 후 삽입하고, 비트맵은 이번에 건드리는 것만 복사합니다.
+        """
+        if self.shared_store is not None:
+            raise RuntimeError("공유 메모리 저장소는 읽기 전용입니다. 로더에서 새 버전을 게시하세요")
+        records = [t if isinstance(t, TransactionRecord) else TransactionRecord.from_dict(t) for t in transactions]
+
+        successor = copy.copy(self)
+        successor.generation = self.generation + 1
+        successor._rows = list(self._rows)
+        successor._order = list(self._order)
+        successor._order_keys = list(self._order_keys)
+        successor._amount_keys = list(self._amount_keys)
+        successor._by_description = dict(self._by_description)
+        successor._by_type = dict(self._by_type)
+        successor._by_category = dict(self._by_category)
+        successor._by_bank = dict(self._by_bank)
+        successor._by_month = dict(self._by_month)
+        successor._months = list(self._months)
+        successor._transfers = self._transfers.copy()
+        successor._contacts = dict(self._contacts)
+        successor._amount_histogram = {key: list(counts) for key, counts in self._amount_histogram.items()}
+        successor._owned_bitmaps = {id(successor._transfers)}
+        successor.planner = QueryPlanner(successor)
+
+        for record in records:
+            successor._insert(record)
+        return successor
+
+    def _insert(self, transaction: Any) -> TransactionRecord:
+        """행 저장소, 날짜 순서, 보조 인덱스에 한 건 추가"""
+        record = transaction if isinstance(transaction, TransactionRecord) else TransactionRecord.from_dict(transaction)
+        rowid = len(self._rows)
+        self._rows.append(record)
+
+        key = record.sort_key
+        position = bisect_right(self._order_keys, key)
+        self._order_keys.insert(position, key)
+        self._order.insert(position, rowid)
+
+        self._index_row(rowid, record)
+        return record
+
+    def _index_row(self, rowid: int, record: TransactionRecord, sorted_indexes: bool = True):
+        """보조 인덱스에 행 추가 (sorted_indexes=False면 이미 정렬된 금액 인덱스는 건너뜀)"""
+        names = {record.description, record.merchant} - {None, ""}
+        for name in names:
+            self._writable_bitmap(self._by_description, name).add(rowid)
+        self._writable_bitmap(self._by_type, record.type).add(rowid)
+        if record.category:
+            self._writable_bitmap(self._by_category, record.category).add(rowid)
+        if record.bank:
+            self._writable_bitmap(self._by_bank, record.bank).add(rowid)
+        month = record.date[:7]
+        if month not in self._by_month:
+            insort(self._months, month)
+        self._writable_bitmap(self._by_month, month).add(rowid)
+        if record.is_transfer:
+            self._transfers.add(rowid)
+            if record.description:
+                latest = self._contacts.get(record.description)
+                if latest is None or self._rows[latest].sort_key < record.sort_key:
+                    self._contacts[record.description] = rowid
+
+        amount = abs(record.amount)
+        if sorted_indexes:
+            insort(self._amount_keys, (amount, rowid))
+        bucket = bisect_right(AMOUNT_BUCKET_EDGES, amount) - 1
+        self._amount_histogram["all"][bucket] += 1
+        self._amount_histogram.setdefault(record.type, [0] * len(AMOUNT_BUCKET_EDGES))[bucket] += 1
 
-    def find_all(self) -> List[Dict[str, Any]]:
+    def _writable_bitmap(self, index: Dict[str, RoaringBitmap], key: str) -> RoaringBitmap:
+        """수정해도 되는 비트맵 반환 (앞 세대와 공유 중이면 복사해서 교체)"""
+        bitmap = index.get(key)
+        if bitmap is not None and (self._owned_bitmaps is None or id(bitmap) in self._owned_bitmaps):
+            return bitmap
+        bitmap = RoaringBitmap() if bitmap is None else bitmap.copy()
+        if self._owned_bitmaps is not None:
+            self._owned_bitmaps.add(id(bitmap))
+        index[key] = bitmap
+        return bitmap
+
+    def row(self, rowid: int) -> TransactionRecord:
+        """rowid로 레코드 반환"""
+        return self._rows[rowid]
+
+    def iter_recent(self, predicate: Optional[Callable[[TransactionRecord], bool]] = None,
+                    start: int = 0, stop: Optional[int] = None) -> Iterator[TransactionRecord]:
+        """최신순으로 거래내역 순회 (정렬 순서 위치 start~stop 구간, 조건이 있으면 필터링)"""
+        rows = self._order
+        stop = len(rows) if stop is None else stop
+        for position in range(stop - 1, start - 1, -1):
+            record = self._rows[rows[position]]
+            if predicate is None or predicate(record):
+                yield record
+
+    def find_all(self) -> List[TransactionRecord]:
         """모든 거래내역 조회"""
-        return sorted(self.transactions, key=lambda x: x["date"], reverse=True)
+        return list(self.iter_recent())
 
-    def find_by_id(self, transaction_id: int) -> Optional[Dict[str, Any]]:
+    def find_by_id(self, transaction_id: Any) -> Optional[TransactionRecord]:
         """ID로 거래내역 조회"""
-        for transaction in self.transactions:
-            if transaction["id"] == transaction_id:
-                return transaction.copy()
+        transaction_id = str(transaction_id)
+        for transaction in self._rows:
+            if transaction.id == transaction_id:
+                return transaction
         return None
 
+    @traced("repo.find_latest")
+    def find_latest(self, predicate: Callable[[TransactionRecord], bool]) -> Optional[TransactionRecord]:
+        """조건에 맞는 가장 최근 거래 (찾는 즉시 중단)"""
+        return next(self.iter_recent(predicate), None)
+
+    @traced("repo.get_recent_transfer_contacts")
     def get_recent_transfer_contacts(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """최근 송금한 사람들 조회 (중복 제거)"""
-        transfer_contacts = {}
-
-        # 송금 거래만 필터링하고 최신순 정렬
-        transfers = [t for t in self.transactions if t["type"] == "송금" and t["recipient_name"]]
-        transfers.sort(key=lambda x: (x["date"], x["time"]), reverse=True)
-
-        # 중복 제거 (같은 사람은 최신 거래만)
-        for transfer in transfers:
-            name = transfer["recipient_name"]
-            if name not in transfer_contacts:
-                transfer_contacts[name] = {
-                    "name": name,
-                    "account": transfer["recipient_account"],
-                    "bank": transfer["recipient_bank"],
-                    "last_transfer_date": transfer["date"],
-                    "last_transfer_amount": abs(transfer["amount"]),
-                    "last_memo": transfer["memo"]
-                }
+        """최근 송금한 사람들 조회 (연락처 디렉터리에서 최신 거래 순 상위 limit명)"""
+        rows = self._rows
+        latest = heapq.nlargest(limit, self._contacts.values(), key=lambda rowid: rows[rowid].sort_key)
 
-        # limit 만큼만 반환
-        return list(transfer_contacts.values())[:limit]
+        return [
+            {
+                "name": transfer.description,
+                "account": transfer.accountNumber,
+                "bank": transfer.bank,
+                "last_transfer_date": transfer.date,
+                "last_transfer_amount": abs(transfer.amount),
+                "last_memo": transfer.memo
+            }
+            for transfer in (rows[rowid] for rowid in latest)
+        ]
 
+    def contact_names(self) -> List[str]:
+        """송금한 적 있는 모든 받는 사람 이름"""
+        return list(self._contacts)
+
+    @traced("repo.find_contact_by_name")
     def find_contact_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """이름으로 최근 송금 연락처 찾기"""
         recent_contacts = self.get_recent_transfer_contacts()
@@ -197,79 +399,241 @@ class TransactionRepository(BaseRepository):
 
         return None
 
-    def search_by_merchant(self, merchant: str) -> List[Dict[str, Any]]:
-        """가맹점명으로 거래내역 검색"""
-        results = []
-        merchant_lower = merchant.lower()
+    def _find(self, filters: Dict[str, Any]) -> List[TransactionRecord]:
+        """쿼리 플래너로 조건에 맞는 모든 거래내역 (최신순)"""
+        return self.planner.execute(filters, 0, len(self._rows))["transactions"]
 
-        for transaction in self.transactions:
-            if (transaction["merchant"] and
-                    merchant_lower in transaction["merchant"].lower()):
-                results.append(transaction.copy())
+    @traced("repo.search_by_merchant")
+    def search_by_merchant(self, merchant: str) -> List[TransactionRecord]:
+        """가맹점명으로 거래내역 검색 (이름 인덱스)"""
+        return self._find({"merchant": merchant})
 
-        return sorted(results, key=lambda x: x["date"], reverse=True)
-
-    def search_by_recipient_name(self, name: str) -> List[Dict[str, Any]]:
+    @traced("repo.search_by_recipient_name")
+    def search_by_recipient_name(self, name: str) -> List[TransactionRecord]:
         """받는 사람 이름으로 송금 내역 검색"""
-        results = []
+        return list(self.iter_recent(lambda t: t.is_transfer and name in t.description))
 
-        for transaction in self.transactions:
-            if (transaction["recipient_name"] and
-                    name in transaction["recipient_name"]):
-                results.append(transaction.copy())
+    @traced("repo.search_by_type")
+    def search_by_type(self, transaction_type: str) -> List[TransactionRecord]:
+        """거래 타입별 거래내역 검색 (타입 비트맵)"""
+        if transaction_type not in self._by_type:
+            return []
+        return self._find({"type": transaction_type})
 
-        return sorted(results, key=lambda x: x["date"], reverse=True)
+    @traced("repo.search_by_category")
+    def search_by_category(self, category: str) -> List[TransactionRecord]:
+        """카테고리별 거래내역 검색 (카테고리 비트맵)"""
+        if not category:
+            return []
+        return self._find({"category": category})
 
-    def search_by_category(self, category: str) -> List[Dict[str, Any]]:
-        """카테고리별 거래내역 검색"""
-        results = []
-        for transaction in self.transactions:
-            if transaction["category"] == category:
-                results.append(transaction.copy())
+    def _date_bounds(self, date_from: str, date_to: str) -> Tuple[int, int]:
+        """날짜 범위에 해당하는 정렬 순서 위치 구간 (이진 탐색)"""
+        start = bisect_left(self._order_keys, (date_from,))
+        stop = bisect_right(self._order_keys, (date_to, _MAX_KEY))
+        return start, stop
 
-        return sorted(results, key=lambda x: x["date"], reverse=True)
-
-    def search_by_date_range(self, date_from: str, date_to: str = None) -> List[Dict[str, Any]]:
+    @traced("repo.search_by_date_range")
+    def search_by_date_range(self, date_from: str, date_to: str = None,
+                             transaction_type: str = "all") -> List[TransactionRecord]:
         """날짜 범위로 거래내역 검색"""
         if date_to is None:
             date_to = datetime.now().strftime("%Y-%m-%d")
 
-        results = []
-        for transaction in self.transactions:
-            if date_from <= transaction["date"] <= date_to:
-                results.append(transaction.copy())
+        start, stop = self._date_bounds(date_from, date_to)
+        predicate = None if transaction_type == "all" else (lambda t: t.type == transaction_type)
+        return list(self.iter_recent(predicate, start, stop))
 
-        return sorted(results, key=lambda x: x["date"], reverse=True)
+    def _amount_bounds(self, min_amount: Optional[int], max_amount: Optional[int]) -> Tuple[int, int]:
+        """금액 범위에 해당하는 금액 인덱스 위치 구간 (이진 탐색)"""
+        start = 0 if min_amount is None else bisect_left(self._amount_keys, (min_amount, -1))
+        stop = len(self._amount_keys) if max_amount is None else bisect_right(self._amount_keys, (max_amount, len(self._rows)))
+        return start, max(start, stop)
 
-    def search_by_amount_range(self, min_amount: int = None, max_amount: int = None) -> List[Dict[str, Any]]:
-        """금액 범위로 거래내역 검색"""
+    def count_by_amount_range(self, min_amount: int = None, max_amount: int = None) -> int:
+        """금액 범위에 해당하는 거래 건수 (이진 탐색 두 번)"""
+        start, stop = self._amount_bounds(min_amount, max_amount)
+        return stop - start
+
+    @traced("repo.search_by_amount_range")
+    def search_by_amount_range(self, min_amount: int = None, max_amount: int = None) -> List[TransactionRecord]:
+        """금액 범위로 거래내역 검색 (절댓값 기준, 최신순)"""
+        filters = {"min_amount": min_amount, "max_amount": max_amount}
+        return self.query(filters, 0, self.count_by_amount_range(min_amount, max_amount))["transactions"]
+
+    @traced("repo.get_largest_transactions")
+    def get_largest_transactions(self, limit: int = 10, transaction_type: str = "all") -> List[TransactionRecord]:
+        """금액이 큰 순서로 상위 limit건 (금액 인덱스를 뒤에서부터 순회)"""
         results = []
-        for transaction in self.transactions:
-            amount = abs(transaction["amount"])  # 절댓값으로 비교
+        for _, rowid in reversed(self._amount_keys):
+            record = self._rows[rowid]
+            if transaction_type == "all" or record.type == transaction_type:
+                results.append(record)
+                if len(results) >= limit:
+                    break
+        return results
 
-            if min_amount is not None and amount < min_amount:
-                continue
-            if max_amount is not None and amount > max_amount:
-                continue
+    @traced("repo.get_amount_histogram")
+    def get_amount_histogram(self, transaction_type: str = "all") -> List[Dict[str, Any]]:
+        """금액 구간별 거래 건수 (미리 집계된 값 반환)"""
+        counts = self._amount_histogram.get(transaction_type, [0] * len(AMOUNT_BUCKET_EDGES))
+        buckets = []
+        for index, lower in enumerate(AMOUNT_BUCKET_EDGES):
+            upper = AMOUNT_BUCKET_EDGES[index + 1] - 1 if index + 1 < len(AMOUNT_BUCKET_EDGES) else None
+            buckets.append({"min_amount": lower, "max_amount": upper, "count": counts[index]})
+        return buckets
 
-            results.append(transaction.copy())
+    @traced("repo.get_recent_transactions")
+    def get_recent_transactions(self, limit: int = 10,
+                                predicate: Optional[Callable[[TransactionRecord], bool]] = None) -> List[TransactionRecord]:
+        """최근 거래내역 조회 (limit건을 채우면 순회 중단)"""
+        return list(islice(self.iter_recent(predicate), limit))
 
-        return sorted(results, key=lambda x: x["date"], reverse=True)
+    @traced("repo.query")
+    def query(self, filters: Dict[str, Any], offset: int = 0, limit: int = 20,
+              with_facets: bool = False) -> Dict[str, Any]:
+        """다중 조건 검색 (쿼리 플래너 사용, 최신순 페이지 + explain 반환)"""
+        return self.planner.execute(filters, offset, limit, with_facets)
 
-    def get_recent_transactions(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """최근 거래내역 조회"""
-        sorted_transactions = sorted(self.transactions, key=lambda x: (x["date"], x["time"]), reverse=True)
-        return [transaction.copy() for transaction in sorted_transactions[:limit]]
+    @traced("repo.count")
+    def count(self, filters: Dict[str, Any]) -> int:
+        """조건에 맞는 거래 건수"""
+        return self.planner.execute(filters, 0, 0)["total_count"]
 
+    def facet_counts(self, candidates: Optional[RoaringBitmap] = None) -> Dict[str, Dict[str, int]]:
+        """거래 타입/카테고리/은행별 건수 (후보 비트맵과의 AND popcount)"""
+        facets = {}
+        for field, index in (("type", self._by_type), ("category", self._by_category), ("bank", self._by_bank)):
+            if candidates is None:
+                counts = {value: len(bitmap) for value, bitmap in index.items()}
+            else:
+                counts = {value: candidates.and_cardinality(bitmap) for value, bitmap in index.items()}
+            facets[field] = {value: count for value, count in counts.items() if count}
+        return facets
+
+    # ===== 쿼리 플래너용 접근 경로 =====
+
+    def _matching_names(self, needle: str) -> List[str]:
+        """이름(가맹점/설명) 사전에서 부분 문자열이 일치하는 값 목록"""
+        needle = needle.lower()
+        return [name for name in self._by_description if needle in name.lower()]
+
+    def _union(self, index: Dict[str, RoaringBitmap], keys: List[str]) -> RoaringBitmap:
+        return RoaringBitmap.union_all(index[key] for key in keys)
+
+    def merchant_access_path(self, merchant: str) -> AccessPath:
+        names = self._matching_names(merchant)
+        estimate = sum(len(self._by_description[name]) for name in names)
+        needle = merchant.lower()
+        return AccessPath(
+            name="merchant",
+            estimate=estimate,
+            fetch_cost=estimate,
+            fetch=lambda: self._union(self._by_description, names),
+            predicate=lambda t: any(needle in name.lower() for name in (t.merchant, t.description) if name)
+        )
+
+    def recipient_access_path(self, recipient: str) -> AccessPath:
+        names = self._matching_names(recipient)
+        estimate = min(len(self._transfers), sum(len(self._by_description[name]) for name in names))
+        return AccessPath(
+            name="recipient",
+            estimate=estimate,
+            fetch_cost=estimate,
+            fetch=lambda: self._union(self._by_description, names) & self._transfers,
+            predicate=lambda t: t.is_transfer and recipient in t.description
+        )
+
+    def date_access_path(self, date_from: Optional[str], date_to: Optional[str]) -> AccessPath:
+        """기간 조건 접근 경로
+
+        온전히 포함되는 가운데 달은 미리 만든 월 비트맵을 합치고,
+        걸쳐 있는 처음/마지막 달만 날짜 순서 인덱스 구간의 rowid를 정렬해 씁니다 (최대 두 달치).
+        """
+        date_from = date_from or ""
+        date_to = date_to or _MAX_KEY
+        start, stop = self._date_bounds(date_from, date_to)
+        edges: List[Tuple[int, int]] = []
+        middle: List[str] = []
+        if start < stop:
+            keys = self._order_keys
+            first, last = keys[start][0][:7], keys[stop - 1][0][:7]
+            if first == last:
+                edges.append((start, stop))
+            else:
+                edges.append((start, bisect_left(keys, (first + _MAX_KEY,))))
+                edges.append((bisect_left(keys, (last,)), stop))
+                middle = self._months[bisect_right(self._months, first):bisect_left(self._months, last)]
+
+        def fetch() -> RoaringBitmap:
+            parts = [RoaringBitmap(sorted(self._order[edge_start:edge_stop])) for edge_start, edge_stop in edges]
+            return RoaringBitmap.union_all(parts + [self._by_month[month] for month in middle])
+
+        return AccessPath(
+            name="date_order",
+            estimate=stop - start,
+            fetch_cost=sum(edge_stop - edge_start for edge_start, edge_stop in edges) + len(middle),
+            fetch=fetch,
+            predicate=lambda t: date_from <= t.date <= date_to
+        )
+
+    def type_access_path(self, transaction_type: str) -> AccessPath:
+        rows = self._by_type.get(transaction_type, RoaringBitmap())
+        return AccessPath(
+            name="type",
+            estimate=len(rows),
+            fetch_cost=0,
+            fetch=lambda: rows,
+            predicate=lambda t: t.type == transaction_type
+        )
+
+    def category_access_path(self, category: str) -> AccessPath:
+        rows = self._by_category.get(category, RoaringBitmap())
+        return AccessPath(
+            name="category",
+            estimate=len(rows),
+            fetch_cost=0,
+            fetch=lambda: rows,
+            predicate=lambda t: t.category == category
+        )
+
+    def bank_access_path(self, bank: str) -> AccessPath:
+        rows = self._by_bank.get(bank, RoaringBitmap())
+        return AccessPath(
+            name="bank",
+            estimate=len(rows),
+            fetch_cost=0,
+            fetch=lambda: rows,
+            predicate=lambda t: t.bank == bank
+        )
+
+    def amount_access_path(self, min_amount: Optional[int], max_amount: Optional[int]) -> AccessPath:
+        start, stop = self._amount_bounds(min_amount, max_amount)
+
+        def in_range(transaction: TransactionRecord) -> bool:
+            amount = abs(transaction.amount)
+            if min_amount is not None and amount < min_amount:
+                return False
+            if max_amount is not None and amount > max_amount:
+                return False
+            return True
+
+        return AccessPath(
+            name="amount_order",
+            estimate=stop - start,
+            fetch_cost=stop - start,
+            fetch=lambda: RoaringBitmap(sorted(rowid for _, rowid in self._amount_keys[start:stop])),
+            predicate=in_range
+        )
+
+    @traced("repo.get_monthly_summary")
     def get_monthly_summary(self, year_month: str) -> Dict[str, Any]:
         """월별 거래 요약"""
-        monthly_transactions = [
-            t for t in self.transactions
-            if t["date"].startswith(year_month)
-        ]
+        start, stop = self._date_bounds(f"{year_month}-01", f"{year_month}-31")
+        monthly_transactions = list(self.iter_recent(start=start, stop=stop))
 
-        total_income = sum(t["amount"] for t in monthly_transactions if t["amount"] > 0)
-        total_expense = sum(abs(t["amount"]) for t in monthly_transactions if t["amount"] < 0)
+        total_income = sum(t.signed_amount for t in monthly_transactions if t.signed_amount > 0)
+        total_expense = sum(-t.signed_amount for t in monthly_transactions if t.signed_amount < 0)
 
         return {
             "year_month": year_month,
@@ -0,0 +1,103 @@
+"""
+빠른 응답 직렬화
+
+SearchService 결과는 내부에서 만든 신뢰할 수 있는 dict이므로
+SearchResponse(**result)로 거래내역 한 건 한 건을 다시 검증하지 않고 바로 JSON으로 인코딩합니다.
+orjson이 설치되어 있으면 사용하고, 거래내역이 많으면 청크 단위로 스트리밍합니다.
+"""
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from starlette.responses import Response, StreamingResponse
+
+from app.models import AccountTransaction, SearchResponse, TransactionRecord
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 동작
+    orjson = None
+
+# 이 건수를 넘는 거래내역은 스트리밍으로 인코딩
+STREAMING_THRESHOLD = 500
+# 스트리밍 시 한 번에 인코딩할 거래내역 수
+STREAM_CHUNK_SIZE = 256
+
+# (필드명, 필수 여부, 기본값) - SearchResponse 필드 순서 유지
+_SEARCH_FIELDS = [
+    (name, field.required, field.default) for name, field in SearchResponse.__fields__.items()
+]
+
+
+def _default(value: Any) -> Any:
+    """기본 인코더가 모르는 타입 처리 (TransactionRecord/AccountTransaction은 여기서 dict로 변환)"""
+    if isinstance(value, (TransactionRecord, AccountTransaction)):
+        return value.to_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(data: Any) -> bytes:
+    """JSON 바이트로 인코딩"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def build_search_payload(result: Dict[str, Any]) -> Dict[str, Any]:
+    """검증 없이 SearchResponse 스키마에 맞춘 dict 생성 (기본값만 채움)"""
+    payload = {}
+    for name, required, default in _SEARCH_FIELDS:
+        payload[name] = result[name] if required else result.get(name, default)
+    if payload["suggestions"] is None:
+        payload["suggestions"] = []
+    return payload
+
+
+def _iter_search_chunks(payload: Dict[str, Any], transactions: List[Any]) -> Iterator[bytes]:
+    """거래내역 배열만 청크 단위로 나눠 인코딩"""
+    screen_data = {key: value for key, value in payload["screen_data"].items() if key != "transactions"}
+    head = {key: value for key, value in payload.items() if key != "screen_data"}
+
+    # {"success":...,"screen_data":{..., "transactions":[ ... ]}}
+    yield dumps(head)[:-1] + b',"screen_data":' + dumps(screen_data)[:-1]
+    yield b',"transactions":[' if screen_data else b'"transactions":['
+
+    for start in range(0, len(transactions), STREAM_CHUNK_SIZE):
+        chunk = dumps(transactions[start:start + STREAM_CHUNK_SIZE])[1:-1]
+        if not chunk:
+            continue
+        yield chunk if start == 0 else b"," + chunk
+
+    yield b"]}}"
+
+
+def search_json_response(result: Dict[str, Any]) -> Response:
+    """검색 결과를 JSON 응답으로 변환 (대용량이면 스트리밍)"""
+    payload = build_search_payload(result)
+    transactions = payload["screen_data"].get("transactions")
+
+    if isinstance(transactions, list) and len(transactions) > STREAMING_THRESHOLD:
+        return StreamingResponse(
+            _iter_search_chunks(payload, transactions),
+            media_type="application/json"
+        )
+
+    return Response(content=dumps(payload), media_type="application/json")
+
+
+def json_response(payload: Any) -> Response:
+    """검증 없이 바로 인코딩한 JSON 응답"""
+    return Response(content=dumps(payload), media_type="application/json")
+
+
+def _iter_sse(events: Iterable[Tuple[str, Any]]) -> Iterator[bytes]:
+    for event, data in events:
+        yield b"event: " + event.encode("utf-8") + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def sse_response(events: Iterable[Tuple[str, Any]]) -> StreamingResponse:
+    """(이벤트, 데이터) 스트림을 Server-Sent Events 응답으로 변환 (프록시 버퍼링 끔)"""
+    return StreamingResponse(
+        _iter_sse(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
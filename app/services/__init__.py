@@ -8,6 +8,8 @@ Business Logic Services Package
 from .search_service import SearchService
 from .user_service import UserService
 from .nlp_service import GeminiNLPService
+from .suggest_service import SuggestService
+from .analytics_service import AnalyticsService
 
 # 서비스 인스턴스들 (싱글톤 패턴)
 _nlp_service = None
@@ -54,6 +56,8 @@ __all__ = [
     "SearchService",
     "UserService",
     "PersonalizedService",  # 추가됨
+    "SuggestService",
+    "AnalyticsService",
     "get_search_service",
     "get_user_service",
     "get_personalized_service",  # 추가됨
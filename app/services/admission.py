@@ -0,0 +1,122 @@
+"""
+요청 수락 제어 (admission control)
+
+클라이언트별 토큰 버킷 두 개와 전역 과부하 감지로 요청마다 처리 방식을 정합니다.
+- FULL: 평소처럼 처리 (Gemini 호출 가능)
+- DEGRADED: Gemini를 부르지 않고 로컬 파서/기본 설명으로 바로 처리 (응답에 degraded 표시)
+- REJECT: 로컬 처리 한도까지 넘긴 요청, 바로 429
+
+LLM 버킷(ADMISSION_RATE)을 다 쓴 클라이언트와, 과부하 상태(LLM 게이트웨이 대기열이 길거나
+최근 Gemini 호출 실패율이 높음)에서 들어온 요청은 DEGRADED로 처리합니다.
+FULL 요청이 캐시/로컬 분류기로 끝나 Gemini를 부르지 않았으면 LLM 토큰을 돌려줍니다 (refund).
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.config import settings
+from app.services.llm_gateway import LLMGateway, get_llm_gateway
+
+FULL = "full"
+DEGRADED = "degraded"
+REJECT = "reject"
+
+# 버킷을 유지하는 최대 클라이언트 수 (오래 안 쓴 클라이언트부터 제거)
+MAX_TRACKED_CLIENTS = 10_000
+# 과부하 판단에 쓰는 최근 구간 (초)과 최소 호출 수
+FAILURE_WINDOW = 30.0
+FAILURE_MIN_CALLS = 10
+
+
+class TokenBucket:
+    """초당 rate개씩 차오르고 최대 burst개까지 쌓이는 토큰 버킷"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def try_acquire(self, now: float) -> bool:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def refund(self):
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class AdmissionController:
+    """클라이언트별 속도 제한 + 전역 과부하 감지"""
+
+    def __init__(self, gateway: Optional[LLMGateway] = None):
+        self.gateway = gateway or get_llm_gateway()
+        # 클라이언트 -> (전체 요청 버킷, Gemini 호출 버킷)
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.decisions: Dict[str, int] = {FULL: 0, DEGRADED: 0, REJECT: 0}
+        self.refunds = 0
+
+    def _client_buckets(self, client_id: str) -> tuple:
+        buckets = self._buckets.get(client_id)
+        if buckets is None:
+            buckets = self._buckets[client_id] = (
+                TokenBucket(settings.ADMISSION_HARD_RATE, settings.ADMISSION_HARD_BURST),
+                TokenBucket(settings.ADMISSION_RATE, settings.ADMISSION_BURST),
+            )
+            if len(self._buckets) > MAX_TRACKED_CLIENTS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client_id)
+        return buckets
+
+    def overloaded(self) -> bool:
+        """전역 과부하 여부 (LLM 대기열 길이 또는 최근 Gemini 실패율)"""
+        if self.gateway.queue_depth() >= settings.OVERLOAD_QUEUE_DEPTH:
+            return True
+        ratio, calls = self.gateway.failure_ratio(FAILURE_WINDOW)
+        return calls >= FAILURE_MIN_CALLS and ratio >= settings.OVERLOAD_FAILURE_RATIO
+
+    def admit(self, client_id: str) -> str:
+        """요청 처리 방식 결정 (FULL, DEGRADED, REJECT)"""
+        now = time.monotonic()
+        with self._lock:
+            hard_bucket, llm_bucket = self._client_buckets(client_id)
+            if not hard_bucket.try_acquire(now):
+                decision = REJECT
+            elif self.overloaded() or not llm_bucket.try_acquire(now):
+                decision = DEGRADED
+            else:
+                decision = FULL
+            self.decisions[decision] += 1
+        if decision != FULL:
+            print(f"🚦 요청 제한: {client_id} → {decision}")
+        return decision
+
+    def settle(self, client_id: str, decision: str, llm_calls: int):
+        """요청이 끝난 뒤 정산 (FULL인데 Gemini를 부르지 않았으면 LLM 토큰 반환)"""
+        if decision != FULL or llm_calls:
+            return
+        with self._lock:
+            buckets = self._buckets.get(client_id)
+            if buckets is not None:
+                buckets[1].refund()
+                self.refunds += 1
+
+    def stats(self) -> Dict[str, object]:
+        ratio, calls = self.gateway.failure_ratio(FAILURE_WINDOW)
+        return {
+            "overloaded": self.overloaded(),
+            "llm_queue_depth": self.gateway.queue_depth(),
+            "llm_failure_ratio": round(ratio, 3),
+            "llm_recent_calls": calls,
+            "tracked_clients": len(self._buckets),
+            "decisions": dict(self.decisions),
+            "llm_refunds": self.refunds
+        }
@@ -0,0 +1,197 @@
+"""
+한국어 금액 파서
+
+"5천원", "1.5만", "십만 오천원", "3백만원", "10만5천원", "10,000원" 처럼
+아라비아 숫자/한글 숫자/단위가 섞인 금액 표현을 한 번의 순회로 정수 금액으로 변환합니다.
+정규식을 여러 번 시도하지 않으므로 모든 검색어의 규칙 기반 처리 경로에서 사용할 수 있습니다.
+"""
+from typing import Iterator, Optional, Tuple
+
+from app.config import settings
+
+# 한글 숫자
+_HANGUL_DIGITS = {
+    "영": 0, "공": 0, "일": 1, "이": 2, "삼": 3, "사": 4, "오": 5,
+    "육": 6, "륙": 6, "칠": 7, "팔": 8, "구": 9,
+}
+# 만 미만 단위
+_SMALL_UNITS = {"십": 10, "백": 100, "천": 1000}
+# 만 이상 단위
+_BIG_UNITS = {"만": 10_000, "억": 100_000_000, "조": 1_000_000_000_000}
+
+_CURRENCY = "원"
+# 숫자 바로 뒤에 오면 금액이 아닌 표현 (날짜, 기간, 횟수 등)
+_NON_AMOUNT_SUFFIXES = frozenset("년월일주시분초개번회살명건달")
+
+
+def _is_ascii_digit(ch: str) -> bool:
+    return "0" <= ch <= "9"
+
+
+def _is_hangul(ch: str) -> bool:
+    return "가" <= ch <= "힣"
+
+
+def _is_numeral_start(ch: str) -> bool:
+    return (_is_ascii_digit(ch) or ch in _HANGUL_DIGITS
+            or ch in _SMALL_UNITS or ch in _BIG_UNITS)
+
+
+def _is_comma_group(text: str, pos: int) -> bool:
+    """쉼표 뒤가 정확히 세 자리 숫자인지 확인"""
+    group = text[pos:pos + 3]
+    if len(group) != 3 or not group.isascii() or not group.isdigit():
+        return False
+    return pos + 3 >= len(text) or not _is_ascii_digit(text[pos + 3])
+
+
+def _scan_digits(text: str, pos: int) -> Tuple[float, int]:
+    """pos에서 시작하는 아라비아 숫자(쉼표 구분, 소수점 포함)를 읽어 (값, 다음 위치) 반환"""
+    length = len(text)
+    end = pos
+    digits = []
+    while end < length:
+        ch = text[end]
+        if _is_ascii_digit(ch):
+            digits.append(ch)
+            end += 1
+        elif ch == "," and "." not in digits and _is_comma_group(text, end + 1):
+            # 세 자리 쉼표 구분만 허용 ("10,000")
+            end += 1
+        elif ch == "." and end + 1 < length and _is_ascii_digit(text[end + 1]) and "." not in digits:
+            digits.append(ch)
+            end += 1
+        else:
+            break
+    return float("".join(digits)), end
+
+
+def iter_amounts(text: str) -> Iterator[Tuple[int, int, int]]:
+    """텍스트 안의 금액 표현을 순서대로 (시작 위치, 끝 위치, 금액)으로 반환"""
+    length = len(text)
+    pos = 0
+
+    while pos < length:
+        ch = text[pos]
+        if not _is_numeral_start(ch) or (pos > 0 and text[pos - 1].isascii() and text[pos - 1].isalnum()):
+            pos += 1
+            continue
+
+        start = pos
+        total = 0            # 만/억/조 단위로 확정된 합
+        section = 0          # 현재 만 미만 구간의 합
+        number = None        # 단위가 붙지 않은 직전 숫자
+        has_ascii = False
+        has_unit = False
+        has_currency = False
+        valid = True
+
+        while pos < length:
+            ch = text[pos]
+            if _is_ascii_digit(ch):
+                if number is not None:
+                    break
+                number, pos = _scan_digits(text, pos)
+                has_ascii = True
+                continue
+            if ch in _HANGUL_DIGITS:
+                if number is not None:
+                    # "15일"의 "일"은 한글 숫자가 아니라 날짜
+                    if ch in _NON_AMOUNT_SUFFIXES:
+                        valid = False
+                    break
+                number = _HANGUL_DIGITS[ch]
+            elif ch in _SMALL_UNITS:
+                section += (1 if number is None else number) * _SMALL_UNITS[ch]
+                number = None
+                has_unit = True
+            elif ch in _BIG_UNITS:
+                section += 0 if number is None else number
+                total += (section or 1) * _BIG_UNITS[ch]
+                section = 0
+                number = None
+                has_unit = True
+            elif ch == _CURRENCY:
+                has_currency = True
+                pos += 1
+                break
+            elif ch == " " and number is None and has_unit:
+                # "십만 오천원"처럼 단위 뒤 공백은 같은 금액으로 이어서 읽음
+                if pos + 1 < length and _is_numeral_start(text[pos + 1]):
+                    pos += 1
+                    continue
+                break
+            elif ch == " " and number is not None and has_ascii:
+                # "5 만원"처럼 숫자와 단위 사이 공백 허용
+                if pos + 1 < length and (text[pos + 1] in _SMALL_UNITS or text[pos + 1] in _BIG_UNITS):
+                    pos += 1
+                    continue
+                break
+            else:
+                if ch in _NON_AMOUNT_SUFFIXES and number is not None:
+                    valid = False
+                break
+            pos += 1
+
+        end = pos
+        # 공백으로 이어 읽다가 멈춘 경우 끝의 공백 제외
+        while end > start and text[end - 1] == " ":
+            end -= 1
+
+        value = total + section + (0 if number is None else number)
+        # "1.5"처럼 단위 없이 끝난 소수는 원 단위 금액이 아님 (반올림하지 않음)
+        if number is not None and number != int(number):
+            valid = False
+
+        if not has_ascii and not has_currency:
+            # 한글 숫자만 있는 경우 "이체", "백화점", "오늘", "천원만" 같은 단어와 구분
+            if not has_unit or end - start < 2 or (pos < length and _is_hangul(text[pos])):
+                valid = False
+
+        if valid and value > 0:
+            yield start, end, int(round(value))
+
+        if pos == start:
+            pos += 1
+
+
+def parse_korean_amount(text: str) -> Optional[int]:
+    """텍스트에서 첫 번째 금액을 정수로 반환 (없으면 None)"""
+    for _, _, amount in iter_amounts(text):
+        return amount
+    return None
+
+
+def is_valid_transfer_amount(amount: int) -> bool:
+    """송금 가능 금액 범위인지 확인"""
+    return settings.MIN_TRANSFER_AMOUNT <= amount <= settings.MAX_TRANSFER_AMOUNT
+
+
+# 금액 범위 표현
+_RANGE_SEPARATORS = ("~", "-", "에서", "부터")
+_MIN_SUFFIXES = (("이상", 0), ("부터", 0), ("넘는", 1), ("넘게", 1), ("초과", 1), ("보다 큰", 1), ("보다 많은", 1))
+_MAX_SUFFIXES = (("이하", 0), ("까지", 0), ("미만", 1), ("보다 작은", 1), ("보다 적은", 1), ("안 되는", 1))
+
+
+def parse_amount_range(text: str) -> Optional[Tuple[Optional[int], Optional[int]]]:
+    """금액 범위 표현("10만원 이상", "3만원~5만원", "5만원 미만")을 (최소, 최대)로 반환"""
+    amounts = list(iter_amounts(text))
+    if not amounts:
+        return None
+
+    if len(amounts) >= 2:
+        (_, first_end, first), (second_start, _, second) = amounts[0], amounts[1]
+        between = text[first_end:second_start].strip()
+        if between in _RANGE_SEPARATORS:
+            return min(first, second), max(first, second)
+
+    for _, end, amount in amounts:
+        suffix = text[end:end + 8].lstrip()
+        for word, offset in _MIN_SUFFIXES:
+            if suffix.startswith(word):
+                return amount + offset, None
+        for word, offset in _MAX_SUFFIXES:
+            if suffix.startswith(word):
+                return None, amount - offset
+
+    return None
@@ -0,0 +1,200 @@
+"""
+사용자 거래내역 기반 개체명 사전 (gazetteer)
+
+사용자의 송금 연락처와 가맹점 이름을 Aho-Corasick 다중 패턴 오토마톤 하나로 만들어
+검색어를 한 번 훑는 것으로 개체명을 찾습니다.
+- 이름 뒤의 조사(에게/한테/님/으로 등)는 떼고 매칭 ("홍길동에게" → 홍길동)
+- 이름이 다른 단어 중간에서 시작하면 매칭하지 않음 ("김철수" 사전으로 "박김철수" 매칭 안 함)
+- 겹치는 매칭은 더 앞에서 시작하고 더 긴 쪽을 사용 ("스타벅스 강남점" > "스타벅스")
+- 레포지토리에 거래가 추가되면 새 행만 사전에 넣고, 실패 링크는 다음 매칭 때 한 번 다시 계산
+"""
+import threading
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.models.transaction import OUTFLOW_TYPES, TransactionRecord
+
+CONTACT = "contact"
+MERCHANT = "merchant"
+
+# 이름 뒤에 붙어도 같은 이름으로 보는 조사 (이름 뒤 한글 덩어리 전체가 이 중 하나여야 함)
+PARTICLES = frozenset([
+    "에게서", "한테서", "에게", "한테", "님께", "님한테", "님에게", "님이", "님", "께",
+    "으로", "로", "에서", "이랑", "랑", "하고", "이가", "이는", "이한테", "이에게",
+    "은", "는", "이", "가", "을", "를", "의", "도", "와", "과", "씨",
+])
+
+
+def _is_hangul(ch: str) -> bool:
+    return "가" <= ch <= "힣"
+
+
+class GazetteerMatch(NamedTuple):
+    kind: str       # contact, merchant
+    value: str      # 사전에 등록된 원래 이름
+    start: int
+    end: int        # 조사를 뺀 이름의 끝 위치
+
+
+class AhoCorasick:
+    """다중 패턴 문자열 매칭 오토마톤 (패턴 추가 후 첫 검색 때 실패 링크 계산)"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 노드에서 끝나는 패턴의 값 / 실패 링크를 따라 함께 끝나는 패턴까지 포함한 (길이, 값)
+        self._own: List[List[Tuple[int, Tuple[str, str]]]] = [[]]
+        self._outputs: List[List[Tuple[int, Tuple[str, str]]]] = [[]]
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def add(self, pattern: str, value: Tuple[str, str]):
+        """패턴 추가 (트라이에 경로만 만들고 실패 링크는 다음 검색 때 계산)"""
+        if not pattern:
+            return
+        with self._lock:
+            node = 0
+            for ch in pattern:
+                child = self._goto[node].get(ch)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][ch] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._own.append([])
+                node = child
+            if (len(pattern), value) not in self._own[node]:
+                self._own[node].append((len(pattern), value))
+                self._dirty = True
+
+    def _build_failure_links(self):
+        """BFS로 실패 링크와 노드별 출력 계산 (얕은 노드부터라 실패 링크 대상의 출력은 이미 완성됨)"""
+        goto, fail, own = self._goto, self._fail, self._own
+        outputs = [list(items) for items in own]
+        queue = deque(goto[0].values())
+        for child in queue:
+            fail[child] = 0
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(ch, 0)
+                outputs[child] = own[child] + outputs[fail[child]]
+                queue.append(child)
+        self._outputs = outputs
+        self._dirty = False
+
+    def find_all(self, text: str) -> List[Tuple[int, int, Tuple[str, str]]]:
+        """(시작, 끝, 값) 매칭 전체 (겹침 포함)"""
+        matches = []
+        with self._lock:
+            if self._dirty:
+                self._build_failure_links()
+            goto, fail, outputs = self._goto, self._fail, self._outputs
+            node = 0
+            for index, ch in enumerate(text):
+                while node and ch not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(ch, 0)
+                for length, value in outputs[node]:
+                    matches.append((index + 1 - length, index + 1, value))
+        return matches
+
+
+class Gazetteer:
+    """사용자 거래내역의 연락처/가맹점 사전 (레포지토리가 바뀌면 새 행만 반영)"""
+
+    def __init__(self, transaction_repo_getter):
+        # 공유 저장소 버전 교체/거래 추가를 따라가도록 레포지토리는 매번 getter로 가져옴
+        self._get_repo = transaction_repo_getter
+        self._lock = threading.Lock()
+        self._lineage: Optional[int] = None
+        self._size = 0
+        self._automaton = AhoCorasick()
+        self._names: Dict[str, Set[str]] = {CONTACT: set(), MERCHANT: set()}
+
+    def _sync(self) -> AhoCorasick:
+        """레포지토리에 새로 추가된 행만 사전에 반영 (다른 계보로 바뀌면 다시 만듦)"""
+        repo = self._get_repo()
+        if repo.lineage == self._lineage and len(repo) == self._size:
+            return self._automaton
+        with self._lock:
+            if repo.lineage != self._lineage:
+                self._lineage = repo.lineage
+                self._size = 0
+                self._automaton = AhoCorasick()
+                self._names = {CONTACT: set(), MERCHANT: set()}
+            total = len(repo)
+            for rowid in range(self._size, total):
+                self._add_record(repo.row(rowid))
+            self._size = total
+            return self._automaton
+
+    def _add_record(self, record: TransactionRecord):
+        """거래 한 건의 연락처/가맹점 이름 등록 (자동완성과 같은 기준)"""
+        if record.is_transfer and record.description:
+            self._add(CONTACT, record.description)
+
+        merchant = record.merchant
+        if not merchant and not record.is_transfer and record.type in OUTFLOW_TYPES:
+            merchant = record.description
+        if merchant:
+            self._add(MERCHANT, merchant)
+
+    def _add(self, kind: str, name: str):
+        name = name.strip()
+        if len(name) < 2 or name in self._names[kind]:
+            return
+        self._names[kind].add(name)
+        self._automaton.add(name.lower(), (kind, name))
+
+    def names(self, kind: str) -> List[str]:
+        self._sync()
+        return sorted(self._names[kind])
+
+    def match(self, text: str) -> List[GazetteerMatch]:
+        """검색어에서 사전 이름 찾기 (앞에서 시작하는 긴 매칭 우선, 겹치지 않음)"""
+        automaton = self._sync()
+        lowered = text.lower()
+        candidates = []
+        for start, end, (kind, value) in automaton.find_all(lowered):
+            if _on_boundary(lowered, start, end, kind):
+                candidates.append(GazetteerMatch(kind, value, start, end))
+
+        candidates.sort(key=lambda item: (item.start, -(item.end - item.start)))
+        matches = []
+        last_end = 0
+        for candidate in candidates:
+            if candidate.start >= last_end:
+                matches.append(candidate)
+                last_end = candidate.end
+        return matches
+
+    def extract(self, text: str) -> Dict[str, str]:
+        """종류별 첫 번째 이름 ({"contact": ..., "merchant": ...})"""
+        found = {}
+        for match in self.match(text):
+            found.setdefault(match.kind, match.value)
+        return found
+
+
+def _on_boundary(text: str, start: int, end: int, kind: str) -> bool:
+    """단어 경계에서 시작하는 매칭인지
+
+    연락처는 뒤에 조사만 붙을 수 있고("홍길동에게"), 가맹점은 뒤에 다른 말이 바로 붙어도 됨("스타벅스결제").
+    """
+    if start > 0 and _is_hangul(text[start - 1]) and _is_hangul(text[start]):
+        return False
+    if kind == MERCHANT or end >= len(text) or not _is_hangul(text[end]) or not _is_hangul(text[end - 1]):
+        return True
+    return _particle_follows(text, end)
+
+
+def _particle_follows(text: str, end: int) -> bool:
+    """end부터 이어지는 한글 덩어리가 조사인지 ("홍길동에게 5만원"의 "에게")"""
+    word_end = end
+    while word_end < len(text) and _is_hangul(text[word_end]):
+        word_end += 1
+    return text[end:word_end] in PARTICLES
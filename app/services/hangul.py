@@ -0,0 +1,60 @@
+"""
+한글 자모 유틸리티
+
+입력 중인 검색어("김처", "김철ㅅ")와 초성 검색("ㄱㅊㅅ")을 지원하기 위해
+완성형 음절을 호환 자모 시퀀스로 분해합니다.
+겹받침/겹모음도 낱자로 풀어서 입력 도중 상태와 접두사로 비교할 수 있게 합니다.
+"""
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+              "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 겹자모 -> 입력 순서대로의 낱자
+_COMPOUND = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+_CONSONANTS = frozenset("ㄱㄲㄳㄴㄵㄶㄷㄸㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅃㅄㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ")
+
+
+def _split(jamo: str) -> str:
+    return _COMPOUND.get(jamo, jamo)
+
+
+def decompose(text: str) -> str:
+    """완성형 음절을 낱자 자모 시퀀스로 분해 ("김철" -> "ㄱㅣㅁㅊㅓㄹ")"""
+    parts = []
+    for ch in text:
+        code = ord(ch)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            offset = code - _SYLLABLE_BASE
+            parts.append(CHOSEONG[offset // 588])
+            parts.append(_split(_JUNGSEONG[offset // 28 % 21]))
+            parts.append(_split(_JONGSEONG[offset % 28]))
+        else:
+            parts.append(_split(ch))
+    return "".join(parts)
+
+
+def choseong(text: str) -> str:
+    """초성만 추출 ("김철수" -> "ㄱㅊㅅ", 한글 외 문자는 그대로)"""
+    parts = []
+    for ch in text:
+        code = ord(ch)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            parts.append(CHOSEONG[(code - _SYLLABLE_BASE) // 588])
+        else:
+            parts.append(ch)
+    return "".join(parts)
+
+
+def is_choseong_query(text: str) -> bool:
+    """자음만으로 된 검색어인지 ("ㄱㅊㅅ")"""
+    stripped = text.replace(" ", "")
+    return bool(stripped) and all(ch in _CONSONANTS for ch in stripped)
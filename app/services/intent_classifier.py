@@ -0,0 +1,236 @@
+"""
+로컬 의도 분류기
+
+문자 n-gram TF-IDF + nearest centroid(코사인 유사도) 분류기입니다.
+라벨이 붙은 검색어 파일(app/data/intent_queries.tsv)과 메뉴 레지스트리 키워드로 학습하고,
+JSON으로 저장해 시작 시 몇 ms 안에 불러옵니다. 분류는 희소 dict 연산만 하므로 CPU에서 수십 µs입니다.
+
+신뢰도는 클래스별 유사도에 temperature softmax를 적용한 값이며,
+temperature는 학습 데이터 k-fold 교차검증의 음의 로그우도가 최소가 되도록 맞춥니다(보정).
+신뢰도가 NLP_CONFIDENCE_THRESHOLD 미만이면 Gemini로 넘깁니다.
+
+학습:
+    python -m app.services.intent_classifier [--data app/data/intent_queries.tsv] [--out app/data/intent_model.json]
+"""
+import argparse
+import json
+import math
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+DEFAULT_TRAINING_PATH = os.path.join(_DATA_DIR, "intent_queries.tsv")
+DEFAULT_MODEL_PATH = os.path.join(_DATA_DIR, "intent_model.json")
+
+NGRAM_RANGE = (1, 3)
+CV_FOLDS = 5
+# temperature 탐색 후보
+_TEMPERATURES = [0.01 * step for step in range(1, 101)]
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """소문자 + 공백 정리"""
+    return _SPACES.sub(" ", text.strip().lower())
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = NGRAM_RANGE) -> Counter:
+    """단어 경계(공백)를 포함한 문자 n-gram 빈도"""
+    padded = f" {normalize_query(text)} "
+    low, high = ngram_range
+    grams = Counter()
+    for n in range(low, high + 1):
+        for start in range(len(padded) - n + 1):
+            gram = padded[start:start + n]
+            if gram.strip():
+                grams[gram] += 1
+    return grams
+
+
+def _normalize_vector(vector: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    if not norm:
+        return vector
+    return {key: value / norm for key, value in vector.items()}
+
+
+def _softmax(scores: Dict[str, float], temperature: float) -> Dict[str, float]:
+    top = max(scores.values())
+    exps = {label: math.exp((score - top) / temperature) for label, score in scores.items()}
+    total = sum(exps.values())
+    return {label: value / total for label, value in exps.items()}
+
+
+class IntentClassifier:
+    """문자 n-gram TF-IDF nearest centroid 분류기"""
+
+    def __init__(self, idf: Dict[str, float], centroids: Dict[str, Dict[str, float]],
+                 temperature: float = 0.1, ngram_range: Tuple[int, int] = NGRAM_RANGE):
+        self.idf = idf
+        self.centroids = centroids
+        self.labels = sorted(centroids)
+        self.temperature = temperature
+        self.ngram_range = tuple(ngram_range)
+        # 학습에 없던 n-gram의 idf (무시)
+        self._default_idf = 0.0
+
+    # ===== 학습 =====
+
+    @classmethod
+    def train(cls, samples: List[Tuple[str, str]], ngram_range: Tuple[int, int] = NGRAM_RANGE,
+              calibrate: bool = True) -> "IntentClassifier":
+        """(검색어, 의도) 목록으로 학습"""
+        documents = [char_ngrams(text, ngram_range) for text, _ in samples]
+        document_frequency = Counter()
+        for grams in documents:
+            document_frequency.update(grams.keys())
+        total = len(documents)
+        idf = {gram: math.log((1 + total) / (1 + count)) + 1.0 for gram, count in document_frequency.items()}
+
+        classifier = cls(idf, {}, ngram_range=ngram_range)
+        sums: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for grams, (_, label) in zip(documents, samples):
+            for gram, weight in classifier._vectorize_counts(grams).items():
+                sums[label][gram] += weight
+        classifier.centroids = {label: _normalize_vector(dict(vector)) for label, vector in sums.items()}
+        classifier.labels = sorted(classifier.centroids)
+
+        if calibrate:
+            classifier.temperature = cls._fit_temperature(samples, ngram_range)
+        return classifier
+
+    @classmethod
+    def _fit_temperature(cls, samples: List[Tuple[str, str]], ngram_range: Tuple[int, int]) -> float:
+        """k-fold 교차검증 예측의 NLL이 최소인 temperature 선택"""
+        held_out: List[Tuple[Dict[str, float], str]] = []
+        for fold in range(CV_FOLDS):
+            train = [sample for index, sample in enumerate(samples) if index % CV_FOLDS != fold]
+            test = [sample for index, sample in enumerate(samples) if index % CV_FOLDS == fold]
+            if not test or len({label for _, label in train}) < 2:
+                continue
+            model = cls.train(train, ngram_range, calibrate=False)
+            for text, label in test:
+                held_out.append((model.scores(text), label))
+
+        if not held_out:
+            return 0.1
+
+        def nll(temperature: float) -> float:
+            loss = 0.0
+            for scores, label in held_out:
+                probability = _softmax(scores, temperature).get(label, 0.0)
+                loss -= math.log(max(probability, 1e-12))
+            return loss / len(held_out)
+
+        return min(_TEMPERATURES, key=nll)
+
+    # ===== 분류 =====
+
+    def _vectorize_counts(self, grams: Counter) -> Dict[str, float]:
+        vector = {}
+        for gram, count in grams.items():
+            weight = self.idf.get(gram, self._default_idf)
+            if weight:
+                vector[gram] = (1.0 + math.log(count)) * weight
+        return _normalize_vector(vector)
+
+    def vectorize(self, text: str) -> Dict[str, float]:
+        return self._vectorize_counts(char_ngrams(text, self.ngram_range))
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """클래스별 코사인 유사도"""
+        vector = self.vectorize(text)
+        return {
+            label: sum(weight * centroid.get(gram, 0.0) for gram, weight in vector.items())
+            for label, centroid in self.centroids.items()
+        }
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """보정된 클래스별 확률"""
+        return _softmax(self.scores(text), self.temperature)
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """(의도, 신뢰도)"""
+        probabilities = self.predict_proba(text)
+        label = max(probabilities, key=probabilities.get)
+        return label, probabilities[label]
+
+    # ===== 저장/불러오기 =====
+
+    def save(self, path: str = DEFAULT_MODEL_PATH):
+        payload = {
+            "version": 1,
+            "ngram_range": list(self.ngram_range),
+            "temperature": self.temperature,
+            "idf": self.idf,
+            "centroids": self.centroids,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> "IntentClassifier":
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        return cls(payload["idf"], payload["centroids"], payload["temperature"], tuple(payload["ngram_range"]))
+
+
+def load_training_samples(path: str = DEFAULT_TRAINING_PATH, include_menus: bool = True) -> List[Tuple[str, str]]:
+    """라벨 파일(query<TAB>intent) 읽기, 메뉴 레지스트리 키워드/별칭/예시는 menu로 추가"""
+    samples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            text, label = line.rsplit("\t", 1)
+            samples.append((text, label.strip()))
+
+    if include_menus:
+        from app.services.menu_registry import menu_registry
+        known = {text for text, _ in samples}
+        for menu in menu_registry.menus:
+            for text in menu.keywords + list(menu.aliases) + menu.examples:
+                if text not in known:
+                    known.add(text)
+                    samples.append((text, "menu"))
+    return samples
+
+
+_intent_classifier = None
+_intent_classifier_loaded = False
+
+
+def get_intent_classifier() -> Optional[IntentClassifier]:
+    """로컬 의도 분류기 싱글톤 (모델 파일이 없으면 None)"""
+    global _intent_classifier, _intent_classifier_loaded
+    if not _intent_classifier_loaded:
+        _intent_classifier_loaded = True
+        path = settings.INTENT_MODEL_PATH or DEFAULT_MODEL_PATH
+        try:
+            started = time.perf_counter()
+            _intent_classifier = IntentClassifier.load(path)
+            print(f"🧠 로컬 의도 분류기 로드: {path} ({(time.perf_counter() - started) * 1000:.1f}ms)")
+        except FileNotFoundError:
+            print(f"⚠️ 로컬 의도 분류기 모델 없음: {path} (python -m app.services.intent_classifier 로 학습)")
+    return _intent_classifier
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 의도 분류기 학습")
+    parser.add_argument("--data", default=DEFAULT_TRAINING_PATH, help="라벨 파일 (query<TAB>intent)")
+    parser.add_argument("--out", default=DEFAULT_MODEL_PATH, help="모델 저장 경로")
+    args = parser.parse_args()
+
+    training_samples = load_training_samples(args.data)
+    started = time.perf_counter()
+    model = IntentClassifier.train(training_samples)
+    model.save(args.out)
+    print(f"✅ 학습 완료: {len(training_samples)}건, 클래스 {model.labels}, "
+          f"temperature={model.temperature:.2f}, {(time.perf_counter() - started):.2f}s → {args.out}")
@@ -0,0 +1,407 @@
+"""
+LLM 게이트웨이
+
+프로세스 안의 모든 Gemini 호출이 거치는 단일 관문입니다.
+- 같은 (모델, temperature)의 ChatGoogleGenerativeAI 클라이언트를 하나만 만들어 연결을 재사용
+- 전체 동시 호출 수 제한 (LLM_MAX_CONCURRENCY)
+- 우선순위 클래스별 대기열: 검색 의도 분석 > 맞춤 설명 > 선행 생성
+- 클래스별 최대 대기 시간(또는 호출자가 준 마감 시각)을 넘기면 LLMQueueTimeout
+- 호출 자체도 마감 시각(없으면 LLM_REQUEST_TIMEOUT)까지만 기다리고 넘기면 LLMRequestTimeout
+  (기다림만 끊고, 실제 호출이 끝날 때까지 슬롯은 계속 잡아 동시 호출 수 제한을 지킴)
+- 클래스별 대기열 길이, 대기 시간, 타임아웃/에러 수 지표와 최근 실패율 (과부하 감지용)
+"""
+import contextvars
+import heapq
+import itertools
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from app.config import settings
+
+DEFAULT_MODEL = "gemini-2.0-flash-exp"
+
+# 우선순위 클래스: 이름 -> (우선순위 - 작을수록 먼저, 최대 대기 시간 초)
+PRIORITY_CLASSES: Dict[str, Tuple[int, float]] = {
+    "search": (0, 1.0),
+    "explanation": (1, 10.0),
+    "prefetch": (2, 30.0),
+}
+# 대기 시간 백분위 계산에 쓰는 최근 기록 수
+_WAIT_WINDOW = 1000
+
+
+# 현재 요청의 Gemini 호출 수 (track_llm_calls()로 시작, 게이트웨이의 invoke/stream 호출마다 1씩 더함)
+_calls: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar("llm_calls", default=None)
+
+
+def track_llm_calls() -> List[int]:
+    """현재 요청의 Gemini 호출 수 기록 시작 ([호출 수], 요청 태스크와 함께 사라짐)
+
+    스레드 풀/Gemini 실행기로 넘긴 작업도 같은 목록을 보므로 요청이 끝난 뒤 값을 읽으면 됩니다.
+    """
+    calls = [0]
+    _calls.set(calls)
+    return calls
+
+
+def _count_call():
+    calls = _calls.get()
+    if calls is not None:
+        calls[0] += 1
+
+
+class LLMQueueTimeout(TimeoutError):
+    """대기열에서 마감 시각까지 호출 슬롯을 받지 못함"""
+
+
+class LLMRequestTimeout(TimeoutError):
+    """슬롯을 받은 호출이 마감 시각까지 끝나지 않음"""
+
+
+class _Waiter:
+    __slots__ = ("event", "granted", "cancelled")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+        self.cancelled = False
+
+
+class _ClassStats:
+    """우선순위 클래스별 지표"""
+
+    def __init__(self):
+        self.queued = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.timeouts = 0
+        self.call_timeouts = 0
+        self.abandoned = 0                        # 호출자는 떠났지만 아직 실행 중인 호출 수
+        self.errors = 0
+        self.waits = deque(maxlen=_WAIT_WINDOW)   # 최근 대기 시간 (ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = sorted(self.waits)
+
+        def percentile(ratio: float) -> float:
+            return round(waits[min(len(waits) - 1, int(len(waits) * ratio))], 2) if waits else 0.0
+
+        return {
+            "queue_depth": self.queued,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "call_timeouts": self.call_timeouts,
+            "abandoned": self.abandoned,
+            "errors": self.errors,
+            "wait_ms": {
+                "avg": round(sum(waits) / len(waits), 2) if waits else 0.0,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(waits[-1], 2) if waits else 0.0,
+            }
+        }
+
+
+class LLMClient:
+    """게이트웨이를 거치는 클라이언트 (ChatGoogleGenerativeAI의 invoke/stream과 같은 사용법)"""
+
+    def __init__(self, gateway: "LLMGateway", model: str, temperature: float, priority: str):
+        self._gateway = gateway
+        self.model = model
+        self.temperature = temperature
+        self.priority = priority
+
+    def invoke(self, prompt: str, priority: Optional[str] = None, deadline: Optional[float] = None):
+        return self._gateway.invoke(self.model, self.temperature, prompt, priority or self.priority, deadline)
+
+    def stream(self, prompt: str, priority: Optional[str] = None, deadline: Optional[float] = None) -> Iterator[Any]:
+        return self._gateway.stream(self.model, self.temperature, prompt, priority or self.priority, deadline)
+
+
+class LLMGateway:
+    """전역 동시 호출 제한 + 우선순위 대기열을 가진 LLM 호출 관문"""
+
+    def __init__(self, max_concurrency: int = 4, api_key: Optional[str] = None):
+        self.max_concurrency = max_concurrency
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self._lock = threading.Lock()
+        self._available = max_concurrency
+        self._waiters = []                       # (우선순위, 순번, _Waiter) 힙
+        self._sequence = itertools.count()
+        self._models: Dict[Tuple[str, float], ChatGoogleGenerativeAI] = {}
+        self._stats = {name: _ClassStats() for name in PRIORITY_CLASSES}
+        # 최근 호출 결과 (시각, 성공 여부) - 대기열 타임아웃 포함
+        self._outcomes = deque(maxlen=_WAIT_WINDOW)
+        # 슬롯을 받은 호출을 실행하는 스레드 (처음 호출할 때 max_concurrency개를 띄워 재사용)
+        self._jobs = queue.SimpleQueue()
+        self._workers = []
+
+    def client(self, temperature: float, priority: str, model: str = DEFAULT_MODEL) -> LLMClient:
+        """서비스에서 쓸 클라이언트 (기본 우선순위 지정)"""
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"알 수 없는 우선순위 클래스입니다: {priority}")
+        return LLMClient(self, model, temperature, priority)
+
+    def _chat_model(self, model: str, temperature: float) -> ChatGoogleGenerativeAI:
+        """(모델, temperature)별로 하나만 만든 클라이언트 (연결 재사용)"""
+        key = (model, temperature)
+        chat_model = self._models.get(key)
+        if chat_model is None:
+            with self._lock:
+                chat_model = self._models.get(key)
+                if chat_model is None:
+                    chat_model = self._models[key] = ChatGoogleGenerativeAI(
+                        model=model,
+                        google_api_key=self.api_key,
+                        temperature=temperature,
+                    )
+        return chat_model
+
+    def _acquire(self, priority: str, deadline: Optional[float]):
+        """호출 슬롯 획득 (우선순위 순서, 마감 시각을 넘기면 LLMQueueTimeout)"""
+        rank, max_wait = PRIORITY_CLASSES[priority]
+        stats = self._stats[priority]
+        started = time.monotonic()
+        deadline = min(started + max_wait, deadline) if deadline is not None else started + max_wait
+
+        with self._lock:
+            stats.requests += 1
+            if self._available > 0 and not self._waiters:
+                self._available -= 1
+                stats.in_flight += 1
+                stats.waits.append(0.0)
+                return
+            waiter = _Waiter()
+            heapq.heappush(self._waiters, (rank, next(self._sequence), waiter))
+            stats.queued += 1
+
+        waiter.event.wait(max(0.0, deadline - time.monotonic()))
+
+        with self._lock:
+            stats.queued -= 1
+            stats.waits.append((time.monotonic() - started) * 1000)
+            if waiter.granted:
+                stats.in_flight += 1
+                return
+            # 대기열에서는 _release가 꺼낼 때 건너뜀
+            waiter.cancelled = True
+            stats.timeouts += 1
+            self._outcomes.append((time.monotonic(), False))
+        raise LLMQueueTimeout(f"LLM 대기열 시간 초과 ({priority}, {(time.monotonic() - started):.2f}s)")
+
+    def _release(self, priority: str):
+        """슬롯 반납 (우선순위가 가장 높은 대기자에게 넘김)"""
+        with self._lock:
+            self._stats[priority].in_flight -= 1
+            while self._waiters:
+                _, _, waiter = heapq.heappop(self._waiters)
+                if not waiter.cancelled:
+                    waiter.granted = True
+                    waiter.event.set()
+                    return
+            self._available += 1
+
+    def _submit(self, job):
+        """슬롯을 받은 작업을 호출 스레드에 넘김
+
+        작업은 슬롯을 쥔 채로만 들어오고 끝나야 슬롯을 반납하므로 스레드는 max_concurrency개면 충분하고,
+        호출마다 스레드를 새로 만들지 않습니다. 설치된 langchain-google-genai는 요청별 timeout이 없어
+        멈춘 호출이 프로세스 종료를 막지 않도록 데몬 스레드로 둡니다.
+        """
+        if not self._workers:
+            with self._lock:
+                if not self._workers:
+                    self._workers = [
+                        threading.Thread(target=self._work, name=f"llm-call-{index}", daemon=True)
+                        for index in range(self.max_concurrency)
+                    ]
+                    for worker in self._workers:
+                        worker.start()
+        self._jobs.put(job)
+
+    def _work(self):
+        while True:
+            self._jobs.get()()
+
+    def _timeout(self, deadline: Optional[float]) -> float:
+        """마감 시각과 LLM_REQUEST_TIMEOUT 중 먼저 오는 쪽까지 남은 시간"""
+        timeout = settings.LLM_REQUEST_TIMEOUT
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+        return max(0.0, timeout)
+
+    def _abandon(self, priority: str, call: Dict[str, Any]) -> bool:
+        """기다림을 끊은 호출 표시 (이미 끝났으면 False)"""
+        with self._lock:
+            if call["finished"]:
+                return False
+            call["abandoned"] = True
+            stats = self._stats[priority]
+            stats.call_timeouts += 1
+            stats.abandoned += 1
+            self._outcomes.append((time.monotonic(), False))
+            return True
+
+    def _finish(self, priority: str, call: Dict[str, Any]):
+        """호출 스레드에서 실제 호출이 끝났을 때 슬롯 반납"""
+        with self._lock:
+            call["finished"] = True
+            if call["abandoned"]:
+                self._stats[priority].abandoned -= 1
+        self._release(priority)
+
+    def invoke(self, model: str, temperature: float, prompt: str, priority: str,
+               deadline: Optional[float] = None):
+        """LLM 호출 (슬롯을 받은 뒤 실행, 마감 시각 또는 LLM_REQUEST_TIMEOUT까지만 기다림)
+
+        기다림을 끊어도 실제 호출이 끝날 때까지 슬롯은 반납하지 않으므로,
+        실행 중인 호출이 LLM_MAX_CONCURRENCY를 넘지 않고 그동안 새 호출은 대기열에서 기다립니다.
+        """
+        _count_call()
+        self._acquire(priority, deadline)
+        try:
+            chat_model = self._chat_model(model, temperature)
+        except Exception:
+            self._record_failure(priority)
+            self._release(priority)
+            raise
+
+        call = {"finished": False, "abandoned": False}
+        done = threading.Event()
+
+        def run():
+            try:
+                call["value"] = chat_model.invoke(prompt)
+            except BaseException as e:
+                call["error"] = e
+            finally:
+                self._finish(priority, call)
+                done.set()
+
+        self._submit(run)
+        timeout = self._timeout(deadline)
+        if not done.wait(timeout) and self._abandon(priority, call):
+            raise LLMRequestTimeout(f"LLM 호출 시간 초과 ({timeout:.2f}s)")
+        done.wait()
+        if "error" in call:
+            self._record_failure(priority)
+            raise call["error"]
+        self._outcomes.append((time.monotonic(), True))
+        return call["value"]
+
+    def stream(self, model: str, temperature: float, prompt: str, priority: str,
+               deadline: Optional[float] = None) -> Iterator[Any]:
+        """LLM 스트리밍 호출 (마감 시각 또는 LLM_REQUEST_TIMEOUT까지만 조각을 기다림)
+
+        스트림은 호출 스레드에서 읽고, 시간을 넘기거나 호출자가 읽기를 멈추면 다음 조각에서 스트림을 닫습니다.
+        슬롯은 스트림이 실제로 닫힐 때 반납합니다.
+        """
+        _count_call()
+        self._acquire(priority, deadline)
+        try:
+            chat_model = self._chat_model(model, temperature)
+        except Exception:
+            self._record_failure(priority)
+            self._release(priority)
+            raise
+
+        timeout = self._timeout(deadline)
+        until = time.monotonic() + timeout
+        call = {"finished": False, "abandoned": False}
+        chunks = queue.SimpleQueue()
+
+        def run():
+            iterator = None
+            last = ("end", None)
+            try:
+                iterator = iter(chat_model.stream(prompt))
+                for chunk in iterator:
+                    if call["abandoned"]:
+                        break
+                    chunks.put(("chunk", chunk))
+            except BaseException as e:
+                last = ("error", e)
+            finally:
+                try:
+                    close = getattr(iterator, "close", None)
+                    if close is not None:
+                        close()
+                finally:
+                    self._finish(priority, call)
+                    chunks.put(last)
+
+        self._submit(run)
+        completed = False
+        try:
+            while True:
+                try:
+                    kind, value = chunks.get(timeout=max(0.0, until - time.monotonic()))
+                except queue.Empty:
+                    if self._abandon(priority, call):
+                        raise LLMRequestTimeout(f"LLM 스트리밍 시간 초과 ({timeout:.2f}s)")
+                    continue
+                if kind == "chunk":
+                    yield value
+                elif kind == "end":
+                    completed = True
+                    break
+                else:
+                    completed = True
+                    self._record_failure(priority)
+                    raise value
+        finally:
+            if not completed and not call["abandoned"]:
+                # 호출자가 중간에 읽기를 멈춤 - 스트림은 다음 조각에서 닫힘
+                with self._lock:
+                    if not call["finished"]:
+                        call["abandoned"] = True
+                        self._stats[priority].abandoned += 1
+        self._outcomes.append((time.monotonic(), True))
+
+    def _record_failure(self, priority: str):
+        self._stats[priority].errors += 1
+        self._outcomes.append((time.monotonic(), False))
+
+    def queue_depth(self) -> int:
+        """전체 대기 중인 호출 수"""
+        return sum(stats.queued for stats in self._stats.values())
+
+    def failure_ratio(self, window: float = 30.0) -> Tuple[float, int]:
+        """최근 window초 동안의 (실패 비율, 호출 수) - 에러와 대기열 타임아웃을 실패로 셈"""
+        since = time.monotonic() - window
+        recent = [ok for at, ok in list(self._outcomes) if at >= since]
+        if not recent:
+            return 0.0, 0
+        return recent.count(False) / len(recent), len(recent)
+
+    def metrics(self) -> Dict[str, Any]:
+        """대기열 길이, 대기 시간, 타임아웃/에러 지표"""
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "available_slots": self._available,
+                "queue_depth": sum(stats.queued for stats in self._stats.values()),
+                "models": len(self._models),
+                "classes": {name: stats.snapshot() for name, stats in self._stats.items()}
+            }
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """LLM 게이트웨이 싱글톤"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway(settings.LLM_MAX_CONCURRENCY)
+    return _gateway
@@ -0,0 +1,168 @@
+"""
+메뉴 레지스트리
+
+이동 가능한 메뉴(화면)를 한 곳에서 선언하고, 시작 시 한 번 컴파일해
+- menu_type -> 라우팅 정보 테이블
+- 키워드 매처 (정규식 한 번으로 모든 메뉴 키워드 검사, priority가 높은 메뉴 우선,
+  키워드가 하나도 없을 때만 "계산"/"알림" 같은 짧은 별칭 검사)
+- Gemini 프롬프트의 메뉴 섹션
+을 만듭니다. 메뉴를 추가할 때는 MENUS에만 추가하면 됩니다.
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class MenuDefinition(NamedTuple):
+    """메뉴 하나의 정의"""
+    id: str                     # menu_type (Gemini 응답/프론트엔드 라우팅 키)
+    title: str                  # 프롬프트에 표시할 메뉴 이름
+    url: str                    # 이동할 화면 경로
+    message: str                # 응답 메시지
+    suggestions: List[str]      # 이동 후 추천 검색어
+    keywords: List[str]         # 키워드 매칭용 (폴백/규칙 기반)
+    examples: List[str]         # 프롬프트에 넣을 검색어 예시
+    priority: int               # 여러 메뉴 키워드가 겹칠 때 높은 쪽 우선
+    aliases: Tuple[str, ...] = ()   # 다른 메뉴 키워드가 없을 때만 쓰는 짧은 키워드 ("이자를 계산"이 환율계산기로 가지 않도록)
+
+
+# 선언 순서 = 프롬프트 표시 순서
+MENUS = [
+    MenuDefinition(
+        id="exchange", title="환전", url="/exchange",
+        message="환전 화면으로 이동합니다.",
+        suggestions=["환율 확인", "환전 신청", "환전 내역"],
+        keywords=["환전", "달러", "유로", "엔화", "외화"],
+        examples=["환전", "달러 환율"],
+        priority=30,
+    ),
+    MenuDefinition(
+        id="exchangeCalculator", title="환율계산기", url="/exchangeCalculator",
+        message="환율계산기 화면으로 이동합니다.",
+        suggestions=["실시간 환율", "통화 변환", "환전 신청"],
+        keywords=["환율계산", "환율 계산", "계산기", "환전 계산"],
+        examples=["환율계산", "환율 계산기"],
+        priority=90,
+        aliases=("계산",),
+    ),
+    MenuDefinition(
+        id="exchangeAlerts", title="환율알림설정", url="/exchangeAlerts",
+        message="환율알림설정 화면으로 이동합니다.",
+        suggestions=["알림 추가", "알림 관리", "환율 확인"],
+        keywords=["환율알림", "환율 알림", "알림설정", "환율 설정"],
+        examples=["환율알림", "환율 알림설정"],
+        priority=100,
+        aliases=("알림",),
+    ),
+    MenuDefinition(
+        id="cardApplication", title="카드신청", url="/cardApplication",
+        message="카드 신청 화면으로 이동합니다.",
+        suggestions=["카드 혜택 보기", "신청 자격 확인", "발급 현황"],
+        keywords=["카드신청", "카드 신청", "체크카드", "신용카드", "카드"],
+        examples=["카드신청", "체크카드"],
+        priority=60,
+    ),
+    MenuDefinition(
+        id="loan", title="대출관리", url="/loan",
+        message="대출관리 화면으로 이동합니다.",
+        suggestions=["대출 현황", "서류 조회", "이자 계산"],
+        keywords=["대출", "대출조회", "대출관리"],
+        examples=["대출", "대출조회"],
+        priority=20,
+    ),
+    MenuDefinition(
+        id="loanDocuments", title="대출서류조회", url="/loanDocuments",
+        message="대출서류조회 화면으로 이동합니다.",
+        suggestions=["계약서 다운로드", "증명서 발급", "서류 목록"],
+        keywords=["대출서류", "대출 서류", "계약서", "서류조회"],
+        examples=["대출서류", "계약서"],
+        priority=80,
+    ),
+    MenuDefinition(
+        id="loanCalculator", title="대출이자계산기", url="/loanCalculator",
+        message="대출이자계산기 화면으로 이동합니다.",
+        suggestions=["이자 계산", "상환 계획", "대출 상품"],
+        keywords=["대출계산", "대출 계산", "이자계산", "이자 계산"],
+        examples=["대출계산", "이자계산"],
+        priority=70,
+    ),
+    MenuDefinition(
+        id="history", title="입출금내역", url="/history",
+        message="입출금내역 화면으로 이동합니다.",
+        suggestions=["기간별 조회", "거래 필터", "내역 다운로드"],
+        keywords=["입출금내역", "거래내역", "내역조회"],
+        examples=["입출금내역", "거래내역"],
+        priority=50,
+    ),
+    MenuDefinition(
+        id="transfer", title="송금", url="/transfer",
+        message="송금 화면으로 이동합니다.",
+        suggestions=["받는분 입력", "금액 설정", "이체 한도"],
+        keywords=["계좌이체", "송금하기", "이체하기"],
+        examples=["계좌이체", "송금하기"],
+        priority=40,
+    ),
+]
+
+
+class MenuRegistry:
+    """메뉴 정의를 라우팅 테이블과 키워드 매처로 컴파일"""
+
+    def __init__(self, menus: List[MenuDefinition]):
+        self.menus = list(menus)
+        self.routes: Dict[str, MenuDefinition] = {}
+        self._keyword_menus: Dict[str, MenuDefinition] = {}
+        self._alias_menus: Dict[str, MenuDefinition] = {}
+
+        for menu in self.menus:
+            if menu.id in self.routes:
+                raise ValueError(f"중복된 메뉴 ID: {menu.id}")
+            self.routes[menu.id] = menu
+            for keyword in menu.keywords:
+                current = self._keyword_menus.get(keyword)
+                if current is None or menu.priority > current.priority:
+                    self._keyword_menus[keyword] = menu
+            for alias in menu.aliases:
+                current = self._alias_menus.get(alias)
+                if current is None or menu.priority > current.priority:
+                    self._alias_menus[alias] = menu
+
+        self._pattern = self._compile(self._keyword_menus)
+        self._alias_pattern = self._compile(self._alias_menus)
+
+        # 프롬프트 섹션은 한 번만 생성
+        self.prompt_pages = "\n".join(
+            f"     * {menu.title}: " + ", ".join(f'"{example}"' for example in menu.examples)
+            for menu in self.menus
+        )
+        self.prompt_menu_types = "\n".join(f'  * "{menu.id}" - {menu.title}' for menu in self.menus)
+
+    @staticmethod
+    def _compile(keyword_menus: Dict[str, MenuDefinition]) -> Optional["re.Pattern"]:
+        # 긴 키워드부터 시도하도록 정렬 (같은 위치에서 "카드신청"이 "카드"보다 먼저 매칭)
+        keywords = sorted(keyword_menus, key=len, reverse=True)
+        return re.compile("|".join(re.escape(keyword) for keyword in keywords)) if keywords else None
+
+    def get(self, menu_type: Optional[str]) -> Optional[MenuDefinition]:
+        """menu_type으로 메뉴 조회"""
+        return self.routes.get(menu_type) if menu_type else None
+
+    def match(self, text: str) -> Optional[MenuDefinition]:
+        """텍스트에 포함된 키워드 중 priority가 가장 높은 메뉴 (키워드가 없으면 별칭, 둘 다 없으면 None)"""
+        return (self._best_match(self._pattern, self._keyword_menus, text)
+                or self._best_match(self._alias_pattern, self._alias_menus, text))
+
+    @staticmethod
+    def _best_match(pattern: Optional["re.Pattern"], keyword_menus: Dict[str, MenuDefinition],
+                    text: str) -> Optional[MenuDefinition]:
+        if pattern is None:
+            return None
+        best = None
+        for found in pattern.finditer(text):
+            menu = keyword_menus[found.group()]
+            if best is None or menu.priority > best.priority:
+                best = menu
+        return best
+
+
+# 시작 시 한 번 컴파일
+menu_registry = MenuRegistry(MENUS)
@@ -1,36 +1,59 @@
 import os
 import json
 import re
-from typing import Dict, Any, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
+import time
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Any, List, Optional
 from langchain.prompts import PromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv  # 추가
+from app.services.amount_parser import parse_korean_amount, parse_amount_range, is_valid_transfer_amount
+from app.services.menu_registry import menu_registry
+from app.services.analytics_service import ANALYTICS_KEYWORDS, detect_flow, detect_group_by
+from app.services.intent_classifier import get_intent_classifier, normalize_query
+from app.services.period_parser import has_period_expression, parse_period
+from app.services.cache import TTLCache
+from app.services.gazetteer import CONTACT, MERCHANT, Gazetteer, GazetteerMatch
+from app.services.llm_gateway import get_llm_gateway
+from app.config import settings
+from app.tracing import span
 
 # .env 파일 로드 (추가)
 load_dotenv()
 
+# 폴백 시 로컬 분류 결과를 쓰는 최소 신뢰도 (미만이면 규칙 기반)
+FALLBACK_MIN_CONFIDENCE = 0.5
+# 사용자 거래내역 사전에 없을 때 찾는 가맹점
+DEFAULT_MERCHANTS = ["스타벅스", "맥도날드", "이마트", "GS25", "교촌치킨", "무신사"]
+# 이름 + 조사 패턴에 걸려도 받는 사람 이름으로 보지 않는 호칭/일반 명사/동사
+NOT_PERSON_WORDS = frozenset([
+    "엄마", "아빠", "어머니", "아버지", "부모님", "할머니", "할아버지", "언니", "오빠", "누나", "동생",
+    "남편", "아내", "와이프", "아들", "남동생", "여동생", "삼촌", "이모", "고모", "친구", "선배", "후배",
+    "사장님", "용돈", "월세", "관리비", "생활비", "회비", "축의금", "부의금", "선물", "계좌", "내역",
+    "송금", "이체", "보내", "보내기", "보내줘", "보내주세요", "입금", "결제", "조회", "최근", "지난", "이번",
+])
+
 class IntentAnalysis(BaseModel):
     """의도 분석 결과 모델"""
-    intent: str = Field(description="분석된 의도: transfer, search, menu, unknown 중 하나")
+    intent: str = Field(description="분석된 의도: transfer, search, menu, analytics, unknown 중 하나")
     confidence: float = Field(description="신뢰도 (0.0 ~ 1.0)")
     entities: Dict[str, Any] = Field(description="추출된 개체명 정보")
     reasoning: str = Field(description="분석 근거")
 
 
 class GeminiNLPService:
-    def __init__(self):
+    def __init__(self, gazetteer: Optional[Gazetteer] = None):
         # Gemini API 키 설정 (환경변수에서 가져오기)
         self.api_key = os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY 환경변수를 설정해주세요")
 
-        # Gemini 모델 초기화
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash-exp",  # 또는 "models/gemini-2.0-flash"
-            google_api_key=self.api_key,
+        # Gemini 모델 초기화 (LLM 게이트웨이 경유, 검색 의도 분석은 가장 높은 우선순위)
+        self.llm = get_llm_gateway().client(
             temperature=0.1,  # 일관성을 위해 낮은 온도 설정
+            priority="search",
         )
 
         # 출력 파서 설정
@@ -39,6 +62,24 @@ class GeminiNLPService:
         # 프롬프트 템플릿 설정
         self.prompt_template = self._create_prompt_template()
 
+        # 로컬 의도 분류기 (모델 파일이 없으면 None → 항상 Gemini)
+        self.local_classifier = get_intent_classifier()
+
+        # 사용자 거래내역의 연락처/가맹점 사전 (없으면 정규식/기본 가맹점 목록으로 추출)
+        self.gazetteer = gazetteer
+
+        # 정규화한 검색어 -> 의도 분석 결과 (Gemini/로컬 결과만, 폴백 결과는 저장하지 않음)
+        self.intent_cache = TTLCache(maxsize=4096, ttl=settings.NLP_CACHE_TTL)
+
+        # Gemini 호출은 별도 스레드에서 실행하고 hedge 시점까지만 기다림 (늦은 결과는 캐시에만 저장)
+        # 호출 자체는 게이트웨이가 검색 마감 시각에 끊으므로 스레드가 무한정 잡히지 않음
+        self._llm_executor = ThreadPoolExecutor(max_workers=settings.LLM_MAX_CONCURRENCY * 2,
+                                                thread_name_prefix="nlp-gemini")
+
+    def close(self):
+        """종료 시 대기 중인 Gemini 호출 취소 (실행 중인 호출은 마감 시각에 끝남)"""
+        self._llm_executor.shutdown(wait=False, cancel_futures=True)
+
     def _create_prompt_template(self) -> PromptTemplate:
         """의도 분석을 위한 프롬프트 템플릿 생성"""
 
@@ -60,17 +101,13 @@ class GeminiNLPService:
 
 3. **menu**: 특정 메뉴 페이지로 이동
    - 구현된 페이지들:
-     * 환전: "환전", "달러 환율"
-     * 환율계산기: "환율계산", "환율 계산기"  
-     * 환율알림: "환율알림", "환율 알림설정"
-     * 카드신청: "카드신청", "체크카드"
-     * 대출관리: "대출", "대출조회"
-     * 대출서류: "대출서류", "계약서"
-     * 대출계산기: "대출계산", "이자계산"
-     * 입출금내역: "입출금내역", "거래내역"
-     * 송금: "계좌이체", "송금하기"
-
-4. **unknown**: 위에 해당하지 않는 경우
+{menu_pages}
+
+4. **analytics**: 거래내역 집계/분석
+   - 예시: "월별 요약", "카테고리별 분석", "지출 패턴 보기", "어디서 제일 많이 썼어"
+   - 특징: 요약, 분석, 패턴, 통계, "~별" 표현 (개별 거래 목록이 아닌 합계/비교)
+
+5. **unknown**: 위에 해당하지 않는 경우
 
 ## 의도별 개체명 추출 (entities):
 
@@ -87,6 +124,10 @@ class GeminiNLPService:
   * description: 기간 설명 (예: "2025년 8월", "최근 1개월")
 - transaction_type: 거래 타입 (입금, 출금, 전체) - 선택
 - person: 송금 상대방 이름 (송금내역 조회시) - 선택
+- min_amount: 최소 금액 (정수, "5만원 이상" → 50000) - 선택
+- max_amount: 최대 금액 (정수, "3만원 이하" → 30000) - 선택
+- category: 거래 카테고리 (카페, 음식, 쇼핑, 편의점, 마트 등) - 선택
+- bank: 상대 은행명 (신한은행, 카카오뱅크 등) - 선택
 
 기간 추출 규칙:
 - "8월" → start_date: "2025-08-01", end_date: "2025-08-31", description: "2025년 8월"
@@ -99,15 +140,14 @@ class GeminiNLPService:
 
 ### menu (메뉴이동) 시:
 - menu_type: 메뉴 종류 - 필수
-  * "exchange" - 환전
-  * "exchangeCalculator" - 환율계산기
-  * "exchangeAlerts" - 환율알림설정
-  * "cardApplication" - 카드신청
-  * "loan" - 대출관리
-  * "loanDocuments" - 대출서류조회
-  * "loanCalculator" - 대출이자계산기
-  * "history" - 입출금내역
-  * "transfer" - 송금
+{menu_types}
+
+### analytics (분석) 시:
+- group_by: 집계 기준 - 필수
+  * month(월별), weekday(요일별), hour(시간대별), merchant(가맹점별), recipient(받는 사람별), category(카테고리별)
+  * pattern: 지출 패턴 (요일별 + 시간대별)
+- date_range: 기간 정보 객체 (search와 같은 형식) - 선택
+- flow: expense(지출), income(수입), all(전체) - 선택 (기본 expense)
 
 ### unknown 시:
 - 개체명 추출하지 않음
@@ -129,40 +169,145 @@ class GeminiNLPService:
         return PromptTemplate(
             template=template,
             input_variables=["query"],
-            partial_variables={"format_instructions": format_instructions}
+            partial_variables={
+                "format_instructions": format_instructions,
+                # 메뉴 섹션은 메뉴 레지스트리에서 생성
+                "menu_pages": menu_registry.prompt_pages,
+                "menu_types": menu_registry.prompt_menu_types
+            }
         )
 
-    def parse_query(self, text: str) -> Dict[str, Any]:
-        """메인 파싱 함수"""
-        try:
-            # 프롬프트 생성
-            prompt = self.prompt_template.format(query=text)
-
-            # Gemini 호출
-            response = self.llm.invoke(prompt)
-
-            # 응답 파싱
-            try:
-                parsed_result = self.output_parser.parse(response.content)
-
-                return {
-                    "intent": parsed_result.intent,
-                    "entities": parsed_result.entities,
-                    "confidence": parsed_result.confidence,
-                    "reasoning": parsed_result.reasoning,
-                    "original_text": text,
-                    "used_model": "gemini-pro"
-                }
-            except Exception as parse_error:
-                print(f"파싱 에러, 폴백 처리: {parse_error}")
+    def parse_query(self, text: str, allow_llm: bool = True, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """메인 파싱 함수 (의도 캐시 확인 후 분석)
+
+        allow_llm=False면 Gemini 없이 로컬 분석만 합니다.
+        deadline은 이 검색의 마감 시각(time.monotonic 기준)이며, 없으면 지금부터 SEARCH_TIMEOUT초입니다.
+        """
+        cache_key = normalize_query(text)
+        with span("nlp.cache"):
+            cached = self.intent_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached, original_text=text)
+
+        if deadline is None:
+            deadline = time.monotonic() + settings.SEARCH_TIMEOUT
+        result = self._parse_query(text, allow_llm, deadline)
+        if result.get("used_model") != "fallback":
+            self.intent_cache.set(cache_key, result)
+        return result
+
+    def _parse_query(self, text: str, allow_llm: bool = True, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """로컬 분류기 → Gemini 순서로 의도 분석 (Gemini는 규칙 기반 결과와 hedge)"""
+        # 로컬 분류기 신뢰도가 충분하면 Gemini를 호출하지 않음
+        # (단, 규칙으로 date_range를 만들 수 없는 기간 표현이 있는 조회/분석은 Gemini로 넘김)
+        with span("nlp.local"):
+            local_result = self._classify_locally(text)
+        if local_result and local_result["confidence"] >= settings.NLP_CONFIDENCE_THRESHOLD \
+                and not self._has_unparsed_period(local_result, text):
+            return local_result
+
+        # 요청 제한/과부하 시에는 Gemini를 기다리지 않고 바로 폴백
+        if not allow_llm:
+            with span("nlp.fallback"):
                 return self._fallback_parse(text)
 
+        if deadline is None:
+            deadline = time.monotonic() + settings.SEARCH_TIMEOUT
+
+        # Gemini 호출을 시작해 두고, 그동안 규칙 기반 결과를 미리 만들어 둠 (요청 추적 컨텍스트도 넘김)
+        future = self._llm_executor.submit(contextvars.copy_context().run, self._parse_with_llm, text, deadline)
+        with span("nlp.fallback"):
+            fallback_result = self._fallback_parse(text)
+
+        # hedge 시점(마감 시각을 넘지 않음)까지만 Gemini를 기다림
+        hedge_at = min(time.monotonic() + settings.SEARCH_HEDGE_SECONDS, deadline)
+        try:
+            with span("nlp.llm_wait"):
+                return future.result(timeout=max(0.0, hedge_at - time.monotonic()))
+        except FutureTimeout:
+            print(f"⏱️ Gemini 응답 지연 ({settings.SEARCH_HEDGE_SECONDS}s), 규칙 기반 결과 반환: {text}")
+            future.add_done_callback(lambda done: self._store_late_result(text, done))
+            fallback_result["hedged"] = True
+            return fallback_result
         except Exception as e:
             print(f"Gemini API 에러, 폴백 처리: {e}")
-            return self._fallback_parse(text)
+            return fallback_result
+
+    def _parse_with_llm(self, text: str, deadline: float) -> Dict[str, Any]:
+        """Gemini 의도 분석 (LLM 게이트웨이 대기열도 검색 마감 시각까지만 기다림)"""
+        # 프롬프트 생성
+        prompt = self.prompt_template.format(query=text)
+
+        # Gemini 호출
+        with span("llm"):
+            response = self.llm.invoke(prompt, deadline=deadline)
+
+        # 응답 파싱
+        with span("llm.parse"):
+            parsed_result = self.output_parser.parse(response.content)
+
+        return {
+            "intent": parsed_result.intent,
+            "entities": parsed_result.entities,
+            "confidence": parsed_result.confidence,
+            "reasoning": parsed_result.reasoning,
+            "original_text": text,
+            "used_model": "gemini-pro"
+        }
+
+    def _store_late_result(self, text: str, future: Future):
+        """hedge 이후 도착한 Gemini 결과를 의도 캐시에 저장 (다음 같은 검색부터 사용)"""
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Gemini 지연 응답 실패: {e}")
+            return
+        self.intent_cache.set(normalize_query(text), result)
+        print(f"📥 지연된 Gemini 결과를 의도 캐시에 저장: {text}")
+
+    def _classify_locally(self, text: str) -> Optional[Dict[str, Any]]:
+        """로컬 의도 분류기 + 규칙 기반 개체명 추출 (분류기가 없으면 None)"""
+        if self.local_classifier is None:
+            return None
+
+        intent, confidence = self.local_classifier.predict(text)
+        # "홍길동 5만원 이상 송금"처럼 금액 범위(이상/이하/~)가 있으면 송금이 아니라 조회
+        if intent == "transfer" and parse_amount_range(text) is not None:
+            intent = "search"
+        return {
+            "intent": intent,
+            "entities": self._extract_entities(intent, text),
+            "confidence": round(confidence, 3),
+            "reasoning": "로컬 분류기 (문자 n-gram TF-IDF)",
+            "original_text": text,
+            "used_model": "local"
+        }
+
+    def _has_unparsed_period(self, result: Dict[str, Any], text: str) -> bool:
+        """기간 표현이 있는데 규칙으로 date_range를 만들지 못한 조회/분석인지 ("상반기", "15일")"""
+        if result["intent"] not in ("search", "analytics") or result["entities"].get("date_range"):
+            return False
+        return has_period_expression(text)
+
+    def _extract_entities(self, intent: str, text: str) -> Dict[str, Any]:
+        """의도별 규칙 기반 개체명 추출"""
+        if intent == "transfer":
+            return self._extract_transfer_entities(text)
+        if intent == "search":
+            return self._extract_search_entities(text)
+        if intent == "menu":
+            return self._extract_menu_entities(text)
+        if intent == "analytics":
+            return self._extract_analytics_entities(text)
+        return {}
 
     def _fallback_parse(self, text: str) -> Dict[str, Any]:
-        """Gemini 실패 시 폴백 처리 (기존 정규식 로직)"""
+        """Gemini 실패 시 폴백 처리 (로컬 분류기, 없으면 정규식 로직)"""
+
+        local_result = self._classify_locally(text)
+        if local_result and local_result["confidence"] >= FALLBACK_MIN_CONFIDENCE:
+            local_result["used_model"] = "fallback"
+            return local_result
 
         # 간단한 규칙 기반 분류
         intent = "unknown"
@@ -175,6 +320,12 @@ class GeminiNLPService:
             confidence = 0.7
             entities = self._extract_transfer_entities(text)
 
+        # 분석 패턴 체크 ("입금 통계"처럼 조회 키워드가 함께 있어도 분석)
+        elif self._check_analytics_pattern(text):
+            intent = "analytics"
+            confidence = 0.6
+            entities = self._extract_analytics_entities(text)
+
         # 조회 패턴 체크
         elif self._check_search_pattern(text):
             intent = "search"
@@ -197,58 +348,96 @@ class GeminiNLPService:
         }
 
     def _check_transfer_pattern(self, text: str) -> bool:
-        """송금 패턴 체크"""
-        transfer_keywords = ["보내", "송금", "이체", "만원", "원", "줘"]
-        name_pattern = r'[가-힣]{2,4}'
+        """송금 패턴 체크 (송금 키워드, 또는 이름 + 금액)"""
+        transfer_keywords = ["보내", "송금", "이체"]
+        # "송금 내역", "이체 조회"는 조회
+        search_keywords = ["내역", "조회"]
+
+        if any(keyword in text for keyword in search_keywords):
+            return False
+        if any(keyword in text for keyword in transfer_keywords):
+            return True
 
-        return (any(keyword in text for keyword in transfer_keywords) or
-                bool(re.search(name_pattern, text)))
+        # "박민수 5천원", "김철수에게 3만원"처럼 이름 바로 뒤에 금액
+        return bool(re.match(r'\s*[가-힣]{2,4}(?:에게|한테|님께|님)?\s*[0-9일이삼사오육칠팔구십백천만]', text)) and \
+            parse_korean_amount(text) is not None and parse_amount_range(text) is None
 
     def _check_search_pattern(self, text: str) -> bool:
         """조회 패턴 체크"""
         search_keywords = ["내역", "거래", "조회", "결제", "출금", "입금"]
         return any(keyword in text for keyword in search_keywords)
 
+    def _check_analytics_pattern(self, text: str) -> bool:
+        """분석 패턴 체크"""
+        return any(keyword in text for keyword in ANALYTICS_KEYWORDS)
+
     def _check_menu_pattern(self, text: str) -> bool:
-        """메뉴 패턴 체크"""
-        menu_keywords = ["환전", "카드", "대출", "계산", "알림"]
-        return any(keyword in text for keyword in menu_keywords)
+        """메뉴 패턴 체크 (메뉴 레지스트리 키워드)"""
+        return menu_registry.match(text) is not None
+
+    def _match_gazetteer(self, text: str) -> List[GazetteerMatch]:
+        """연락처/가맹점 사전 매칭 (사전이 없으면 빈 목록)"""
+        if self.gazetteer is None:
+            return []
+        with span("nlp.gazetteer"):
+            return self.gazetteer.match(text)
+
+    def _extract_person(self, text: str, matches: List[GazetteerMatch]) -> Optional[str]:
+        """받는 사람 이름 (송금한 적 있는 연락처 우선, 없으면 이름 + 조사 패턴)
+
+        패턴에 걸린 단어가 호칭/일반 명사("엄마 용돈 보내기")나 금액("5만원")이면 다음 단어를 봅니다.
+        """
+        for match in matches:
+            if match.kind == CONTACT:
+                return match.value
+
+        for name_match in re.finditer(r'(?<![가-힣])([가-힣]{2,4}?)(?:에게|한테|님께|님|\s|$)', text):
+            name = name_match.group(1)
+            if name in NOT_PERSON_WORDS or parse_korean_amount(name) is not None:
+                continue
+            # "스타벅스 송금"처럼 가맹점 이름은 사람으로 보지 않음
+            start, end = name_match.span(1)
+            if name in DEFAULT_MERCHANTS or any(
+                    match.kind == MERCHANT and match.start < end and start < match.end for match in matches):
+                return None
+            return name
+        return None
 
     def _extract_transfer_entities(self, text: str) -> Dict[str, Any]:
         """송금 개체명 추출"""
         entities = {}
 
         # 이름 추출 (필수)
-        name_match = re.search(r'([가-힣]{2,4})(?:에게|한테|님)?', text)
-        if name_match:
-            entities["person"] = name_match.group(1)
-
-        # 금액 추출 (선택)
-        amount_patterns = [r'(\d+)만원?', r'(\d{1,3}(?:,\d{3})*)원?']
-        for pattern in amount_patterns:
-            match = re.search(pattern, text)
-            if match:
-                raw_amount = match.group(1).replace(',', '')
-                if '만' in pattern:
-                    entities["amount"] = int(raw_amount) * 10000
-                else:
-                    entities["amount"] = int(raw_amount)
-                break
+        person = self._extract_person(text, self._match_gazetteer(text))
+        if person:
+            entities["person"] = person
+
+        # 금액 추출 (선택) - "5천원", "십만 오천원", "10만5천원" 등 혼합 표현 지원
+        amount = parse_korean_amount(text)
+        if amount is not None:
+            if is_valid_transfer_amount(amount):
+                entities["amount"] = amount
+            else:
+                print(f"⚠️ 송금 한도를 벗어난 금액 무시: {amount:,}원")
 
         return entities
 
     def _extract_search_entities(self, text: str) -> Dict[str, Any]:
         """조회 개체명 추출"""
         entities = {}
-
-        # 가맹점 추출
-        merchants = ["스타벅스", "맥도날드", "이마트", "GS25", "교촌치킨", "무신사"]
-        for merchant in merchants:
-            if merchant in text:
-                entities["merchant"] = merchant
-                break
-
-        # 기간 추출
+        matches = self._match_gazetteer(text)
+
+        # 가맹점 추출 (사용자 거래내역의 가맹점 우선, 없으면 기본 가맹점 목록)
+        merchant = next((match.value for match in matches if match.kind == MERCHANT), None)
+        if merchant is None:
+            merchant = next((name for name in DEFAULT_MERCHANTS if name in text), None)
+        if merchant:
+            entities["merchant"] = merchant
+
+        # 기간 추출 ("8월", "8월 1일~15일", "최근 3개월" → Gemini와 같은 date_range 형식)
+        date_range = parse_period(text)
+        if date_range:
+            entities["date_range"] = date_range
         date_patterns = ["최근", "지난", "이번", "1월", "2월", "3월", "개월", "주일", "어제", "오늘"]
         for pattern in date_patterns:
             if pattern in text:
@@ -263,35 +452,41 @@ class GeminiNLPService:
         else:
             entities["transaction_type"] = "all"
 
+        # 금액 범위 추출 ("5만원 이상", "3만원~5만원")
+        amount_range = parse_amount_range(text)
+        if amount_range:
+            min_amount, max_amount = amount_range
+            if min_amount is not None:
+                entities["min_amount"] = min_amount
+            if max_amount is not None:
+                entities["max_amount"] = max_amount
+
         # 송금내역 조회시 상대방 이름
         if "송금" in text or "이체" in text:
-            name_match = re.search(r'([가-힣]{2,4})(?:에게|한테|님)?', text)
-            if name_match:
-                entities["person"] = name_match.group(1)
+            person = self._extract_person(text, matches)
+            if person:
+                entities["person"] = person
 
         return entities
 
+    def _extract_analytics_entities(self, text: str) -> Dict[str, Any]:
+        """분석 개체명 추출"""
+        entities = {
+            "group_by": detect_group_by(text),
+            "flow": detect_flow(text)
+        }
+        date_range = parse_period(text)
+        if date_range:
+            entities["date_range"] = date_range
+        return entities
+
     def _extract_menu_entities(self, text: str) -> Dict[str, Any]:
         """메뉴 개체명 추출"""
         entities = {}
 
-        # 메뉴 타입 매핑 (우선순위 순서)
-        menu_mapping = [
-            (["환율계산", "환율 계산", "계산기"], "exchangeCalculator"),
-            (["환율알림", "환율 알림", "알림설정"], "exchangeAlerts"),
-            (["대출서류", "대출 서류", "계약서", "서류조회"], "loanDocuments"),
-            (["대출계산", "대출 계산", "이자계산", "이자 계산"], "loanCalculator"),
-            (["카드신청", "카드 신청", "체크카드", "신용카드"], "cardApplication"),
-            (["입출금내역", "거래내역", "내역조회"], "history"),
-            (["계좌이체", "송금하기", "이체하기"], "transfer"),
-            (["환전", "달러", "유로", "엔화"], "exchange"),
-            (["대출", "대출조회", "대출관리"], "loan"),
-        ]
-
-        # 우선순위에 따라 매칭
-        for keywords, menu_type in menu_mapping:
-            if any(keyword in text for keyword in keywords):
-                entities["menu_type"] = menu_type
-                break
+        # 메뉴 레지스트리 키워드 매칭 (priority 순)
+        menu = menu_registry.match(text)
+        if menu:
+            entities["menu_type"] = menu.id
 
-        return entities
\ No newline at end of file
+        return entities
@@ -0,0 +1,188 @@
+"""
+생성 중인 JSON 객체 읽기
+
+LLM이 토큰 단위로 내보내는 JSON 객체({"필드": 값, ...})를 조각이 올 때마다 읽어
+최상위 문자열 필드는 글자가 도착하는 대로(delta), 배열/객체 필드는 원소가 완성될 때마다(item),
+필드 값이 끝나면(done) 이벤트를 만듭니다. 앞뒤의 ```json 코드 블록 표시 같은 텍스트는 건너뜁니다.
+"""
+import json
+from typing import Any, Dict, List, Tuple
+
+# 문자열 이스케이프 (\\uXXXX 제외)
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+# (종류, 필드명, 값) - 종류: delta(문자열 조각), item(배열 원소 또는 {키: 값}), done(완성된 필드 값)
+Event = Tuple[str, str, Any]
+
+
+class PartialJSONReader:
+    """조각 단위로 들어오는 JSON 객체를 읽어 필드 이벤트 생성"""
+
+    def __init__(self):
+        self.value: Dict[str, Any] = {}   # 지금까지 완성된 필드
+        self._state = "start"
+        self._field = None
+        self._buffer: List[str] = []      # 키, 스칼라 값, 컨테이너 원소의 원문
+        self._escape = False
+        self._unicode = None              # \uXXXX 디코딩 중인 16진수
+        # 컨테이너 값 (배열/객체)
+        self._container = None
+        self._collected: Any = None
+        self._nesting = 0
+        self._in_string = False
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    def feed(self, chunk: str) -> List[Event]:
+        """조각을 읽고 새로 생긴 이벤트 반환 (문자열 조각은 필드별로 하나로 합침)"""
+        events: List[Event] = []
+        delta: List[str] = []
+
+        for char in chunk:
+            state = self._state
+            if state == "string":
+                text = self._read_string_char(char)
+                if text:
+                    delta.append(text)
+                elif self._state != "string":
+                    if delta:
+                        events.append(("delta", self._field, "".join(delta)))
+                        delta = []
+                    events.append(("done", self._field, self.value[self._field]))
+            elif state == "container":
+                event = self._read_container_char(char)
+                if event:
+                    events.append(event)
+                    if self._state != "container":
+                        events.append(("done", self._field, self.value[self._field]))
+            elif state == "start":
+                if char == "{":
+                    self._state = "key_wait"
+            elif state == "key_wait":
+                if char == '"':
+                    self._state = "key"
+                    self._buffer = []
+                elif char == "}":
+                    self._state = "done"
+            elif state == "key":
+                self._read_key_char(char)
+            elif state == "colon":
+                if char == ":":
+                    self._state = "value_wait"
+            elif state == "value_wait":
+                self._start_value(char)
+            elif state == "scalar":
+                if char in ",}":
+                    self.value[self._field] = json.loads("".join(self._buffer))
+                    events.append(("done", self._field, self.value[self._field]))
+                    self._state = "done" if char == "}" else "key_wait"
+                else:
+                    self._buffer.append(char)
+            elif state == "after_value":
+                if char == ",":
+                    self._state = "key_wait"
+                elif char == "}":
+                    self._state = "done"
+
+        if delta:
+            events.append(("delta", self._field, "".join(delta)))
+        return events
+
+    def _read_key_char(self, char: str):
+        if self._escape:
+            self._escape = False
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._field = json.loads('"' + "".join(self._buffer) + '"')
+            self._state = "colon"
+            return
+        self._buffer.append(char)
+
+    def _start_value(self, char: str):
+        if char.isspace():
+            return
+        if char == '"':
+            self._state = "string"
+            self._buffer = []
+        elif char in "[{":
+            self._state = "container"
+            self._container = char
+            self._collected = [] if char == "[" else {}
+            self._buffer = []
+            self._nesting = 0
+            self._in_string = False
+        else:
+            self._state = "scalar"
+            self._buffer = [char]
+
+    def _read_string_char(self, char: str) -> str:
+        """최상위 문자열 값의 한 글자를 디코딩해 반환 (이스케이프 중이거나 끝이면 빈 문자열)"""
+        if self._unicode is not None:
+            self._unicode += char
+            if len(self._unicode) < 4:
+                return ""
+            decoded = chr(int(self._unicode, 16))
+            self._unicode = None
+            self._buffer.append(decoded)
+            return decoded
+        if self._escape:
+            self._escape = False
+            if char == "u":
+                self._unicode = ""
+                return ""
+            decoded = _ESCAPES.get(char, char)
+            self._buffer.append(decoded)
+            return decoded
+        if char == "\\":
+            self._escape = True
+            return ""
+        if char == '"':
+            self.value[self._field] = "".join(self._buffer)
+            self._state = "after_value"
+            return ""
+        self._buffer.append(char)
+        return char
+
+    def _read_container_char(self, char: str):
+        """배열/객체 값의 한 글자를 읽고, 원소가 완성되면 item 이벤트 반환"""
+        if self._in_string:
+            self._buffer.append(char)
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+            return None
+
+        if char == '"':
+            self._in_string = True
+        elif char in "[{":
+            self._nesting += 1
+        elif char in "]}":
+            if self._nesting == 0:
+                event = self._flush_element()
+                self.value[self._field] = self._collected
+                self._state = "after_value"
+                return event
+            self._nesting -= 1
+        elif char == "," and self._nesting == 0:
+            return self._flush_element()
+        self._buffer.append(char)
+        return None
+
+    def _flush_element(self):
+        raw = "".join(self._buffer).strip()
+        self._buffer = []
+        if not raw:
+            return None
+        if self._container == "[":
+            item = json.loads(raw)
+            self._collected.append(item)
+            return "item", self._field, item
+        item = json.loads("{" + raw + "}")
+        self._collected.update(item)
+        return "item", self._field, item
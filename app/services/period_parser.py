@@ -0,0 +1,195 @@
+"""
+한국어 기간 표현 파서
+
+"8월", "2025년 8월", "작년 12월", "8월 15일", "8월 1일부터 15일까지", "2025-08-01~2025-08-15",
+"최근 3개월", "지난 두달", "최근 일주일", "오늘", "어제", "이번주", "지난주", "이번달", "지난달", "올해", "작년"
+같은 기간 표현을 Gemini의 date_range와 같은 형식({start_date, end_date, period_type, description})으로 변환합니다.
+- 연도가 없는 "N월"은 오늘 기준으로 이미 시작된 가장 최근의 N월 (10월에 "11월" → 작년 11월)
+- 규칙으로 바꿀 수 없는 기간 표현("상반기", "주말", "15일")은 has_period_expression으로만 잡히므로,
+  호출하는 쪽에서 Gemini로 넘길지 판단할 수 있음
+"""
+import calendar
+import re
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+
+# 기간을 뜻하는 표현 (규칙으로 바꿀 수 없는 것 포함)
+_PERIOD_KEYWORDS = (
+    "오늘", "어제", "그제", "그저께", "이번주", "이번 주", "지난주", "지난 주", "저번주", "저번 주",
+    "이번달", "이번 달", "지난달", "지난 달", "저번달", "저번 달", "올해", "금년", "작년", "지난해", "재작년",
+    "상반기", "하반기", "분기", "주말", "연말", "연초", "월초", "월말",
+)
+_PERIOD_PATTERN = re.compile(
+    r"(?<!\d)\d{1,2}\s*(?:월|일)(?!\s*(?:이상|이하|미만|초과))|\d{4}\s*년|\d{4}[-./]\d{1,2}"
+    r"|(?:최근|지난)\s*\S*\s*(?:일|주|주일|개월|달|년)(?![가-힣])"
+)
+
+_NUMBER_WORDS = {
+    "한": 1, "두": 2, "세": 3, "석": 3, "네": 4, "넉": 4, "다섯": 5, "여섯": 6,
+    "일곱": 7, "여덟": 8, "아홉": 9, "열": 10, "일": 1, "이": 2, "삼": 3,
+}
+_RECENT = re.compile(
+    r"(최근|지난)\s*(\d{1,3}|다섯|여섯|일곱|여덟|아홉|한|두|세|석|네|넉|열|일|이|삼)\s*(주일|개월|일|주|달|년)(?![가-힣])"
+)
+
+# 날짜: 2025-08-01 / 2025.8.1, [2025년|작년|올해] 8월 [15일]
+_ISO_DATE = r"(?P<iy>\d{4})[-./](?P<im>\d{1,2})(?:[-./](?P<id>\d{1,2}))?"
+_KOREAN_DATE = (r"(?:(?P<ky>\d{4})\s*년\s*|(?P<yw>재작년|작년|지난해|올해|금년)\s*)?"
+                r"(?<!\d)(?P<km>\d{1,2})\s*월(?:\s*(?P<kd>\d{1,2})\s*일)?")
+_DATE = re.compile(rf"{_ISO_DATE}|{_KOREAN_DATE}")
+# 범위 끝: 다른 날짜이거나 같은 달의 "N일"
+_RANGE_SEPARATOR = re.compile(r"\s*(?:~|-|부터|에서)\s*")
+_DAY_ONLY = re.compile(r"(?<!\d)(?P<day>\d{1,2})\s*일")
+
+_YEAR_WORDS = {"재작년": -2, "작년": -1, "지난해": -1, "올해": 0, "금년": 0}
+
+
+def has_period_expression(text: str) -> bool:
+    """검색어에 기간 표현이 있는지 (parse_period로 바꿀 수 없는 표현 포함)"""
+    return any(keyword in text for keyword in _PERIOD_KEYWORDS) or bool(_PERIOD_PATTERN.search(text))
+
+
+def parse_period(text: str, today: Optional[date] = None) -> Optional[Dict[str, str]]:
+    """검색어의 기간 표현을 기간 정보로 변환 (규칙으로 바꿀 수 있는 기간 표현이 없으면 None)"""
+    today = today or date.today()
+    return _parse_dates(text, today) or _parse_recent(text, today) or _parse_relative(text, today)
+
+
+def _period(start: date, end: date, period_type: str, description: str) -> Dict[str, str]:
+    return {
+        "start_date": start.strftime("%Y-%m-%d"),
+        "end_date": end.strftime("%Y-%m-%d"),
+        "period_type": period_type,
+        "description": description,
+    }
+
+
+def _month_end(year: int, month: int) -> date:
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _shift_months(day: date, months: int) -> date:
+    """months개월 전/후의 같은 날 (없는 날은 그 달 말일)"""
+    index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(index, 12)
+    return date(year, month + 1, min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def _describe(day: date, with_day: bool) -> str:
+    return f"{day.year}년 {day.month}월" + (f" {day.day}일" if with_day else "")
+
+
+def _parse_dates(text: str, today: date) -> Optional[Dict[str, str]]:
+    """날짜 표현 ("8월", "8월 15일", "8월 1일~15일", "2025-08-01 ~ 2025-08-15")"""
+    match = _DATE.search(text)
+    if match is None:
+        return None
+    start = _resolve(match, today)
+    if start is None:
+        return None
+    start_day, start_has_day = start
+
+    # 범위: 날짜 ~ 날짜, 날짜부터 N일까지
+    separator = _RANGE_SEPARATOR.match(text, match.end())
+    if separator:
+        end_match = _DATE.match(text, separator.end())
+        if end_match is not None:
+            end = _resolve(end_match, today, start_day.year)
+            if end is not None:
+                end_day, end_has_day = end
+                if not end_has_day:
+                    end_day = _month_end(end_day.year, end_day.month)
+                if end_day < start_day and not (end_match.group("iy") or end_match.group("ky") or end_match.group("yw")):
+                    # "12월~1월"처럼 해를 넘기는 범위
+                    end_day = _shift_months(end_day, 12)
+                if end_day >= start_day:
+                    return _period(start_day, end_day, "custom",
+                                   f"{_describe(start_day, start_has_day)} ~ {_describe(end_day, end_has_day)}")
+        day_match = _DAY_ONLY.match(text, separator.end())
+        if day_match is not None and start_has_day:
+            day = int(day_match.group("day"))
+            if start_day.day <= day <= calendar.monthrange(start_day.year, start_day.month)[1]:
+                end_day = start_day.replace(day=day)
+                return _period(start_day, end_day, "custom",
+                               f"{_describe(start_day, True)} ~ {end_day.day}일")
+
+    if start_has_day:
+        return _period(start_day, start_day, "custom", _describe(start_day, True))
+    return _period(start_day, _month_end(start_day.year, start_day.month), "month", _describe(start_day, False))
+
+
+def _resolve(match: "re.Match", today: date, default_year: Optional[int] = None) -> Optional[Tuple[date, bool]]:
+    """날짜 매칭 -> (날짜, 일까지 지정했는지), 없는 날짜면 None"""
+    if match.group("iy"):
+        year, month, day = int(match.group("iy")), int(match.group("im")), match.group("id")
+    else:
+        month, day = int(match.group("km")), match.group("kd")
+        if match.group("ky"):
+            year = int(match.group("ky"))
+        elif match.group("yw"):
+            year = today.year + _YEAR_WORDS[match.group("yw")]
+        elif default_year is not None:
+            year = default_year
+        else:
+            # 연도가 없으면 이미 시작된 가장 최근의 N월
+            year = today.year if month <= today.month else today.year - 1
+    if not 1 <= month <= 12:
+        return None
+    if day is None:
+        return date(year, month, 1), False
+    day = int(day)
+    if not 1 <= day <= calendar.monthrange(year, month)[1]:
+        return None
+    return date(year, month, day), True
+
+
+def _parse_recent(text: str, today: date) -> Optional[Dict[str, str]]:
+    """최근/지난 N일/주/개월/년 (오늘까지)"""
+    match = _RECENT.search(text)
+    if match is None:
+        return None
+    number = match.group(2)
+    count = int(number) if number.isdigit() else _NUMBER_WORDS[number]
+    if count <= 0:
+        return None
+    unit = match.group(3)
+    if unit == "일":
+        start = today - timedelta(days=count)
+    elif unit in ("주", "주일"):
+        start = today - timedelta(weeks=count)
+    elif unit in ("개월", "달"):
+        start = _shift_months(today, -count)
+    else:
+        start = _shift_months(today, -12 * count)
+    description = re.sub(r"\s+", " ", match.group(0)).strip()
+    return _period(start, today, "recent", description)
+
+
+def _parse_relative(text: str, today: date) -> Optional[Dict[str, str]]:
+    """오늘/어제/이번주/지난주/이번달/지난달/올해/작년"""
+    compact = text.replace(" ", "")
+    if "오늘" in compact:
+        return _period(today, today, "custom", "오늘")
+    if "그저께" in compact or "그제" in compact:
+        day = today - timedelta(days=2)
+        return _period(day, day, "custom", "그저께")
+    if "어제" in compact:
+        day = today - timedelta(days=1)
+        return _period(day, day, "custom", "어제")
+    if "이번주" in compact:
+        return _period(today - timedelta(days=today.weekday()), today, "week", "이번 주")
+    if "지난주" in compact or "저번주" in compact:
+        monday = today - timedelta(days=today.weekday() + 7)
+        return _period(monday, monday + timedelta(days=6), "week", "지난주")
+    if "이번달" in compact:
+        return _period(today.replace(day=1), today, "month", _describe(today, False))
+    if "지난달" in compact or "저번달" in compact:
+        last_month = today.replace(day=1) - timedelta(days=1)
+        return _period(last_month.replace(day=1), last_month, "month", _describe(last_month, False))
+    if "올해" in compact or "금년" in compact:
+        return _period(date(today.year, 1, 1), today, "custom", f"{today.year}년")
+    if "재작년" in compact:
+        return _period(date(today.year - 2, 1, 1), date(today.year - 2, 12, 31), "custom", f"{today.year - 2}년")
+    if "작년" in compact or "지난해" in compact:
+        return _period(date(today.year - 1, 1, 1), date(today.year - 1, 12, 31), "custom", f"{today.year - 1}년")
+    return None
@@ -1,10 +1,27 @@
 import os
-from typing import Dict, Any, List
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import Dict, Any, Iterator, List, Tuple
 from langchain.prompts import PromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
+from app.config import settings
 from app.services.user_service import UserService
+from app.services.partial_json import PartialJSONReader
+from app.services.cache import TTLCache
+from app.services.prefetch import BackgroundPrefetcher
+from app.services.llm_gateway import get_llm_gateway
+
+# 스트리밍 시 목록 필드 -> 원소 하나당 보내는 이벤트 이름
+_STREAM_ITEM_EVENTS = {
+    "key_points": "key_point",
+    "recommendations": "recommendation",
+    "easy_terms": "easy_term",
+}
+
+# 메뉴 이동 후 곧 요청될 맞춤 설명: 이동 경로 -> (상품 종류, 상품 ID 목록 - 먼저 생성할 순서)
+PREFETCH_ROUTES = {
+    "/cardApplication": ("card", ["shinhan-check", "shinhan-youth", "shinhan-premium"]),
+    "/loan": ("loan", [None]),
+}
 
 
 class PersonalizedExplanation(BaseModel):
@@ -23,35 +40,167 @@ class PersonalizedService:
             print("Warning: GEMINI_API_KEY not found, using fallback explanations")
             self.llm = None
         else:
-            self.llm = ChatGoogleGenerativeAI(
-                model="gemini-2.0-flash-exp",
-                google_api_key=self.api_key,
+            # LLM 게이트웨이 경유 (검색 의도 분석보다 낮은 우선순위)
+            self.llm = get_llm_gateway().client(
                 temperature=0.3,  # 약간의 창의성
+                priority="explanation",
             )
 
         self.user_service = UserService()
         self.output_parser = PydanticOutputParser(pydantic_object=PersonalizedExplanation)
 
-    def get_personalized_explanation(self, product_type: str, product_id: str = None, user_id: str = "default_user") -> \
-    Dict[str, Any]:
-        """사용자 맞춤형 설명 생성"""
-
-        # 사용자 정보 가져오기
+        # Gemini로 만든 맞춤 설명: (사용자, 상품 종류, 상품 ID) -> 결과
+        self.explanation_cache = TTLCache(maxsize=256, ttl=settings.EXPLANATION_CACHE_TTL)
+        self.prefetcher = BackgroundPrefetcher(settings.EXPLANATION_PREFETCH_QUEUE_SIZE, name="explanation-prefetch")
+
+    def get_personalized_explanation(self, product_type: str, product_id: str = None, user_id: str = "default_user",
+                                     allow_llm: bool = True) -> Dict[str, Any]:
+        """사용자 맞춤형 설명 생성 (allow_llm=False면 캐시에 없을 때 기본 설명 + degraded 표시)"""
+
+        # 미리 만들어 둔(또는 만드는 중인) 설명이 있으면 사용
+        cached = self._get_cached_explanation(user_id, product_type, product_id, wait=allow_llm)
+        if cached is not None:
+            return cached
+
+        with self.prefetcher.foreground():
+            # 사용자 정보 가져오기
+            user_info = self.user_service.get_user_info(user_id)
+
+            # Gemini를 사용할 수 있는 경우
+            if self.llm and allow_llm:
+                try:
+                    result = self._generate_ai_explanation(product_type, product_id, user_info)
+                    self.explanation_cache.set((user_id, product_type, product_id), result)
+                    return result
+                except Exception as e:
+                    print(f"Gemini API 오류: {e}")
+                    return self._generate_fallback_explanation(product_type, product_id, user_info)
+
+            # Fallback 설명
+            return self._fallback_explanation(product_type, product_id, user_info, not allow_llm)
+
+    def _fallback_explanation(self, product_type: str, product_id: str, user_info: Dict[str, Any],
+                              degraded: bool) -> Dict[str, Any]:
+        """기본 설명 (요청 제한/과부하로 Gemini를 건너뛴 경우 degraded 표시)"""
+        result = self._generate_fallback_explanation(product_type, product_id, user_info)
+        if degraded:
+            result["degraded"] = True
+        return result
+
+    def prefetch_for_route(self, redirect_url: str, user_id: str = "default_user") -> int:
+        """카드/대출 메뉴로 이동한 사용자의 맞춤 설명을 백그라운드에서 미리 생성 (등록한 작업 수 반환)"""
+        if not settings.EXPLANATION_PREFETCH or not self.llm or redirect_url not in PREFETCH_ROUTES:
+            return 0
+
+        product_type, product_ids = PREFETCH_ROUTES[redirect_url]
+        submitted = 0
+        for product_id in product_ids:
+            key = (user_id, product_type, product_id)
+            if key in self.explanation_cache:
+                continue
+            if self.prefetcher.submit(key, lambda key=key: self._prefetch_explanation(*key)):
+                submitted += 1
+        if submitted:
+            print(f"🔮 맞춤 설명 선행 생성 등록: {product_type} {submitted}건")
+        return submitted
+
+    def _prefetch_explanation(self, user_id: str, product_type: str, product_id: str):
+        """선행 작업: Gemini 맞춤 설명을 만들어 캐시에 저장 (실패하면 저장하지 않음)"""
+        key = (user_id, product_type, product_id)
+        # 대기열에 있는 동안 다른 요청이 이미 만들어 캐시에 넣었으면 다시 호출하지 않음
+        if key in self.explanation_cache:
+            return
+        user_info = self.user_service.get_user_info(user_id)
+        result = self._generate_ai_explanation(product_type, product_id, user_info, priority="prefetch")
+        self.explanation_cache.set(key, result)
+
+    def _get_cached_explanation(self, user_id: str, product_type: str, product_id: str, wait: bool = True):
+        """캐시된 맞춤 설명 (wait면 선행 생성 중일 때 끝날 때까지 기다림)"""
+        key = (user_id, product_type, product_id)
+        cached = self.explanation_cache.get(key)
+        if cached is None and wait and self.prefetcher.wait(key, settings.SEARCH_TIMEOUT):
+            cached = self.explanation_cache.get(key)
+        if cached is not None:
+            print(f"⚡ 맞춤 설명 캐시 사용: {product_type} {product_id}")
+        return cached
+
+    def stream_personalized_explanation(self, product_type: str, product_id: str = None, user_id: str = "default_user",
+                                        allow_llm: bool = True) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """사용자 맞춤형 설명을 (이벤트, 데이터)로 스트리밍
+
+        explanation은 토큰이 도착하는 대로 조각(delta)으로, key_points/recommendations/easy_terms는
+        원소가 완성될 때마다 보내고, 마지막 done에 get_personalized_explanation과 같은 전체 결과를 담습니다.
+        Gemini 호출이 실패하면 폴백 설명을 같은 이벤트로 보냅니다 (이미 보낸 내용이 있으면 reset 먼저).
+        """
         user_info = self.user_service.get_user_info(user_id)
+        # 사용자 정보는 바로 보낼 수 있으므로 첫 이벤트로 전송
+        yield "context", {"user_context": self._get_user_context(user_info)}
 
-        # Gemini를 사용할 수 있는 경우
-        if self.llm:
+        cached = self._get_cached_explanation(user_id, product_type, product_id, wait=allow_llm)
+        if cached is not None:
+            yield from self._replay_explanation(cached)
+            return
+
+        streamed = False
+        if self.llm and allow_llm:
             try:
-                return self._generate_ai_explanation(product_type, product_id, user_info)
+                with self.prefetcher.foreground():
+                    reader = PartialJSONReader()
+                    chunks = []
+                    item_counts = {field: 0 for field in _STREAM_ITEM_EVENTS}
+                    for message in self.llm.stream(self._build_prompt(product_type, product_id, user_info)):
+                        chunks.append(message.content)
+                        for kind, field, value in reader.feed(message.content):
+                            if kind == "delta" and field == "explanation":
+                                streamed = True
+                                yield "explanation", {"delta": value}
+                            elif kind == "item" and field in item_counts:
+                                streamed = True
+                                yield self._stream_item_event(field, value, item_counts[field])
+                                item_counts[field] += 1
+
+                # 최종 결과는 기존 경로와 같은 파서로 검증
+                parsed_result = self.output_parser.parse("".join(chunks))
+                result = self._build_ai_result(parsed_result, user_info)
+                self.explanation_cache.set((user_id, product_type, product_id), result)
+                yield "done", result
+                return
             except Exception as e:
-                print(f"Gemini API 오류: {e}")
-                return self._generate_fallback_explanation(product_type, product_id, user_info)
+                print(f"Gemini 스트리밍 오류: {e}")
+                yield "error", {"message": "맞춤 설명 생성 중 오류가 발생해 기본 설명으로 대체합니다."}
+                if streamed:
+                    yield "reset", {}
+
+        yield from self._replay_explanation(self._fallback_explanation(product_type, product_id, user_info, not allow_llm))
+
+    def _replay_explanation(self, result: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """이미 완성된 설명을 스트리밍과 같은 이벤트로 전송"""
+        yield "explanation", {"delta": result["explanation"]}
+        for field in _STREAM_ITEM_EVENTS:
+            values = result.get(field) or []
+            items = [{term: description} for term, description in values.items()] if isinstance(values, dict) else values
+            for index, item in enumerate(items):
+                yield self._stream_item_event(field, item, index)
+        yield "done", result
+
+    def _stream_item_event(self, field: str, item: Any, index: int) -> Tuple[str, Dict[str, Any]]:
+        """목록 필드 원소 하나를 스트리밍 이벤트로 변환 (easy_terms 원소는 {용어: 설명})"""
+        if field == "easy_terms":
+            (term, description), = item.items()
+            return "easy_term", {"index": index, "term": term, "description": description}
+        return _STREAM_ITEM_EVENTS[field], {"index": index, "text": item}
+
+    def _generate_ai_explanation(self, product_type: str, product_id: str, user_info: Dict[str, Any],
+                                 priority: str = None) -> Dict[str, Any]:
+        """Gemini를 사용한 맞춤 설명 생성 (priority: LLM 게이트웨이 우선순위 클래스, 기본 explanation)"""
+
+        response = self.llm.invoke(self._build_prompt(product_type, product_id, user_info), priority=priority)
+        parsed_result = self.output_parser.parse(response.content)
 
-        # Fallback 설명
-        return self._generate_fallback_explanation(product_type, product_id, user_info)
+        return self._build_ai_result(parsed_result, user_info)
 
-    def _generate_ai_explanation(self, product_type: str, product_id: str, user_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Gemini를 사용한 맞춤 설명 생성"""
+    def _build_prompt(self, product_type: str, product_id: str, user_info: Dict[str, Any]) -> str:
+        """맞춤 설명 프롬프트 생성"""
 
         format_instructions = self.output_parser.get_format_instructions()
 
@@ -93,9 +242,10 @@ class PersonalizedService:
             product_description=product_info
         )
 
-        response = self.llm.invoke(prompt)
-        parsed_result = self.output_parser.parse(response.content)
+        return prompt
 
+    def _build_ai_result(self, parsed_result: PersonalizedExplanation, user_info: Dict[str, Any]) -> Dict[str, Any]:
+        """파싱된 Gemini 응답을 API 결과로 변환"""
         return {
             "success": True,
             "explanation": parsed_result.explanation,
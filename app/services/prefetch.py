@@ -0,0 +1,100 @@
+"""
+백그라운드 선행 작업 (speculative prefetch)
+
+곧 요청될 가능성이 높은 작업을 미리 실행해 두는 낮은 우선순위 작업 큐입니다.
+- 큐 크기가 정해져 있어 가득 차면 새 작업은 버립니다 (요청 처리를 막지 않음)
+- 워커는 하나이고, 같은 종류의 사용자 요청(foreground)이 처리 중이면 끝날 때까지 기다렸다가 실행합니다
+- 같은 키의 작업은 큐에 한 번만 들어가고, 실행 중인 작업은 사용자 요청이 결과를 기다릴 수 있습니다
+"""
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Optional
+
+
+class BackgroundPrefetcher:
+    """크기가 제한된 낮은 우선순위 선행 작업 큐 (워커 1개)"""
+
+    def __init__(self, maxsize: int = 8, name: str = "prefetch"):
+        self.name = name
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=maxsize)
+        self._pending: Dict[Hashable, threading.Event] = {}   # 큐에 있거나 실행 중인 작업 -> 완료 이벤트
+        self._running: Optional[Hashable] = None
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        # 사용자 요청 처리 중에는 선행 작업을 시작하지 않음
+        self._foreground = 0
+        self._idle = threading.Event()
+        self._idle.set()
+        self.submitted = 0
+        self.dropped = 0
+        self.completed = 0
+
+    def submit(self, key: Hashable, job: Callable[[], None]) -> bool:
+        """선행 작업 등록 (이미 등록됐거나 큐가 가득 차면 False)"""
+        with self._lock:
+            if key in self._pending:
+                return False
+            try:
+                self._queue.put_nowait((key, job))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self._pending[key] = threading.Event()
+            self.submitted += 1
+        self._ensure_worker()
+        return True
+
+    def wait(self, key: Hashable, timeout: float) -> bool:
+        """실행 중인 같은 키의 작업이 끝날 때까지 대기 (실행 중이 아니면 바로 False)"""
+        with self._lock:
+            done = self._pending.get(key) if self._running == key else None
+        return done.wait(timeout) if done is not None else False
+
+    @contextmanager
+    def foreground(self):
+        """사용자 요청 구간 (이 구간이 끝날 때까지 새 선행 작업을 시작하지 않음)"""
+        with self._lock:
+            self._foreground += 1
+            self._idle.clear()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._foreground -= 1
+                if not self._foreground:
+                    self._idle.set()
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work_loop, name=self.name, daemon=True)
+                self._worker.start()
+
+    def _work_loop(self):
+        while True:
+            key, job = self._queue.get()
+            self._idle.wait()
+            with self._lock:
+                self._running = key
+            try:
+                job()
+                self.completed += 1
+            except Exception as e:
+                print(f"⚠️ 선행 작업 실패 ({self.name}): {key} ({e})")
+            finally:
+                with self._lock:
+                    self._running = None
+                    done = self._pending.pop(key)
+                done.set()
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "completed": self.completed
+        }
@@ -0,0 +1,97 @@
+"""
+검색어 로그
+
+process_query가 처리한 검색어를 (정규화한 검색어, 의도, 처리 시간)으로 JSON Lines 파일에 추가만 합니다.
+요청 경로에서는 큐에 넣기만 하고, 파일 쓰기는 백그라운드 스레드가 모아서 합니다.
+시작 시 캐시 워밍업이 이 로그에서 자주 쓰인 검색어 상위 N개를 읽어 갑니다.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.intent_classifier import normalize_query
+
+DEFAULT_LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "logs", "query_log.jsonl")
+# 상위 검색어 집계 시 읽는 최근 로그 줄 수
+TOP_QUERY_WINDOW = 100_000
+# 한 번에 모아서 쓰는 최대 기록 수
+_WRITE_BATCH = 256
+
+
+class QueryLog:
+    """추가 전용(append-only) 검색어 로그"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.QUERY_LOG_PATH or DEFAULT_LOG_PATH
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def record(self, query: str, intent: Optional[str], latency_ms: float, **extra: Any):
+        """검색어 한 건 기록 (큐에 넣기만 함)"""
+        entry = {
+            "ts": round(time.time(), 3),
+            "query": normalize_query(query),
+            "intent": intent,
+            "latency_ms": round(latency_ms, 2),
+        }
+        entry.update(extra)
+        self._queue.put(entry)
+        self._ensure_writer()
+
+    def _ensure_writer(self):
+        if self._writer is not None:
+            return
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="query-log-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < _WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in batch))
+            except OSError as e:
+                print(f"⚠️ 검색어 로그 기록 실패: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self):
+        """큐에 남은 기록을 모두 쓸 때까지 대기"""
+        if self._writer is not None:
+            self._queue.join()
+
+    def top_queries(self, limit: int = 50, window: int = TOP_QUERY_WINDOW) -> List[Tuple[str, str, int]]:
+        """최근 로그에서 자주 쓰인 검색어 상위 limit개 (검색어, 마지막 의도, 횟수)"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = deque(f, maxlen=window)
+        except FileNotFoundError:
+            return []
+
+        counts = Counter()
+        intents: Dict[str, str] = {}
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            query = entry.get("query")
+            if query:
+                counts[query] += 1
+                intents[query] = entry.get("intent")
+        return [(query, intents[query], count) for query, count in counts.most_common(limit)]
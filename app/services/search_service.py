@@ -1,60 +1,166 @@
 import re
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from .nlp_service import GeminiNLPService
-from app.data import MOCK_TRANSACTIONS
+from app.data import MOCK_ACCOUNT_TRANSACTIONS, MOCK_TRANSACTIONS, MOCK_USER_INFO
+from app.config import settings
+from app.models.transaction import TransactionRecord
+from app.repositories import TransactionRepository
+from app.repositories.account_fanout import AccountFanout
+from app.repositories.shared_store import SharedRepositoryProvider
+from .amount_parser import parse_amount_range
+from .period_parser import has_period_expression, parse_period
+from .menu_registry import menu_registry
+from .cache import TTLCache
+from .gazetteer import Gazetteer
+from .intent_classifier import normalize_query
+from .query_log import QueryLog
+from app.tracing import span
+from .analytics_service import AnalyticsService, GROUP_BY_LABELS, GROUP_BY_OPTIONS, detect_flow, detect_group_by
 
 
 class SearchService:
 
     def __init__(self):
+        # 사용자 거래내역의 연락처/가맹점 사전 (거래가 추가되면 새 행만 반영)
+        self.gazetteer = Gazetteer(lambda: self.transaction_repo)
         # Gemini NLP 서비스 사용
-        self.nlp_service = GeminiNLPService()
+        self.nlp_service = GeminiNLPService(self.gazetteer)
+        # 공유 메모리 저장소가 설정되면 로더가 게시한 데이터를 워커 간 공유
+        self._repo_provider = SharedRepositoryProvider(settings.SHARED_STORE_NAME) if settings.SHARED_STORE_NAME else None
+        # 거래내역은 불변 레코드로 한 번만 변환해 레포지토리와 공유
+        self._transaction_repo = None if self._repo_provider else TransactionRepository(MOCK_TRANSACTIONS)
+        # 거래 추가는 다음 세대 레포지토리를 만들어 참조만 교체 (쓰기끼리만 직렬화, 읽기는 락 없음)
+        self._append_lock = threading.Lock()
+        # 정규화한 검색어 -> (데이터 스냅샷, 의도, 처리 결과)
+        self.result_cache = TTLCache(maxsize=2048, ttl=settings.RESULT_CACHE_TTL)
+        self.query_log = QueryLog()
+        # 월별/카테고리별/지출 패턴 집계
+        self.analytics = AnalyticsService(lambda: self.transaction_repo)
+        # 주 계좌 외 계좌의 거래내역 (조건 검색은 전체 계좌에 병렬 실행 후 최신순 병합)
+        self._other_account_repos = {
+            account: TransactionRepository(transactions)
+            for account, transactions in MOCK_ACCOUNT_TRANSACTIONS.items()
+        }
+        self.account_search = AccountFanout(self._account_repos, settings.ACCOUNT_FANOUT_WORKERS)
+
+    @property
+    def transaction_repo(self) -> TransactionRepository:
+        """현재 거래내역 레포지토리 (공유 저장소는 버전이 바뀌면 새 버전으로 교체)"""
+        if self._repo_provider is not None:
+            return self._repo_provider.get()
+        return self._transaction_repo
+
+    def _account_repos(self) -> Dict[str, TransactionRepository]:
+        """계좌번호 -> 레포지토리 (주 계좌는 거래 추가/공유 저장소 교체를 반영한 현재 레포지토리)"""
+        return {MOCK_USER_INFO["account_number"]: self.transaction_repo, **self._other_account_repos}
+
+    def append_transactions(self, transactions: List[Any]) -> List[TransactionRecord]:
+        """새 거래내역 추가 (모든 인덱스를 반영한 다음 세대로 한 번에 교체)"""
+        if self._repo_provider is not None:
+            raise RuntimeError("공유 메모리 저장소 모드에서는 로더가 새 버전을 게시합니다")
+
+        with self._append_lock:
+            current = self._transaction_repo
+            successor = current.appended(transactions)
+            self._transaction_repo = successor
+
+        # 이전 스냅샷으로 만든 결과는 스냅샷 비교로 걸러지지만 메모리도 바로 비움
+        self.result_cache.clear()
+        print(f"➕ 거래내역 {len(successor) - len(current)}건 추가 (세대 {successor.generation})")
+        return [successor.row(rowid) for rowid in range(len(current), len(successor))]
 
     def _get_contact_from_transactions(self, person_name: str) -> Optional[Dict[str, Any]]:
-        """MOCK_TRANSACTIONS에서 특정 사람의 최근 송금 정보 추출"""
-        # 해당 사람에게 송금한 거래 찾기 (출금 + 사람 이름이 있는 거래)
-        person_transactions = [
-            t for t in MOCK_TRANSACTIONS
-            if t["type"] == "withdrawal"
-               and t.get("bank") is not None  # 은행 정보가 있는 송금
-               and person_name in t["description"]
-        ]
-
-        if not person_transactions:
-            return None
+        """거래내역에서 특정 사람의 최근 송금 정보 추출"""
+        # 해당 사람에게 송금한 가장 최근 거래 찾기 (최신순 순회, 찾는 즉시 중단)
+        latest_transaction = self.transaction_repo.find_latest(
+            lambda t: t.is_transfer and person_name in t.description
+        )
 
-        # 가장 최근 거래 찾기
-        latest_transaction = max(person_transactions, key=lambda x: f"{x['date']} {x['time']}")
+        if not latest_transaction:
+            return None
 
         return {
             "name": person_name,
-            "bank": latest_transaction["bank"],
-            "account": latest_transaction["accountNumber"],
-            "last_transfer_date": latest_transaction["date"],
-            "last_transfer_amount": latest_transaction["amount"]
+            "bank": latest_transaction.bank,
+            "account": latest_transaction.accountNumber,
+            "last_transfer_date": latest_transaction.date,
+            "last_transfer_amount": latest_transaction.amount
         }
 
     def _get_all_transfer_contacts(self) -> List[str]:
-        """MOCK_TRANSACTIONS에서 송금 가능한 모든 연락처 이름 추출"""
+        """거래내역에서 송금 가능한 모든 연락처 이름 추출"""
         contacts = set()
-        for t in MOCK_TRANSACTIONS:
-            if (t["type"] == "withdrawal"
-                    and t.get("bank") is not None
-                    and t.get("accountNumber") is not None):
-                # description에서 사람 이름 추출 (한글 2-4글자)
-                import re
-                names = re.findall(r'[가-힣]{2,4}', t["description"])
-                for name in names:
-                    if name not in ["만원", "거래", "내역", "송금", "이체"]:  # 제외할 단어들
-                        contacts.add(name)
+        for description in self.transaction_repo.contact_names():
+            # description에서 사람 이름 추출 (한글 2-4글자)
+            names = re.findall(r'[가-힣]{2,4}', description)
+            for name in names:
+                if name not in ["만원", "거래", "내역", "송금", "이체"]:  # 제외할 단어들
+                    contacts.add(name)
         return list(contacts)
 
-    def process_query(self, query: str) -> Dict[str, Any]:
-        """메인 검색 처리 로직"""
+    def process_query(self, query: str, log_query: bool = True, allow_llm: bool = True) -> Dict[str, Any]:
+        """메인 검색 처리 로직 (결과 캐시 확인 후 처리, 검색어 로그 기록)
+
+        allow_llm=False(요청 제한/과부하)면 캐시에 없는 검색어는 Gemini 없이 로컬 파서로 처리하고
+        결과에 degraded를 표시합니다. 이 결과는 결과 캐시에 저장하지 않습니다.
+        """
+        started = time.perf_counter()
+        with span("normalize"):
+            cache_key = normalize_query(query)
+        # 이 검색의 마감 시각 (Gemini 대기와 hedge가 이 시각을 넘지 않음)
+        deadline = time.monotonic() + settings.SEARCH_TIMEOUT
+        # 처리 전에 스냅샷을 잡아 두므로, 처리 중에 거래가 추가되면 저장한 결과는 다음 조회에서 버려짐
+        snapshot = self.transaction_repo.snapshot
+
+        with span("cache"):
+            cached = self.result_cache.get(cache_key)
+        if cached is not None and cached[0] != snapshot:
+            cached = None
+        if cached is not None:
+            _, intent, result = cached
+            print(f"⚡ 결과 캐시 사용: {query}")
+        else:
+            result, intent, cacheable = self._process_query(query, allow_llm, deadline)
+            if not allow_llm:
+                result["degraded"] = True
+            elif cacheable and result.get("success"):
+                self.result_cache.set(cache_key, (snapshot, intent, result))
+
+        if log_query:
+            self.query_log.record(query, intent, (time.perf_counter() - started) * 1000, cached=cached is not None)
+        return result
+
+    def close(self):
+        """종료 처리 (대기 중인 Gemini 호출 취소)"""
+        self.nlp_service.close()
+
+    def warm_up(self, top_n: int = None) -> int:
+        """검색어 로그 상위 N개로 NLP 의도 캐시와 결과 캐시를 미리 채움"""
+        top_n = settings.CACHE_WARMUP_TOP_N if top_n is None else top_n
+        queries = self.query_log.top_queries(top_n)
+        started = time.perf_counter()
+        for query, _, _ in queries:
+            try:
+                self.process_query(query, log_query=False)
+            except Exception as e:
+                print(f"⚠️ 캐시 워밍업 실패: {query} ({e})")
+        print(f"🔥 캐시 워밍업 완료: {len(queries)}개 검색어, {time.perf_counter() - started:.1f}s")
+        return len(queries)
+
+    def _process_query(self, query: str, allow_llm: bool = True,
+                       deadline: Optional[float] = None) -> Tuple[Dict[str, Any], Optional[str], bool]:
+        """NLP 파싱 + 의도별 처리 (결과, 의도, 결과 캐시에 저장해도 되는지)
+
+        의도 캐시와 같은 규칙으로, Gemini 실패/hedge로 폴백 결과를 돌려준 경우는 저장하지 않음
+        (다음 같은 검색에서 Gemini를 다시 시도하거나 지연된 Gemini 결과를 씀)
+        """
         try:
             # 1. NLP로 텍스트 파싱
-            parsed_result = self.nlp_service.parse_query(query)
+            with span("nlp"):
+                parsed_result = self.nlp_service.parse_query(query, allow_llm, deadline)
 
             intent = parsed_result["intent"]
             entities = parsed_result["entities"]
@@ -72,14 +178,17 @@ class SearchService:
             print("-" * 50)
 
             # 2. 의도별 처리
-            if intent == "transfer":
-                result = self._handle_transfer_intent(entities, confidence, query)
-            elif intent == "search":
-                result = self._handle_search_intent(entities, confidence, query)
-            elif intent == "menu":
-                result = self._handle_menu_intent(entities, confidence, query)
-            else:
-                result = self._handle_unknown_intent(query, confidence)
+            with span(f"handler.{intent}"):
+                if intent == "transfer":
+                    result = self._handle_transfer_intent(entities, confidence, query)
+                elif intent == "search":
+                    result = self._handle_search_intent(entities, confidence, query)
+                elif intent == "menu":
+                    result = self._handle_menu_intent(entities, confidence, query)
+                elif intent == "analytics":
+                    result = self._handle_analytics_intent(entities, confidence, query)
+                else:
+                    result = self._handle_unknown_intent(query, confidence)
 
             # 🎯 최종 응답 확인용 프린트문
             print(f"🎯 최종 응답:")
@@ -88,11 +197,12 @@ class SearchService:
             print(f"   - message: {result.get('message')}")
             print("=" * 50)
 
-            return result
+            cacheable = parsed_result.get("used_model") != "fallback" and not parsed_result.get("hedged")
+            return result, intent, cacheable
 
         except Exception as e:
             print(f"❌ 에러 발생: {e}")
-            return self._handle_error(str(e))
+            return self._handle_error(str(e)), None, False
 
     def _handle_transfer_intent(self, entities: Dict[str, Any], confidence: float, query: str) -> Dict[str, Any]:
         """송금 의도 처리"""
@@ -171,56 +281,28 @@ class SearchService:
 
     def _handle_search_intent(self, entities: Dict[str, Any], confidence: float, query: str) -> Dict[str, Any]:
         """조회 의도 처리"""
-        merchant = entities.get("merchant")
-        person_name = entities.get("person")
         date_range = entities.get("date_range")  # Gemini가 추출한 날짜 범위 객체
 
-        # 기본 필터
-        filter_data = {
-            "merchant": None,
-            "recipient": None,
-            "type": "all"
-        }
-
-        transactions = []
-        message = ""
-
         # 기간별 검색 (Gemini가 date_range를 추출한 경우)
         if date_range and isinstance(date_range, dict):
             return self._handle_gemini_period_search(date_range, entities, confidence, query)
 
         # 기간 관련 검색 처리 (폴백)
         if self._is_period_query(query):
-            return self._handle_period_search(query, confidence)
-
-        # 가맹점별 조회 (스타벅스, 마트 등)
-        if merchant:
-            transactions = [t for t in MOCK_TRANSACTIONS if merchant in t["description"]]
-            filter_data["merchant"] = merchant
-            message = f"{merchant} 거래내역을 찾았습니다."
-
-        # 사람별 송금 내역 조회
-        elif person_name:
-            transactions = [t for t in MOCK_TRANSACTIONS
-                            if t["type"] == "withdrawal" and person_name in t["description"]]
-            filter_data["recipient"] = person_name
-            message = f"{person_name}님과의 송금내역을 찾았습니다."
-
-        # 거래 타입별 조회 (입금/출금)
-        elif "입금" in query:
-            transactions = [t for t in MOCK_TRANSACTIONS if t["type"] == "deposit"]
-            filter_data["type"] = "deposit"
-            message = "입금내역을 조회했습니다."
-
-        elif "출금" in query or "송금" in query:
-            transactions = [t for t in MOCK_TRANSACTIONS if t["type"] == "withdrawal"]
-            filter_data["type"] = "withdrawal"
-            message = "출금내역을 조회했습니다."
-
-        # 기본: 최근 거래내역
-        else:
-            transactions = MOCK_TRANSACTIONS[:10]  # 최근 10건
-            message = "최근 거래내역입니다."
+            return self._handle_period_search(query, confidence, entities)
+
+        # 추출된 모든 조건(가맹점, 받는 사람, 거래 타입, 금액, 카테고리)을 함께 적용
+        filters = self._build_search_filters(entities, query)
+
+        # 금액별 조회 (금액 범위 조건이 없을 때: 금액 분포 + 큰 금액 순)
+        if "min_amount" not in filters and "max_amount" not in filters and self._is_amount_overview_query(query):
+            return self._handle_amount_overview(filters.get("type", "all"), confidence)
+
+        if filters:
+            return self._build_filtered_search_result(filters, confidence, ["기간별 조회", "카테고리별 조회", "금액별 조회"])
+
+        # 기본: 전체 계좌의 최근 거래내역 (계좌별 최근 10건만 꺼내 병합)
+        transactions = self.account_search.query({}, offset=0, limit=10)["transactions"]  # 최근 10건
 
         return {
             "success": True,
@@ -228,335 +310,337 @@ class SearchService:
             "redirect_url": "/history",
             "screen_data": {
                 "transactions": transactions,
-                "filter": filter_data,
+                "filter": {
+                    "merchant": None,
+                    "recipient": None,
+                    "type": "all"
+                },
                 "total_count": len(transactions)
             },
             "confidence": confidence,
-            "message": message,
+            "message": "최근 거래내역입니다.",
             "suggestions": ["기간별 조회", "카테고리별 조회", "금액별 조회"]
         }
 
-    def _handle_gemini_period_search(self, date_range: Dict[str, Any], entities: Dict[str, Any], confidence: float,
-                                     query: str) -> Dict[str, Any]:
-        """Gemini가 추출한 기간 정보로 검색 처리"""
-        start_date = date_range.get("start_date")
-        end_date = date_range.get("end_date")
-        period_description = date_range.get("description", "지정 기간")
-
-        if not start_date or not end_date:
-            # 날짜 정보가 불완전하면 폴백 처리
-            return self._handle_period_search(query, confidence)
+    def _is_amount_overview_query(self, query: str) -> bool:
+        """금액별 조회인지 판단"""
+        amount_keywords = ["금액별", "금액 분포", "금액순", "큰 금액", "고액", "가장 큰", "제일 큰"]
+        return any(keyword in query for keyword in amount_keywords)
 
-        # 거래 타입 확인 (Gemini가 추출한 것 우선 사용)
-        transaction_type = "all"
-        gemini_transaction_type = entities.get("transaction_type")
+    def _handle_amount_overview(self, transaction_type: str, confidence: float) -> Dict[str, Any]:
+        """금액별 조회: 금액 구간별 건수와 금액이 큰 거래 (금액 인덱스 사용)"""
+        transactions = self.transaction_repo.get_largest_transactions(10, transaction_type)
+        histogram = self.transaction_repo.get_amount_histogram(transaction_type)
 
-        if gemini_transaction_type:
-            if gemini_transaction_type == "입금":
-                transaction_type = "deposit"
-            elif gemini_transaction_type == "출금":
-                transaction_type = "withdrawal"
-        else:
-            # Gemini가 추출하지 못한 경우 키워드로 판단
-            if "입금" in query:
-                transaction_type = "deposit"
-            elif "출금" in query or "송금" in query:
-                transaction_type = "withdrawal"
-
-        # 거래내역 필터링
-        filtered_transactions = []
-        try:
-            for t in MOCK_TRANSACTIONS:
-                t_date = datetime.strptime(t["date"], "%Y-%m-%d")
-                start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-
-                # 날짜 범위 확인
-                if start_dt <= t_date <= end_dt:
-                    # 거래 타입 확인
-                    if transaction_type == "all":
-                        filtered_transactions.append(t)
-                    elif transaction_type == "deposit" and t["type"] == "deposit":
-                        filtered_transactions.append(t)
-                    elif transaction_type == "withdrawal" and t["type"] == "withdrawal":
-                        filtered_transactions.append(t)
-
-        except ValueError as e:
-            print(f"❌ 날짜 파싱 에러: {e}")
-            # 에러 시 폴백 처리
-            return self._handle_period_search(query, confidence)
+        type_text = {"deposit": " 입금", "withdrawal": " 출금"}.get(transaction_type, "")
 
-        # 응답 생성
-        filter_data = {
-            "date_range": {
-                "start_date": start_date,
-                "end_date": end_date,
-                "period_type": date_range.get("period_type", "custom"),
-                "description": period_description
+        return {
+            "success": True,
+            "action_type": "search",
+            "redirect_url": "/history",
+            "screen_data": {
+                "transactions": transactions,
+                "filter": {
+                    "merchant": None,
+                    "recipient": None,
+                    "type": transaction_type,
+                    "sort": "amount_desc"
+                },
+                "amount_histogram": histogram,
+                "total_count": sum(bucket["count"] for bucket in histogram)
             },
-            "type": transaction_type,
-            "merchant": None,
-            "recipient": None
+            "confidence": confidence,
+            "message": f"금액이 큰 순서로{type_text} 거래내역을 조회했습니다.",
+            "suggestions": ["10만원 이상 거래", "3만원~5만원 거래", "지출 패턴 보기"]
         }
 
-        # 거래 타입에 따른 메시지 생성
-        type_text = ""
+    def _resolve_transaction_type(self, entities: Dict[str, Any], query: str) -> str:
+        """거래 타입 결정 (Gemini가 추출한 것 우선, 없으면 키워드로 판단)"""
+        extracted_type = entities.get("transaction_type")
+
+        if extracted_type in ("입금", "deposit"):
+            return "deposit"
+        if extracted_type in ("출금", "withdrawal"):
+            return "withdrawal"
+        if extracted_type in ("전체", "all"):
+            return "all"
+
+        if "입금" in query:
+            return "deposit"
+        if "출금" in query or "송금" in query:
+            return "withdrawal"
+        return "all"
+
+    def _build_search_filters(self, entities: Dict[str, Any], query: str) -> Dict[str, Any]:
+        """추출된 개체명을 쿼리 플래너 필터로 변환"""
+        filters = {}
+
+        if entities.get("merchant"):
+            filters["merchant"] = entities["merchant"]
+
+        if entities.get("person"):
+            filters["recipient"] = entities["person"]
+
+        date_range = entities.get("date_range")
+        if isinstance(date_range, dict) and date_range.get("start_date") and date_range.get("end_date"):
+            filters["date_from"] = date_range["start_date"]
+            filters["date_to"] = date_range["end_date"]
+
+        transaction_type = self._resolve_transaction_type(entities, query)
+        if transaction_type != "all":
+            filters["type"] = transaction_type
+
+        min_amount = entities.get("min_amount")
+        max_amount = entities.get("max_amount")
+        if min_amount is None and max_amount is None:
+            amount_range = parse_amount_range(query)
+            if amount_range:
+                min_amount, max_amount = amount_range
+        if min_amount is not None:
+            filters["min_amount"] = int(min_amount)
+        if max_amount is not None:
+            filters["max_amount"] = int(max_amount)
+
+        if entities.get("category"):
+            filters["category"] = entities["category"]
+
+        if entities.get("bank"):
+            filters["bank"] = entities["bank"]
+
+        return filters
+
+    def _describe_filters(self, filters: Dict[str, Any], period_description: Optional[str] = None) -> str:
+        """필터 조건을 안내 메시지로 변환 (예: "2025년 8월 스타벅스 출금내역을 조회했습니다.")"""
+        parts = []
+        if period_description:
+            parts.append(period_description)
+        if filters.get("merchant"):
+            parts.append(filters["merchant"])
+        if filters.get("recipient"):
+            parts.append(f"{filters['recipient']}님")
+        if filters.get("bank"):
+            parts.append(filters["bank"])
+        if filters.get("category"):
+            parts.append(filters["category"])
+
+        min_amount = filters.get("min_amount")
+        max_amount = filters.get("max_amount")
+        if min_amount is not None and max_amount is not None:
+            parts.append(f"{min_amount:,}원~{max_amount:,}원")
+        elif min_amount is not None:
+            parts.append(f"{min_amount:,}원 이상")
+        elif max_amount is not None:
+            parts.append(f"{max_amount:,}원 이하")
+
+        transaction_type = filters.get("type")
         if transaction_type == "deposit":
-            type_text = " 입금"
+            parts.append("입금")
         elif transaction_type == "withdrawal":
-            type_text = " 출금"
+            parts.append("송금" if filters.get("recipient") else "출금")
+        else:
+            parts.append("거래")
+
+        return f"{' '.join(parts)}내역을 조회했습니다."
+
+    def _build_filtered_search_result(self, filters: Dict[str, Any], confidence: float, suggestions: List[str],
+                                      period_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """전체 계좌에 쿼리 플래너 검색을 병렬 실행하고 최신순으로 병합해 응답 생성"""
+        result = self.account_search.query(filters, offset=0, limit=settings.MAX_SEARCH_RESULTS, with_facets=True)
 
-        message = f"{period_description}{type_text}내역을 조회했습니다."
+        print(f"🧭 쿼리 플랜: {result['explain']}")
+        print(f"🔍 필터링 결과: {result['total_count']}건 (조건: {filters})")
 
-        print(f"🔍 필터링 결과: {len(filtered_transactions)}건 (타입: {transaction_type})")
+        filter_data = {
+            "merchant": filters.get("merchant"),
+            "recipient": filters.get("recipient"),
+            "type": filters.get("type", "all")
+        }
+        if period_info:
+            filter_data["date_range"] = period_info
+        if filters.get("min_amount") is not None or filters.get("max_amount") is not None:
+            filter_data["amount_range"] = {
+                "min_amount": filters.get("min_amount"),
+                "max_amount": filters.get("max_amount")
+            }
+        if filters.get("category"):
+            filter_data["category"] = filters["category"]
+        if filters.get("bank"):
+            filter_data["bank"] = filters["bank"]
+
+        screen_data = {
+            "transactions": result["transactions"],
+            "filter": filter_data,
+            "total_count": result["total_count"],
+            # 타입/카테고리/은행별 건수 (비트맵 popcount로 계산)
+            "facets": result["facets"],
+            # 계좌별 건수
+            "accounts": result["accounts"]
+        }
+        if settings.DEBUG:
+            screen_data["query_plan"] = result["explain"]
+
+        period_description = period_info.get("description") if period_info else None
 
         return {
             "success": True,
             "action_type": "search",
             "redirect_url": "/history",
-            "screen_data": {
-                "transactions": filtered_transactions,
-                "filter": filter_data,
-                "total_count": len(filtered_transactions)
-            },
+            "screen_data": screen_data,
             "confidence": confidence,
-            "message": message,
-            "suggestions": ["월별 요약", "카테고리별 분석", "지출 패턴 보기"]
+            "message": self._describe_filters(filters, period_description),
+            "suggestions": suggestions
         }
 
-    def _handle_period_search(self, query: str, confidence: float) -> Dict[str, Any]:
+    def _handle_gemini_period_search(self, date_range: Dict[str, Any], entities: Dict[str, Any], confidence: float,
+                                     query: str) -> Dict[str, Any]:
+        """Gemini가 추출한 기간 정보로 검색 처리"""
+        start_date = date_range.get("start_date")
+        end_date = date_range.get("end_date")
+        period_description = date_range.get("description", "지정 기간")
+
+        if not start_date or not end_date:
+            # 날짜 정보가 불완전하면 폴백 처리
+            return self._handle_period_search(query, confidence, entities)
+
+        try:
+            # 날짜 형식 확인 (YYYY-MM-DD 문자열은 사전순 비교로 범위 검색 가능)
+            datetime.strptime(start_date, "%Y-%m-%d")
+            datetime.strptime(end_date, "%Y-%m-%d")
+        except ValueError as e:
+            print(f"❌ 날짜 파싱 에러: {e}")
+            # 에러 시 폴백 처리
+            return self._handle_period_search(query, confidence, entities)
+
+        # 기간과 함께 추출된 다른 조건(가맹점, 받는 사람, 금액 등)도 모두 적용
+        filters = self._build_search_filters(entities, query)
+
+        period_info = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "period_type": date_range.get("period_type", "custom"),
+            "description": period_description
+        }
+
+        return self._build_filtered_search_result(
+            filters, confidence, ["월별 요약", "카테고리별 분석", "지출 패턴 보기"], period_info
+        )
+
+    def _handle_period_search(self, query: str, confidence: float,
+                              entities: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """기간별 검색 처리"""
-        today = datetime.now()
-        start_date = None
-        end_date = today.strftime("%Y-%m-%d")
-        period_description = ""
-
-        # 기간 파싱
-        if "최근" in query:
-            if "1주일" in query or "일주일" in query:
-                start_date = (today - timedelta(days=7)).strftime("%Y-%m-%d")
-                period_description = "최근 1주일"
-            elif "1개월" in query or "한달" in query:
-                start_date = (today - timedelta(days=30)).strftime("%Y-%m-%d")
-                period_description = "최근 1개월"
-            elif "3개월" in query:
-                start_date = (today - timedelta(days=90)).strftime("%Y-%m-%d")
-                period_description = "최근 3개월"
-            elif "6개월" in query:
-                start_date = (today - timedelta(days=180)).strftime("%Y-%m-%d")
-                period_description = "최근 6개월"
-
-        elif "1월" in query:
-            start_date = "2025-01-01"
-            end_date = "2025-01-31"
-            period_description = "2025년 1월"
-        elif "지난달" in query:
-            last_month = today.replace(day=1) - timedelta(days=1)
-            start_date = last_month.replace(day=1).strftime("%Y-%m-%d")
-            end_date = last_month.strftime("%Y-%m-%d")
-            period_description = f"{last_month.year}년 {last_month.month}월"
-
-        # 기본값 설정
-        if not start_date:
-            start_date = (today - timedelta(days=30)).strftime("%Y-%m-%d")
-            period_description = "최근 1개월"
-
-        # 거래 타입 확인
-        transaction_type = "all"
-        if "입금" in query:
-            transaction_type = "deposit"
-        elif "출금" in query or "송금" in query:
-            transaction_type = "withdrawal"
-
-        # 거래내역 필터링
-        filtered_transactions = []
-        for t in MOCK_TRANSACTIONS:
-            t_date = datetime.strptime(t["date"], "%Y-%m-%d")
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-
-            if start_dt <= t_date <= end_dt:
-                if transaction_type == "all" or t["type"] == transaction_type:
-                    filtered_transactions.append(t)
-
-        # 응답 생성
-        filter_data = {
-            "date_range": {
-                "start_date": start_date,
-                "end_date": end_date,
+        period_info = self._parse_period(query)
+        if period_info is None:
+            # 기본값: 최근 1개월
+            today = datetime.now()
+            period_info = {
+                "start_date": (today - timedelta(days=30)).strftime("%Y-%m-%d"),
+                "end_date": today.strftime("%Y-%m-%d"),
                 "period_type": "custom",
-                "description": period_description
-            },
-            "type": transaction_type,
-            "merchant": None,
-            "recipient": None
-        }
+                "description": "최근 1개월"
+            }
+        start_date, end_date = period_info["start_date"], period_info["end_date"]
+
+        # 기간 외에 추출된 조건도 함께 적용
+        filters = self._build_search_filters(entities or {}, query)
+        filters["date_from"] = start_date
+        filters["date_to"] = end_date
+
+        return self._build_filtered_search_result(
+            filters, confidence, ["월별 요약", "카테고리별 분석", "지출 패턴 보기"], period_info
+        )
+
+    def _parse_period(self, query: str) -> Optional[Dict[str, Any]]:
+        """검색어의 기간 표현을 기간 정보로 변환 (기간 표현이 없으면 None)"""
+        return parse_period(query)
+
+    def _handle_analytics_intent(self, entities: Dict[str, Any], confidence: float, query: str) -> Dict[str, Any]:
+        """분석 의도 처리 (월별 요약, 카테고리별 분석, 지출 패턴 등)"""
+        group_by = entities.get("group_by")
+        if group_by not in GROUP_BY_OPTIONS and group_by != "pattern":
+            group_by = detect_group_by(query)
+        flow = entities.get("flow") if entities.get("flow") in ("expense", "income", "all") else detect_flow(query)
+
+        # 기간: Gemini date_range 우선, 없으면 검색어에서 파싱, 둘 다 없으면 전체 기간
+        date_range = entities.get("date_range")
+        if isinstance(date_range, dict) and date_range.get("start_date") and date_range.get("end_date"):
+            period_info = {
+                "start_date": date_range["start_date"],
+                "end_date": date_range["end_date"],
+                "period_type": date_range.get("period_type", "custom"),
+                "description": date_range.get("description", "지정 기간")
+            }
+        else:
+            period_info = self._parse_period(query)
+        date_from = period_info["start_date"] if period_info else None
+        date_to = period_info["end_date"] if period_info else None
 
-        type_text = ""
-        if transaction_type == "deposit":
-            type_text = " 입금"
-        elif transaction_type == "withdrawal":
-            type_text = " 출금"
+        if group_by == "pattern":
+            analytics = self.analytics.spending_pattern(date_from, date_to)
+            title = "지출 패턴"
+        else:
+            analytics = self.analytics.summarize(group_by, date_from, date_to, flow, limit=20)
+            title = f"{GROUP_BY_LABELS[group_by]} {'수입' if flow == 'income' else '지출'}"
 
-        message = f"{period_description}{type_text}내역을 조회했습니다."
+        period_text = f"{period_info['description']} " if period_info else ""
+        suggestions = [text for option, text in (("month", "월별 요약"), ("category", "카테고리별 분석"),
+                                                  ("pattern", "지출 패턴 보기"), ("merchant", "가맹점별 지출"))
+                       if option != group_by]
 
         return {
             "success": True,
-            "action_type": "search",
-            "redirect_url": "/history",
+            "action_type": "analytics",
+            "redirect_url": "/analytics",
             "screen_data": {
-                "transactions": filtered_transactions,
-                "filter": filter_data,
-                "total_count": len(filtered_transactions)
+                "group_by": group_by,
+                "flow": flow,
+                "period": period_info,
+                "analytics": analytics
             },
             "confidence": confidence,
-            "message": message,
-            "suggestions": ["월별 요약", "카테고리별 분석", "지출 패턴 보기"]
+            "message": f"{period_text}{title} 분석 결과입니다.",
+            "suggestions": suggestions[:3]
         }
 
     def _is_period_query(self, query: str) -> bool:
-        """기간 관련 검색인지 판단"""
-        period_keywords = [
-            "최근", "지난", "이번", "1주일", "일주일", "1개월", "한달", "3개월", "6개월",
-            "1월", "2월", "3월", "4월", "5월", "6월", "7월", "8월", "9월", "10월", "11월", "12월",
-            "지난달", "이번달", "작년", "올해"
-        ]
-        return any(keyword in query for keyword in period_keywords)
+        """기간 관련 검색인지 판단 ("최근 거래"처럼 기간 없이 최근/지난/이번만 있으면 기본 기간으로 검색)"""
+        return has_period_expression(query) or any(word in query for word in ("최근", "지난", "이번"))
 
     def _handle_menu_intent(self, entities: Dict[str, Any], confidence: float, query: str) -> Dict[str, Any]:
-        """메뉴 의도 처리"""
+        """메뉴 의도 처리 (메뉴 레지스트리 라우팅 테이블 사용)"""
 
         # 1. 먼저 Gemini가 분석한 menu_type 확인
-        menu_type = entities.get("menu_type")
-
-        if menu_type:
-            # Gemini 분석 결과에 따른 정확한 라우팅
-            menu_routes = {
-                "exchange": {
-                    "url": "/exchange",
-                    "message": "환전 화면으로 이동합니다.",
-                    "suggestions": ["환율 확인", "환전 신청", "환전 내역"]
-                },
-                "exchangeCalculator": {
-                    "url": "/exchangeCalculator",
-                    "message": "환율계산기 화면으로 이동합니다.",
-                    "suggestions": ["실시간 환율", "통화 변환", "환전 신청"]
-                },
-                "exchangeAlerts": {
-                    "url": "/exchangeAlerts",
-                    "message": "환율알림설정 화면으로 이동합니다.",
-                    "suggestions": ["알림 추가", "알림 관리", "환율 확인"]
-                },
-                "cardApplication": {
-                    "url": "/cardApplication",
-                    "message": "카드 신청 화면으로 이동합니다.",
-                    "suggestions": ["카드 혜택 보기", "신청 자격 확인", "발급 현황"]
-                },
-                "loan": {
-                    "url": "/loan",
-                    "message": "대출관리 화면으로 이동합니다.",
-                    "suggestions": ["대출 현황", "서류 조회", "이자 계산"]
-                },
-                "loanDocuments": {
-                    "url": "/loanDocuments",
-                    "message": "대출서류조회 화면으로 이동합니다.",
-                    "suggestions": ["계약서 다운로드", "증명서 발급", "서류 목록"]
-                },
-                "loanCalculator": {
-                    "url": "/loanCalculator",
-                    "message": "대출이자계산기 화면으로 이동합니다.",
-                    "suggestions": ["이자 계산", "상환 계획", "대출 상품"]
-                },
-                "history": {
-                    "url": "/history",
-                    "message": "입출금내역 화면으로 이동합니다.",
-                    "suggestions": ["기간별 조회", "거래 필터", "내역 다운로드"]
-                },
-                "transfer": {
-                    "url": "/transfer",
-                    "message": "송금 화면으로 이동합니다.",
-                    "suggestions": ["받는분 입력", "금액 설정", "이체 한도"]
-                }
-            }
-
-            route_info = menu_routes.get(menu_type)
-            if route_info:
-                print(f"✅ Gemini 분석 결과 사용: {menu_type} → {route_info['url']}")
-                return {
-                    "success": True,
-                    "action_type": "menu",
-                    "redirect_url": route_info["url"],
-                    "screen_data": {"menu_type": menu_type},
-                    "confidence": confidence,
-                    "message": route_info["message"],
-                    "suggestions": route_info["suggestions"]
-                }
-
-        # 2. Gemini 분석이 없거나 실패한 경우 기존 키워드 매칭 사용 (폴백)
-        print(f"⚠️ Gemini menu_type 없음, 키워드 매칭 사용")
-
-        # 환율알림 관련 (우선순위 높임)
-        if any(keyword in query for keyword in ["환율알림", "환율 알림", "알림설정", "환율 설정"]):
-            return {
-                "success": True,
-                "action_type": "menu",
-                "redirect_url": "/exchangeAlerts",
-                "screen_data": {},
-                "confidence": confidence,
-                "message": "환율알림설정 화면으로 이동합니다.",
-                "suggestions": ["알림 추가", "알림 관리", "환율 확인"]
-            }
-
-        # 환율계산기 관련
-        elif any(keyword in query for keyword in ["환율계산", "환율 계산", "계산기", "환전 계산"]):
-            return {
-                "success": True,
-                "action_type": "menu",
-                "redirect_url": "/exchangeCalculator",
-                "screen_data": {},
-                "confidence": confidence,
-                "message": "환율계산기 화면으로 이동합니다.",
-                "suggestions": ["실시간 환율", "통화 변환", "환전 신청"]
-            }
-
-        # 환전 관련 (우선순위 낮춤)
-        elif any(keyword in query for keyword in ["환전", "달러", "엔화", "유로", "외화"]):
-            return {
-                "success": True,
-                "action_type": "menu",
-                "redirect_url": "/exchange",
-                "screen_data": {},
-                "confidence": confidence,
-                "message": "환전 화면으로 이동합니다.",
-                "suggestions": ["환율 확인", "환전 신청", "환전 내역"]
-            }
+        menu = menu_registry.get(entities.get("menu_type"))
+        if menu:
+            print(f"✅ Gemini 분석 결과 사용: {menu.id} → {menu.url}")
+        else:
+            # 2. Gemini 분석이 없거나 실패한 경우 키워드 매칭 사용 (폴백)
+            print(f"⚠️ Gemini menu_type 없음, 키워드 매칭 사용")
+            menu = menu_registry.match(query)
 
-        # 나머지 메뉴들...
-        elif any(keyword in query for keyword in ["카드", "체크카드", "신용카드", "카드신청"]):
+        if menu:
             return {
                 "success": True,
                 "action_type": "menu",
-                "redirect_url": "/cardApplication",
-                "screen_data": {},
+                "redirect_url": menu.url,
+                "screen_data": {"menu_type": menu.id},
                 "confidence": confidence,
-                "message": "카드 신청 화면으로 이동합니다.",
-                "suggestions": ["카드 혜택 보기", "신청 자격 확인", "발급 현황"]
+                "message": menu.message,
+                "suggestions": menu.suggestions
             }
 
         # 기타 등등...
-        else:
-            return {
-                "success": True,
-                "action_type": "menu",
-                "redirect_url": "/settings",
-                "screen_data": {
-                    "menu_category": "기타",
-                    "original_query": query
-                },
-                "confidence": confidence,
-                "message": "관련 메뉴로 이동합니다.",
-                "suggestions": ["설정", "고객센터", "도움말"]
-            }
+        return {
+            "success": True,
+            "action_type": "menu",
+            "redirect_url": "/settings",
+            "screen_data": {
+                "menu_category": "기타",
+                "original_query": query
+            },
+            "confidence": confidence,
+            "message": "관련 메뉴로 이동합니다.",
+            "suggestions": ["설정", "고객센터", "도움말"]
+        }
 
     def _handle_unknown_intent(self, query: str, confidence: float) -> Dict[str, Any]:
         """알 수 없는 의도 처리"""
@@ -0,0 +1,274 @@
+"""
+검색어 자동완성 (typeahead)
+
+송금 연락처, 가맹점, 메뉴, 자주 쓰는 검색어를 메모리 접두사 트라이에 넣고
+입력할 때마다 LLM 호출 없이 추천 검색어를 돌려줍니다.
+
+- 키는 자모 단위로 분해해 저장하므로 입력 중인 음절("김처")도 "김철수"와 매칭
+- 초성만 입력하면("ㄱㅊㅅ") 초성 트라이에서 검색
+- 단어 시작 위치마다 키를 넣어 "강남" → "스타벅스 강남점"도 매칭
+- 순위는 frecency (사용 횟수 × 최근성, 반감기 FRECENCY_HALF_LIFE_DAYS)
+- 트라이 노드마다 점수 상위 TOP_K개를 유지하므로 검색은 접두사 길이만큼만 이동
+"""
+import heapq
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from app.models.transaction import OUTFLOW_TYPES, TransactionRecord
+from .hangul import choseong, decompose, is_choseong_query
+from .menu_registry import menu_registry
+
+# 노드마다 유지하는 추천 수 (응답 최대 개수)
+TOP_K = 10
+# frecency 반감기
+FRECENCY_HALF_LIFE_DAYS = 14
+# 기록하는 검색어 최대 개수 (넘으면 점수가 가장 낮은 검색어 제거)
+MAX_QUERY_ENTRIES = 5000
+# 최대 개수를 이 비율만큼 넘으면 한꺼번에 정리
+QUERY_EVICTION_SLACK = 0.1
+
+_EPOCH = datetime(2024, 1, 1).timestamp()
+_HALF_LIFE_SECONDS = FRECENCY_HALF_LIFE_DAYS * 86400
+
+
+def frecency_weight(timestamp: float) -> float:
+    """사용 1회의 가중치 (기준 시점 대비 2^(경과/반감기))
+
+    모든 점수가 같은 기준으로 커지므로, 과거 점수를 감쇠시키지 않아도 최근 사용이 더 크게 반영됩니다.
+    """
+    return 2.0 ** ((timestamp - _EPOCH) / _HALF_LIFE_SECONDS)
+
+
+def _normalize(text: str) -> str:
+    return "".join(text.lower().split())
+
+
+def _key_variants(text: str) -> List[str]:
+    """전체 문자열 + 단어 시작 위치별 접미사 (공백 제거)"""
+    words = text.lower().split()
+    return list(dict.fromkeys("".join(words[index:]) for index in range(len(words))))
+
+
+class SuggestionEntry:
+    """추천 항목"""
+
+    __slots__ = ("kind", "text", "query", "payload", "score", "keys")
+
+    def __init__(self, kind: str, text: str, query: str, payload: Optional[Dict[str, Any]] = None):
+        self.kind = kind            # contact, merchant, menu, query
+        self.text = text            # 화면 표시
+        self.query = query          # 선택 시 /api/search로 보낼 검색어
+        self.payload = payload or {}
+        self.score = 0.0
+        # (자모 키, 초성 키) 목록
+        self.keys: List[Tuple[str, str]] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"text": self.text, "type": self.kind, "query": self.query}
+        data.update(self.payload)
+        return data
+
+
+class _TrieNode:
+    __slots__ = ("children", "top", "entries")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # 이 노드 아래 항목 중 점수 상위 TOP_K (None이면 다시 계산 필요)
+        self.top: Optional[List[SuggestionEntry]] = []
+        # 이 노드에서 끝나는 키의 항목
+        self.entries: Set[SuggestionEntry] = set()
+
+
+class PrefixTrie:
+    """노드별 상위 K 캐시를 가진 접두사 트라이"""
+
+    def __init__(self, top_k: int = TOP_K):
+        self.top_k = top_k
+        self.root = _TrieNode()
+
+    def _offer(self, node: _TrieNode, entry: SuggestionEntry):
+        """점수가 오른 항목을 노드의 상위 K에 반영 (점수는 증가만 하므로 앞으로 옮기기만 하면 됨)"""
+        top = node.top
+        if top is None or (top and top[0] is entry):
+            return
+        try:
+            position = top.index(entry)
+        except ValueError:
+            if len(top) >= self.top_k:
+                if entry.score <= top[-1].score:
+                    return
+                top.pop()
+            top.append(entry)
+            position = len(top) - 1
+        score = entry.score
+        while position > 0 and top[position - 1].score < score:
+            top[position] = top[position - 1]
+            position -= 1
+        top[position] = entry
+
+    def _path(self, key: str) -> Iterator[_TrieNode]:
+        node = self.root
+        yield node
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return
+            yield node
+
+    def insert(self, key: str, entry: SuggestionEntry):
+        """키 경로 생성 (점수가 0인 새 항목은 상위 K 반영을 첫 update로 미룸)"""
+        node = self.root
+        offer = entry.score > 0
+        if offer:
+            self._offer(node, entry)
+        for ch in key:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = _TrieNode()
+            node = child
+            if offer:
+                self._offer(node, entry)
+        node.entries.add(entry)
+
+    def update(self, key: str, entry: SuggestionEntry):
+        """항목 점수가 바뀐 뒤 경로의 상위 K 갱신"""
+        for node in self._path(key):
+            self._offer(node, entry)
+
+    def remove(self, key: str, entry: SuggestionEntry):
+        """항목 제거 (경로의 상위 K는 다음 검색 때 다시 계산)"""
+        nodes = list(self._path(key))
+        if len(nodes) != len(key) + 1:
+            return
+        nodes[-1].entries.discard(entry)
+        for node in nodes:
+            if node.top is not None and entry in node.top:
+                node.top = None
+
+    def _collect(self, node: _TrieNode) -> Iterator[SuggestionEntry]:
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            yield from current.entries
+            stack.extend(current.children.values())
+
+    def search(self, prefix: str) -> List[SuggestionEntry]:
+        """접두사로 시작하는 키의 항목 중 점수 상위 K"""
+        node = self.root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        if node.top is None:
+            node.top = heapq.nlargest(self.top_k, set(self._collect(node)), key=lambda item: item.score)
+        return node.top
+
+
+class SuggestService:
+    """자동완성 추천 서비스"""
+
+    def __init__(self, transaction_repo=None):
+        self._entries: Dict[Tuple[str, str], SuggestionEntry] = {}
+        self._jamo_trie = PrefixTrie()
+        self._choseong_trie = PrefixTrie()
+        self._query_count = 0
+
+        self._load_menus()
+        if transaction_repo is not None:
+            self._load_transactions(transaction_repo)
+
+    # ===== 항목 관리 =====
+
+    def _add(self, kind: str, text: str, query: str, payload: Optional[Dict[str, Any]] = None) -> SuggestionEntry:
+        """항목 추가 (이미 있으면 기존 항목 반환)"""
+        key = (kind, _normalize(text))
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        entry = SuggestionEntry(kind, text, query, payload)
+        entry.keys = [(decompose(variant), choseong(variant)) for variant in _key_variants(text)]
+        self._entries[key] = entry
+        for jamo_key, choseong_key in entry.keys:
+            self._jamo_trie.insert(jamo_key, entry)
+            self._choseong_trie.insert(choseong_key, entry)
+        if kind == "query":
+            self._query_count += 1
+        return entry
+
+    def _remove(self, entry: SuggestionEntry):
+        del self._entries[(entry.kind, _normalize(entry.text))]
+        for jamo_key, choseong_key in entry.keys:
+            self._jamo_trie.remove(jamo_key, entry)
+            self._choseong_trie.remove(choseong_key, entry)
+        if entry.kind == "query":
+            self._query_count -= 1
+
+    def bump(self, entry: SuggestionEntry, timestamp: Optional[float] = None, weight: float = 1.0):
+        """사용 기록 반영 (frecency 증가)"""
+        entry.score += weight * frecency_weight(time.time() if timestamp is None else timestamp)
+        for jamo_key, choseong_key in entry.keys:
+            self._jamo_trie.update(jamo_key, entry)
+            self._choseong_trie.update(choseong_key, entry)
+
+    def _load_menus(self):
+        for menu in menu_registry.menus:
+            entry = self._add("menu", menu.title, menu.title, {"redirect_url": menu.url, "menu_type": menu.id})
+            # 메뉴는 사용 기록이 없어도 나오도록 시작 시점 기준 기본 점수 (priority 순)
+            self.bump(entry, weight=menu.priority / 100)
+
+    def _load_transactions(self, transaction_repo):
+        """거래내역에서 연락처/가맹점 항목과 초기 frecency 구성"""
+        for record in transaction_repo.iter_recent():
+            self.add_transaction(record)
+
+    def add_transaction(self, record: TransactionRecord):
+        """거래 한 건을 연락처/가맹점 사용 기록으로 반영"""
+        timestamp = _transaction_timestamp(record.date, record.time)
+        if record.is_transfer and record.description:
+            entry = self._add("contact", record.description, f"{record.description} 송금", {"bank": record.bank})
+            self.bump(entry, timestamp)
+
+        merchant = record.merchant
+        if not merchant and not record.is_transfer and record.type in OUTFLOW_TYPES:
+            merchant = record.description
+        if merchant:
+            self.bump(self._add("merchant", merchant, f"{merchant} 거래내역"), timestamp)
+
+    def record_query(self, query: str, timestamp: Optional[float] = None):
+        """처리한 검색어 기록 (자주/최근 쓴 검색어 추천용)"""
+        query = " ".join(query.split())
+        if not query:
+            return
+        entry = self._add("query", query, query)
+        self.bump(entry, timestamp)
+
+        if self._query_count > MAX_QUERY_ENTRIES * (1 + QUERY_EVICTION_SLACK):
+            # 한 번에 여유분만큼 제거해 제거 비용을 분산
+            queries = [item for item in self._entries.values() if item.kind == "query" and item is not entry]
+            for item in heapq.nsmallest(self._query_count - MAX_QUERY_ENTRIES, queries, key=lambda item: item.score):
+                self._remove(item)
+
+    # ===== 검색 =====
+
+    def suggest(self, prefix: str, limit: int = TOP_K) -> List[Dict[str, Any]]:
+        """입력 중인 검색어에 대한 추천 목록"""
+        normalized = _normalize(prefix)
+        if not normalized:
+            return []
+        limit = max(1, min(limit, TOP_K))
+
+        if is_choseong_query(normalized):
+            entries = self._choseong_trie.search(decompose(normalized))
+        else:
+            entries = self._jamo_trie.search(decompose(normalized))
+        return [entry.to_dict() for entry in entries[:limit]]
+
+
+def _transaction_timestamp(date: str, time_text: str) -> float:
+    try:
+        return datetime.strptime(f"{date} {time_text}", "%Y-%m-%d %H:%M").timestamp()
+    except ValueError:
+        return _EPOCH
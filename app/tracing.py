@@ -0,0 +1,164 @@
+"""
+요청별 구간(span) 계측
+
+검색 요청 하나의 지연을 구간별로 나눠 봅니다.
+- span("이름"): 현재 요청의 구간 기록 (추적 중인 요청이 아니면 아무것도 하지 않음)
+- TracingMiddleware: 대상 요청마다 추적을 시작하고 응답에 Server-Timing 헤더를 붙임
+  (같은 이름의 구간은 합산, 브라우저 개발자 도구 Network > Timing에서 확인)
+- TRACE_EXPORT_PATH를 설정하면 Chrome trace 이벤트 형식(JSON 배열)으로 파일에 추가
+  (chrome://tracing, Perfetto UI에서 바로 열 수 있음)
+
+현재 요청은 contextvars로 전달하므로, 다른 스레드에서 구간을 기록하려면
+contextvars.copy_context().run으로 실행해야 합니다.
+Server-Timing 헤더는 응답 헤더를 보낼 때까지 끝난 구간만 담고, trace 파일은 요청 처리가 끝날 때 저장합니다
+(hedge 이후 도착한 Gemini 응답처럼 그 뒤에 끝난 구간은 남지 않음).
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+# 추적 대상 경로
+TRACED_PATHS = ("/api/search",)
+
+
+class Trace:
+    """요청 하나의 구간 기록"""
+
+    __slots__ = ("name", "started", "spans")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        # (이름, 시작 시각, 소요 시간, 스레드 id)
+        self.spans: List[tuple] = []
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (같은 이름의 구간은 합산, 먼저 시작한 순서)"""
+        totals: "OrderedDict[str, List[float]]" = OrderedDict()
+        for name, _, duration, _ in sorted(self.spans, key=lambda item: item[1]):
+            total = totals.setdefault(name, [0.0, 0])
+            total[0] += duration
+            total[1] += 1
+        entries = [
+            f'{name};dur={total * 1000:.2f}' + (f';desc="x{count}"' if count > 1 else "")
+            for name, (total, count) in totals.items()
+        ]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(entries)
+
+    def chrome_events(self, args: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Chrome trace 이벤트 (완료 이벤트 "X", 시간 단위 us)"""
+        pid = os.getpid()
+        base = _epoch_offset_us()
+        events = [{
+            "name": self.name, "cat": "request", "ph": "X", "pid": pid, "tid": threading.get_ident(),
+            "ts": base + self.started * 1e6, "dur": (time.perf_counter() - self.started) * 1e6,
+            "args": args or {}
+        }]
+        for name, started, duration, thread_id in list(self.spans):
+            events.append({
+                "name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": thread_id,
+                "ts": base + started * 1e6, "dur": duration * 1e6
+            })
+        return events
+
+
+_current: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+
+
+def _epoch_offset_us() -> float:
+    """perf_counter 기준 시각을 epoch us로 바꾸는 오프셋 (여러 프로세스의 trace를 합쳐 볼 수 있도록)"""
+    return (time.time() - time.perf_counter()) * 1e6
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str):
+    """현재 요청의 구간 기록 (추적 중이 아니면 바로 통과)"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.spans.append((name, started, time.perf_counter() - started, threading.get_ident()))
+
+
+def traced(name: str):
+    """함수 전체를 구간으로 기록하는 데코레이터"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TraceExporter:
+    """Chrome trace 이벤트를 JSON 배열 형식으로 파일에 추가 (닫는 ]가 없어도 trace 뷰어가 읽음)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, events: List[Dict[str, Any]]):
+        lines = "".join(json.dumps(event, ensure_ascii=False) + ",\n" for event in events)
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(("[\n" if new_file else "") + lines)
+
+
+class TracingMiddleware:
+    """대상 요청마다 추적을 시작하고 Server-Timing 헤더와 trace 파일로 내보내는 ASGI 미들웨어"""
+
+    def __init__(self, app, server_timing: bool = True, export_path: Optional[str] = None):
+        self.app = app
+        self.server_timing = server_timing
+        self.exporter = TraceExporter(export_path) if export_path else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in TRACED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(f"{scope['method']} {scope['path']}")
+        status = {}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if self.server_timing:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", trace.server_timing().encode("latin-1")),
+                        (b"timing-allow-origin", b"*"),
+                    ]
+            await send(message)
+
+        token = _current.set(trace)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if self.exporter is not None:
+                try:
+                    self.exporter.export(trace.chrome_events({"status": status.get("code")}))
+                except OSError as e:
+                    print(f"⚠️ trace 저장 실패: {e}")
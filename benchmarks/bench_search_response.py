@@ -0,0 +1,98 @@
+"""
+검색 응답 직렬화 벤치마크
+
+기존 경로(SearchResponse(**result) 검증 + jsonable_encoder + json.dumps)와
+새 경로(app.responses.search_json_response)를 대용량 transactions 배열로 비교합니다.
+
+실행 (프로젝트 루트, .env 필요):
+    python -m benchmarks.bench_search_response
+"""
+import asyncio
+import json
+import time
+from typing import Any, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models import SearchResponse
+from app.responses import search_json_response
+
+SIZES = [100, 1_000, 5_000, 20_000]
+REPEAT = 5
+
+
+def make_result(size: int) -> Dict[str, Any]:
+    """MOCK_TRANSACTIONS 형태의 거래내역 size건을 가진 검색 결과 생성"""
+    transactions: List[Dict[str, Any]] = []
+    for i in range(size):
+        transactions.append({
+            "id": str(i),
+            "type": "withdrawal" if i % 3 else "deposit",
+            "amount": 1000 + i,
+            "balance": 1_000_000 - i,
+            "description": "홍길동" if i % 2 else "스타벅스",
+            "bank": "신한은행" if i % 2 else None,
+            "accountNumber": "110-123-456789" if i % 2 else None,
+            "date": f"2025-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}",
+            "time": f"{i % 24:02d}:{i % 60:02d}",
+        })
+    return {
+        "success": True,
+        "action_type": "search",
+        "redirect_url": "/history",
+        "screen_data": {
+            "transactions": transactions,
+            "filter": {"merchant": None, "recipient": None, "type": "all"},
+            "total_count": size,
+        },
+        "confidence": 0.9,
+        "message": "거래내역을 조회했습니다.",
+        "suggestions": ["기간별 조회", "카테고리별 조회", "금액별 조회"],
+    }
+
+
+def old_path(result: Dict[str, Any]) -> bytes:
+    """기존: pydantic 검증 후 FastAPI 기본 인코딩"""
+    response = SearchResponse(**result)
+    content = jsonable_encoder(response)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+async def _collect(response) -> bytes:
+    if hasattr(response, "body_iterator"):
+        chunks = []
+        async for chunk in response.body_iterator:
+            chunks.append(chunk)
+        return b"".join(chunks)
+    return response.body
+
+
+def new_path(result: Dict[str, Any]) -> bytes:
+    """새 경로: 검증 생략 + 빠른 인코딩/스트리밍"""
+    return asyncio.run(_collect(search_json_response(result)))
+
+
+def measure(func, result: Dict[str, Any]) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        func(result)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    print(f"{'rows':>8} | {'old (ms)':>10} | {'new (ms)':>10} | {'speedup':>8}")
+    print("-" * 46)
+    for size in SIZES:
+        result = make_result(size)
+        # 두 경로의 결과가 같은 JSON인지 확인
+        assert json.loads(old_path(result)) == json.loads(new_path(result))
+        old_ms = measure(old_path, result)
+        new_ms = measure(new_path, result)
+        print(f"{size:>8} | {old_ms:>10.2f} | {new_ms:>10.2f} | {old_ms / new_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+NLP 의도 분석 전략별 정확도/지연/비용 평가
+
+정답(의도, 개체명)이 붙은 검색어 코퍼스(benchmarks/data/nlp_eval.jsonl)로
+의도 분석 전략들을 비교합니다.
+- rules: 정규식 규칙만 (로컬 분류기 없이 _fallback_parse)
+- local: 로컬 의도 분류기 + 규칙 기반 개체명 추출 (_classify_locally)
+- fallback: 운영 폴백 경로 그대로 (_fallback_parse)
+- gemini: 기록해 둔 Gemini 응답 (코퍼스의 "gemini" 필드)
+- pipeline@t: 로컬 신뢰도가 t 이상이면 로컬, 아니면 Gemini (NLP_CONFIDENCE_THRESHOLD 후보별)
+
+전략마다 의도별 정확도, 개체명 F1(micro), 지연 백분위, 검색어 1천 건당 Gemini 비용,
+Gemini와의 의도 일치율을 출력합니다. pipeline 표로 에스컬레이션 임계값을 고를 수 있습니다.
+
+실행 (프로젝트 루트, .env 필요):
+    python -m benchmarks.eval_nlp
+    python -m benchmarks.eval_nlp --json logs/nlp_eval_report.json
+
+Gemini 응답 기록 (GEMINI_API_KEY 필요, 코퍼스 파일에 "gemini" 필드를 채움):
+    python -m benchmarks.eval_nlp --record
+"""
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "data", "nlp_eval.jsonl")
+
+# Gemini 2.0 Flash 가격 (USD / 토큰 100만 개), 바뀌면 --input-price/--output-price로 지정
+GEMINI_INPUT_PRICE = 0.10
+GEMINI_OUTPUT_PRICE = 0.40
+
+# 개체명 F1 계산에 쓰는 키 (프롬프트 스키마 기준, date_range는 시작/종료일만 비교)
+SCORED_ENTITY_KEYS = {
+    "person", "amount", "merchant", "transaction_type", "min_amount", "max_amount",
+    "category", "bank", "menu_type", "group_by", "flow",
+    "date_range.start_date", "date_range.end_date",
+}
+# 기본값이라 명시하지 않은 것과 같은 개체명
+DEFAULT_ENTITY_VALUES = {("transaction_type", "all")}
+
+PIPELINE_THRESHOLDS = [0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95]
+REPEAT = 3
+
+Outcome = Dict[str, Any]   # {"sample", "intent", "entities", "latency_ms", "cost_usd", "confidence"}
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    """평가 코퍼스 로드 (JSONL: query, intent, entities[, gemini])"""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def entity_pairs(entities: Dict[str, Any], prefix: str = "") -> Set[Tuple[str, str]]:
+    """개체명을 (키, 값) 집합으로 펼침 (중첩 dict는 "상위.하위" 키)"""
+    pairs = set()
+    for key, value in (entities or {}).items():
+        key = f"{prefix}{key}"
+        if isinstance(value, dict):
+            pairs |= entity_pairs(value, f"{key}.")
+        elif value not in (None, "") and key in SCORED_ENTITY_KEYS:
+            pair = (key, str(value).strip())
+            if pair not in DEFAULT_ENTITY_VALUES:
+                pairs.add(pair)
+    return pairs
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+
+def gemini_cost(record: Dict[str, Any], input_price: float, output_price: float) -> float:
+    """기록된 토큰 수로 계산한 Gemini 호출 비용 (USD)"""
+    return ((record.get("input_tokens") or 0) * input_price
+            + (record.get("output_tokens") or 0) * output_price) / 1_000_000
+
+
+def timed(func: Callable[[str], Dict[str, Any]], text: str) -> Tuple[Dict[str, Any], float]:
+    """REPEAT번 실행 중 가장 빠른 시간 (ms)"""
+    best = float("inf")
+    result = None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        result = func(text)
+        best = min(best, time.perf_counter() - started)
+    return result, best * 1000
+
+
+def run_local_strategies(nlp, corpus: List[Dict[str, Any]]) -> Dict[str, List[Outcome]]:
+    """로컬 전략(rules, local, fallback) 실행"""
+    classifier = nlp.local_classifier
+
+    def rules(text: str) -> Dict[str, Any]:
+        nlp.local_classifier = None
+        try:
+            return nlp._fallback_parse(text)
+        finally:
+            nlp.local_classifier = classifier
+
+    strategies = {"rules": rules, "fallback": nlp._fallback_parse}
+    if classifier is not None:
+        strategies["local"] = nlp._classify_locally
+
+    outcomes: Dict[str, List[Outcome]] = {}
+    for name, func in strategies.items():
+        outcomes[name] = []
+        for sample in corpus:
+            result, latency_ms = timed(func, sample["query"])
+            outcomes[name].append({
+                "sample": sample,
+                "intent": result["intent"],
+                "entities": result["entities"],
+                "confidence": result["confidence"],
+                "latency_ms": latency_ms,
+                "cost_usd": 0.0,
+            })
+    return outcomes
+
+
+def gemini_outcomes(corpus: List[Dict[str, Any]], input_price: float, output_price: float) -> List[Outcome]:
+    """기록된 Gemini 응답 (기록이 없는 검색어는 제외)"""
+    return [{
+        "sample": sample,
+        "intent": sample["gemini"]["intent"],
+        "entities": sample["gemini"]["entities"],
+        "confidence": sample["gemini"].get("confidence"),
+        "latency_ms": sample["gemini"]["latency_ms"],
+        "cost_usd": gemini_cost(sample["gemini"], input_price, output_price),
+    } for sample in corpus if sample.get("gemini")]
+
+
+def pipeline_outcomes(local: List[Outcome], threshold: float,
+                      input_price: float, output_price: float) -> List[Outcome]:
+    """로컬 신뢰도 threshold 미만이면 Gemini로 에스컬레이션 (Gemini 기록이 있는 검색어만)"""
+    outcomes = []
+    for outcome in local:
+        record = outcome["sample"].get("gemini")
+        if not record:
+            continue
+        if outcome["confidence"] >= threshold:
+            outcomes.append(dict(outcome, escalated=False))
+        else:
+            outcomes.append(dict(outcome, escalated=True, intent=record["intent"], entities=record["entities"],
+                                 latency_ms=outcome["latency_ms"] + record["latency_ms"],
+                                 cost_usd=gemini_cost(record, input_price, output_price)))
+    return outcomes
+
+
+def summarize(outcomes: List[Outcome]) -> Dict[str, Any]:
+    """정확도, 의도별 정확도, 개체명 F1, 지연 백분위, 1천 건당 비용, Gemini 일치율"""
+    per_intent = defaultdict(lambda: [0, 0])
+    true_positive = false_positive = false_negative = 0
+    agree = compared = 0
+    for outcome in outcomes:
+        sample = outcome["sample"]
+        correct = outcome["intent"] == sample["intent"]
+        per_intent[sample["intent"]][0] += correct
+        per_intent[sample["intent"]][1] += 1
+
+        expected = entity_pairs(sample["entities"])
+        predicted = entity_pairs(outcome["entities"])
+        true_positive += len(expected & predicted)
+        false_positive += len(predicted - expected)
+        false_negative += len(expected - predicted)
+
+        if sample.get("gemini"):
+            compared += 1
+            agree += outcome["intent"] == sample["gemini"]["intent"]
+
+    precision = true_positive / (true_positive + false_positive) if true_positive + false_positive else 0.0
+    recall = true_positive / (true_positive + false_negative) if true_positive + false_negative else 0.0
+    latencies = [outcome["latency_ms"] for outcome in outcomes]
+    total = len(outcomes)
+    report = {
+        "queries": total,
+        "accuracy": sum(correct for correct, _ in per_intent.values()) / total if total else 0.0,
+        "per_intent": {intent: {"accuracy": correct / count, "queries": count}
+                       for intent, (correct, count) in sorted(per_intent.items())},
+        "entity_precision": precision,
+        "entity_recall": recall,
+        "entity_f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.5),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies) if latencies else 0.0,
+        },
+        "cost_per_1k_usd": sum(outcome["cost_usd"] for outcome in outcomes) / total * 1000 if total else 0.0,
+        "gemini_agreement": agree / compared if compared else None,
+    }
+    if outcomes and "escalated" in outcomes[0]:
+        report["escalation_rate"] = sum(outcome["escalated"] for outcome in outcomes) / total
+    return report
+
+
+def print_report(reports: Dict[str, Dict[str, Any]]):
+    intents = sorted({intent for report in reports.values() for intent in report["per_intent"]})
+    header = f"{'strategy':>15} | {'n':>4} | {'acc':>5} | " + " | ".join(f"{intent[:9]:>9}" for intent in intents)
+    header += f" | {'ent F1':>6} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'$/1k':>7} | {'=gemini':>7} | {'escal':>5}"
+    print(header)
+    print("-" * len(header))
+    for name, report in reports.items():
+        per_intent = " | ".join(
+            f"{report['per_intent'][intent]['accuracy']:>9.2f}" if intent in report["per_intent"] else f"{'-':>9}"
+            for intent in intents
+        )
+        agreement = report["gemini_agreement"]
+        agreement = "-" if agreement is None else f"{agreement:.2f}"
+        escalation = report.get("escalation_rate")
+        escalation = "-" if escalation is None else f"{escalation:.2f}"
+        latency = report["latency_ms"]
+        print(f"{name:>15} | {report['queries']:>4} | {report['accuracy']:>5.2f} | {per_intent}"
+              f" | {report['entity_f1']:>6.2f} | {latency['p50']:>8.2f} | {latency['p95']:>8.2f}"
+              f" | {latency['p99']:>8.2f} | {report['cost_per_1k_usd']:>7.4f} | {agreement:>7} | {escalation:>5}")
+
+
+def record_gemini(nlp, corpus: List[Dict[str, Any]], path: str):
+    """실제 Gemini를 호출해 응답, 지연, 토큰 수를 코퍼스에 기록"""
+    for i, sample in enumerate(corpus, 1):
+        prompt = nlp.prompt_template.format(query=sample["query"])
+        started = time.perf_counter()
+        try:
+            response = nlp.llm.invoke(prompt)
+            parsed = nlp.output_parser.parse(response.content)
+        except Exception as e:
+            print(f"❌ [{i}/{len(corpus)}] {sample['query']}: {e}")
+            continue
+        usage = getattr(response, "usage_metadata", None) or {}
+        sample["gemini"] = {
+            "intent": parsed.intent,
+            "entities": parsed.entities,
+            "confidence": parsed.confidence,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "input_tokens": usage.get("input_tokens"),
+            "output_tokens": usage.get("output_tokens"),
+        }
+        print(f"📝 [{i}/{len(corpus)}] {sample['query']} → {parsed.intent}")
+
+    with open(path, "w", encoding="utf-8") as f:
+        for sample in corpus:
+            f.write(json.dumps(sample, ensure_ascii=False) + "\n")
+    print(f"💾 Gemini 응답 기록 완료: {path}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="NLP 의도 분석 전략별 정확도/지연/비용 평가")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="평가 코퍼스 (JSONL)")
+    parser.add_argument("--record", action="store_true", help="실제 Gemini 응답을 코퍼스에 기록")
+    parser.add_argument("--json", help="평가 결과를 JSON으로 저장할 경로")
+    parser.add_argument("--input-price", type=float, default=GEMINI_INPUT_PRICE, help="입력 토큰 100만 개당 USD")
+    parser.add_argument("--output-price", type=float, default=GEMINI_OUTPUT_PRICE, help="출력 토큰 100만 개당 USD")
+    args = parser.parse_args(argv)
+
+    if not args.record:
+        # 오프라인 평가는 Gemini를 호출하지 않음
+        os.environ.setdefault("GEMINI_API_KEY", "offline-eval")
+    from app.services.nlp_service import GeminiNLPService
+
+    nlp = GeminiNLPService()
+    corpus = load_corpus(args.corpus)
+    if args.record:
+        record_gemini(nlp, corpus, args.corpus)
+        return
+
+    outcomes = run_local_strategies(nlp, corpus)
+    recorded = gemini_outcomes(corpus, args.input_price, args.output_price)
+    if recorded:
+        outcomes["gemini"] = recorded
+        if "local" in outcomes:
+            for threshold in PIPELINE_THRESHOLDS:
+                outcomes[f"pipeline@{threshold}"] = pipeline_outcomes(outcomes["local"], threshold,
+                                                                      args.input_price, args.output_price)
+    else:
+        print("ℹ️ 기록된 Gemini 응답이 없어 gemini/pipeline 전략은 건너뜁니다 (--record로 기록)")
+
+    reports = {name: summarize(result) for name, result in outcomes.items()}
+    print(f"📊 코퍼스: {args.corpus} ({len(corpus)}건, Gemini 기록 {len(recorded)}건)")
+    print_report(reports)
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+        print(f"💾 평가 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+테스트 공통 설정
+
+app.config의 필수 설정을 환경 변수로 채운 뒤 앱 모듈을 import 합니다 (이미 설정된 값은 그대로 사용).
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+_TMP = tempfile.mkdtemp(prefix="sol-search-tests-")
+
+for key, value in {
+    "ENVIRONMENT": "test",
+    "DEBUG": "false",
+    "HOST": "127.0.0.1",
+    "PORT": "8000",
+    "ALLOWED_ORIGINS": "http://localhost",
+    "SPACY_MODEL": "ko_core_news_sm",
+    "NLP_CONFIDENCE_THRESHOLD": "0.7",
+    "API_V1_STR": "/api/v1",
+    "LOG_LEVEL": "INFO",
+    "LOG_FORMAT": "%(message)s",
+    "SECRET_KEY": "test",
+    "MAX_TRANSFER_AMOUNT": "10000000",
+    "MIN_TRANSFER_AMOUNT": "1",
+    "MAX_SEARCH_RESULTS": "100",
+    "SEARCH_TIMEOUT": "5",
+    "GEMINI_API_KEY": "test",
+    "QUERY_LOG_PATH": os.path.join(_TMP, "query_log.jsonl"),
+}.items():
+    os.environ.setdefault(key, value)
+
+import pytest  # noqa: E402
+
+
+def _row(id, date, time="12:00", amount=-10000, type="결제", merchant=None, category="쇼핑",
+         recipient=None, bank=None, account=None):
+    """레포지토리 형식 거래 한 건 (recipient를 주면 송금)"""
+    return {
+        "id": id, "date": date, "time": time, "merchant": merchant, "category": category,
+        "amount": amount, "type": type, "balance": 1000000, "memo": None,
+        "recipient_name": recipient, "recipient_account": account, "recipient_bank": bank,
+    }
+
+
+@pytest.fixture
+def make_row():
+    return _row
+
+
+@pytest.fixture
+def sample_rows():
+    """두 달치 결제/송금 거래"""
+    return [
+        _row(1, "2025-07-03", "09:00", -4500, merchant="스타벅스 강남점", category="카페"),
+        _row(2, "2025-07-10", "12:30", -120000, type="송금", category="송금",
+             recipient="홍길동", bank="신한은행", account="110-111-111111"),
+        _row(3, "2025-07-21", "18:00", -32000, merchant="이마트 성수점", category="마트"),
+        _row(4, "2025-08-01", "08:10", 2500000, type="입금", category="급여", merchant="급여"),
+        _row(5, "2025-08-05", "13:00", -5800, merchant="스타벅스 역삼점", category="카페"),
+        _row(6, "2025-08-12", "20:40", -50000, type="송금", category="송금",
+             recipient="김철수", bank="국민은행", account="123-45-678901"),
+        _row(7, "2025-08-20", "11:15", -89000, merchant="쿠팡", category="쇼핑"),
+    ]
+
+
+class RepoHolder:
+    """서비스의 transaction_repo 참조 교체를 흉내내는 getter"""
+
+    def __init__(self, repo):
+        self.repo = repo
+
+    def __call__(self):
+        return self.repo
+
+
+@pytest.fixture
+def holder(sample_rows):
+    from app.repositories.transaction_repo import TransactionRepository
+    return RepoHolder(TransactionRepository(sample_rows))
@@ -0,0 +1,62 @@
+"""계좌별 fan-out 검색과 최신순 k-way merge"""
+import pytest
+
+from app.models import AccountTransaction
+from app.repositories.account_fanout import AccountFanout, merge_recent
+from app.responses import dumps
+from app.repositories.transaction_repo import TransactionRepository
+
+
+@pytest.fixture
+def accounts(sample_rows, make_row):
+    other = [
+        make_row(101, "2025-08-21", "09:00", -15000, merchant="스타벅스 판교점", category="카페"),
+        make_row(102, "2025-08-05", "13:00", -3000, merchant="GS25", category="편의점"),
+        make_row(103, "2025-06-30", "10:00", -5000, merchant="스타벅스 광화문점", category="카페"),
+    ]
+    return {"main": TransactionRepository(sample_rows), "other": TransactionRepository(other)}
+
+
+@pytest.fixture
+def fanout(accounts):
+    return AccountFanout(lambda: accounts, max_workers=2)
+
+
+def _expected(accounts, filters):
+    rows = [AccountTransaction(account, record) for account, repo in accounts.items()
+            for record in repo.query(filters, 0, 1000)["transactions"]]
+    return sorted(rows, key=lambda row: row.sort_key, reverse=True)
+
+
+def test_merge_recent_keeps_global_order_and_tags_accounts(accounts):
+    merged = list(merge_recent({account: list(repo.iter_recent()) for account, repo in accounts.items()}))
+    assert merged == sorted(merged, key=lambda row: row.sort_key, reverse=True)
+    assert len(merged) == sum(len(repo) for repo in accounts.values())
+    for row in merged:
+        assert accounts[row.account].find_by_id(row.id) is row.record
+
+
+def test_tagged_rows_serialize_with_account(accounts, fanout):
+    row = fanout.query({"merchant": "GS25"})["transactions"][0]
+    assert row.account == "other"
+    assert row.merchant == "GS25"
+    assert b'"account":"other"' in dumps([row])
+    assert row.to_dict() == {**row.record.to_dict(), "account": "other"}
+
+
+@pytest.mark.parametrize("filters", [{}, {"category": "카페"}, {"date_from": "2025-08-01", "date_to": "2025-08-31"}])
+@pytest.mark.parametrize("offset,limit", [(0, 3), (2, 3), (0, 100)])
+def test_query_pages_match_sorted_union(accounts, fanout, filters, offset, limit):
+    expected = _expected(accounts, filters)
+    result = fanout.query(filters, offset, limit, with_facets=True)
+
+    assert result["transactions"] == expected[offset:offset + limit]
+    assert result["total_count"] == len(expected)
+    assert result["accounts"] == {account: repo.count(filters) for account, repo in accounts.items()}
+    assert sum(result["facets"]["type"].values()) == len(expected)
+
+
+def test_query_selected_accounts_only(accounts, fanout):
+    result = fanout.query({"category": "카페"}, accounts=["other"])
+    assert set(result["accounts"]) == {"other"}
+    assert [(row.account, row.id) for row in result["transactions"]] == [("other", "101"), ("other", "103")]
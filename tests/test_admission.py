@@ -0,0 +1,128 @@
+"""요청 수락 제어 (클라이언트별 토큰 버킷, 과부하 시 DEGRADED, 429, Gemini를 안 부른 요청의 토큰 반환)"""
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.config import settings
+from app.services.admission import DEGRADED, FULL, REJECT, AdmissionController
+from app.services.llm_gateway import LLMGateway, track_llm_calls
+
+
+class FakeGateway:
+    def __init__(self):
+        self.depth = 0
+        self.failures = (0.0, 0)
+
+    def queue_depth(self):
+        return self.depth
+
+    def failure_ratio(self, window):
+        return self.failures
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_RATE", 0.0)
+    monkeypatch.setattr(settings, "ADMISSION_BURST", 2)
+    monkeypatch.setattr(settings, "ADMISSION_HARD_RATE", 0.0)
+    monkeypatch.setattr(settings, "ADMISSION_HARD_BURST", 4)
+
+
+@pytest.fixture
+def gateway():
+    return FakeGateway()
+
+
+@pytest.fixture
+def admission(limits, gateway):
+    return AdmissionController(gateway)
+
+
+def test_llm_bucket_then_hard_bucket(admission):
+    decisions = [admission.admit("a") for _ in range(5)]
+    assert decisions == [FULL, FULL, DEGRADED, DEGRADED, REJECT]
+    # 다른 클라이언트는 따로 셈
+    assert admission.admit("b") == FULL
+    assert admission.stats()["decisions"] == {FULL: 3, DEGRADED: 2, REJECT: 1}
+
+
+def test_overload_degrades_everyone(admission, gateway, monkeypatch):
+    monkeypatch.setattr(settings, "OVERLOAD_QUEUE_DEPTH", 3)
+    gateway.depth = 3
+    assert admission.admit("a") == DEGRADED
+    gateway.depth = 0
+    gateway.failures = (0.6, 20)
+    assert admission.admit("a") == DEGRADED
+    # 호출 수가 적으면 실패율만으로 과부하로 보지 않음
+    gateway.failures = (1.0, 2)
+    assert admission.admit("a") == FULL
+
+
+def test_settle_refunds_full_requests_without_gemini_call(admission, monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_HARD_BURST", 10)
+    # 캐시/로컬 처리로 끝난 요청은 LLM 버킷(2개)을 쓰지 않음
+    for _ in range(5):
+        assert admission.admit("a") == FULL
+        admission.settle("a", FULL, 0)
+    assert admission.stats()["llm_refunds"] == 5
+
+    # Gemini를 부른 요청과 DEGRADED 요청은 돌려주지 않음
+    for _ in range(2):
+        assert admission.admit("a") == FULL
+        admission.settle("a", FULL, 1)
+    assert admission.admit("a") == DEGRADED
+    admission.settle("a", DEGRADED, 0)
+    assert admission.admit("a") == DEGRADED
+    assert admission.stats()["llm_refunds"] == 5
+
+
+class EchoChatModel:
+    def invoke(self, prompt):
+        return prompt
+
+
+def test_track_llm_calls_sees_calls_from_worker_threads():
+    gateway = LLMGateway(max_concurrency=1, api_key="test")
+    gateway._chat_model = lambda model, temperature: EchoChatModel()
+    results = {}
+
+    def request(name, call_gemini):
+        calls = track_llm_calls()
+        if call_gemini:
+            # 검색 의도 분석처럼 컨텍스트를 넘겨 다른 실행기에서 호출
+            with ThreadPoolExecutor(1) as executor:
+                executor.submit(contextvars.copy_context().run, gateway.invoke, "m", 0.0, "q", "search").result()
+        results[name] = calls[0]
+
+    threads = [threading.Thread(target=contextvars.copy_context().run, args=(request, name, name == "llm"))
+               for name in ("llm", "cached")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert results == {"llm": 1, "cached": 0}
+
+
+def _request(host, forwarded=None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "method": "POST", "path": "/api/search", "headers": headers,
+                    "client": (host, 1234), "query_string": b""})
+
+
+def test_rejected_request_gets_429(admission, monkeypatch):
+    from app import main
+
+    monkeypatch.setattr(main, "admission", admission)
+    for _ in range(4):
+        assert main._admit(_request("10.0.0.1"))[0] == "10.0.0.1"
+    with pytest.raises(HTTPException) as error:
+        main._admit(_request("10.0.0.1"))
+    assert error.value.status_code == 429
+    assert error.value.headers == {"Retry-After": "1"}
+    # 신뢰하지 않는 연결의 X-Forwarded-For로는 다른 클라이언트가 될 수 없음
+    with pytest.raises(HTTPException):
+        main._admit(_request("10.0.0.1", forwarded="203.0.113.9"))
@@ -0,0 +1,50 @@
+"""한국어 금액 파서 (숫자/한글 숫자/단위 혼합, 금액 범위)"""
+import pytest
+
+from app.services.amount_parser import iter_amounts, parse_amount_range, parse_korean_amount
+
+
+@pytest.mark.parametrize("text, amount", [
+    ("5천원 보내줘", 5000),
+    ("1.5만", 15000),
+    ("십만 오천원", 105000),
+    ("3백만원", 3000000),
+    ("10만5천원", 105000),
+    ("10,000원", 10000),
+    ("5 만원", 50000),
+    ("이억 삼천만원", 230000000),
+    ("홍길동 3000", 3000),
+])
+def test_parses_mixed_amounts(text, amount):
+    assert parse_korean_amount(text) == amount
+
+
+@pytest.mark.parametrize("text", [
+    "이체 내역",            # 한글 숫자처럼 보이는 단어
+    "백화점 결제",
+    "오늘 결제",
+    "8월 15일 거래",        # 날짜
+    "3개월 내역",
+    "1.5",                  # 단위 없는 소수는 원 단위 금액이 아님
+    "1.5원",
+    "이자율 3.5%",
+])
+def test_rejects_non_amounts(text):
+    assert parse_korean_amount(text) is None
+
+
+def test_iter_amounts_reports_spans():
+    text = "3만원~5만원"
+    assert list(iter_amounts(text)) == [(0, 3, 30000), (4, 7, 50000)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("10만원 이상", (100000, None)),
+    ("5만원 넘는", (50001, None)),
+    ("5만원 미만", (None, 49999)),
+    ("3만원~5만원", (30000, 50000)),
+    ("5만원에서 3만원", (30000, 50000)),
+    ("홍길동 5만원 송금", None),
+])
+def test_parse_amount_range(text, expected):
+    assert parse_amount_range(text) == expected
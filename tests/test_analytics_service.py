@@ -0,0 +1,52 @@
+"""집계 서비스 (group-by 결과, 레포지토리 세대/계보 추적)"""
+from app.repositories.transaction_repo import TransactionRepository
+from app.services.analytics_service import AnalyticsService
+
+
+def _category_totals(summary):
+    return {group["label"]: (group["count"], group["total"]) for group in summary["groups"]}
+
+
+def test_summarize_groups_expenses(holder):
+    analytics = AnalyticsService(holder)
+    summary = analytics.summarize("category")
+    assert _category_totals(summary) == {
+        "송금": (2, 170000), "쇼핑": (1, 89000), "마트": (1, 32000), "카페": (2, 10300),
+    }
+    assert summary["total_count"] == 6
+
+    months = analytics.summarize("month", flow="income")
+    assert [(group["label"], group["total"]) for group in months["groups"]] == [("2025-08", 2500000)]
+
+    july = analytics.summarize("category", date_from="2025-07-01", date_to="2025-07-31")
+    assert july["total_count"] == 3
+
+
+def test_analytics_extends_columns_for_next_generation(holder, make_row):
+    analytics = AnalyticsService(holder)
+    before = _category_totals(analytics.summarize("category"))
+    columns = analytics._columns
+
+    old = holder.repo
+    holder.repo = old.appended([make_row(8, "2025-08-25", amount=-7000, merchant="스타벅스 판교점", category="카페")])
+    after = _category_totals(analytics.summarize("category"))
+
+    # 같은 계보는 새 행만 이어 붙임
+    assert analytics._columns is columns
+    assert after["카페"] == (before["카페"][0] + 1, before["카페"][1] + 7000)
+
+    # 앞 세대를 잡은 요청은 더 긴 컬럼의 앞부분만 사용
+    holder.repo = old
+    assert _category_totals(analytics.summarize("category")) == before
+
+
+def test_analytics_rebuilds_for_new_lineage(holder, make_row):
+    analytics = AnalyticsService(holder)
+    analytics.summarize("category")
+    columns = analytics._columns
+
+    holder.repo = TransactionRepository([make_row(1, "2025-09-01", amount=-1000, merchant="GS25", category="편의점")])
+    summary = analytics.summarize("category")
+
+    assert analytics._columns is not columns
+    assert _category_totals(summary) == {"편의점": (1, 1000)}
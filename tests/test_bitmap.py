@@ -0,0 +1,59 @@
+"""RoaringBitmap 연산 (배열/비트맵 컨테이너를 set과 비교)"""
+import random
+
+import pytest
+
+from app.repositories.bitmap import ARRAY_LIMIT, RoaringBitmap
+
+
+def _random_values(seed: int, count: int, upper: int):
+    rng = random.Random(seed)
+    return {rng.randrange(upper) for _ in range(count)}
+
+
+@pytest.mark.parametrize("count", [10, ARRAY_LIMIT + 500])
+def test_matches_set_semantics(count):
+    # 컨테이너 여러 개 (상위 16비트가 다른 값 포함), count가 크면 비트맵 컨테이너로 변환됨
+    left_values = _random_values(1, count, 70000)
+    right_values = _random_values(2, count, 70000)
+    left, right = RoaringBitmap(left_values), RoaringBitmap(right_values)
+
+    assert list(left) == sorted(left_values)
+    assert len(left) == len(left_values)
+    assert list(left & right) == sorted(left_values & right_values)
+    assert list(left | right) == sorted(left_values | right_values)
+    assert left.and_cardinality(right) == len(left_values & right_values)
+    assert all(value in left for value in list(left_values)[:50])
+    assert 70001 not in left
+
+
+def test_dense_container_converts_to_bitmap_and_back_on_discard():
+    bitmap = RoaringBitmap(range(ARRAY_LIMIT + 1))
+    assert isinstance(bitmap._containers[0], int)
+
+    bitmap.discard(0)
+    bitmap.discard(1)
+    assert isinstance(bitmap._containers[0], list)
+    assert len(bitmap) == ARRAY_LIMIT - 1
+    assert 0 not in bitmap and 2 in bitmap
+
+
+def test_copy_is_independent():
+    original = RoaringBitmap([1, 2, 3])
+    copied = original.copy()
+    copied.add(4)
+    copied.discard(1)
+    assert list(original) == [1, 2, 3]
+    assert list(copied) == [2, 3, 4]
+
+
+def test_empty_results_and_union_all():
+    assert not (RoaringBitmap([1]) & RoaringBitmap([2]))
+    assert len(RoaringBitmap()) == 0
+    assert list(RoaringBitmap.union_all([RoaringBitmap([5]), RoaringBitmap([1, 70000]), RoaringBitmap()])) == [1, 5, 70000]
+
+
+def test_union_all_merges_dense_and_sparse_containers():
+    parts = [_random_values(seed, ARRAY_LIMIT // 2, 140000) for seed in range(5)]
+    union = RoaringBitmap.union_all(RoaringBitmap(values) for values in parts)
+    assert list(union) == sorted(set().union(*parts))
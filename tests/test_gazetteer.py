@@ -0,0 +1,43 @@
+"""사용자 거래내역 기반 이름 사전 (경계/조사 처리, 레포지토리 세대/계보 추적)"""
+from app.repositories.transaction_repo import TransactionRepository
+from app.services.gazetteer import CONTACT, MERCHANT, Gazetteer
+from app.services.nlp_service import GeminiNLPService
+
+
+def test_matches_on_word_boundaries(holder):
+    gazetteer = Gazetteer(holder)
+    assert gazetteer.extract("홍길동한테 보내줘") == {CONTACT: "홍길동"}
+    assert gazetteer.extract("쿠팡결제 내역") == {MERCHANT: "쿠팡"}
+    # 이름 뒤에 조사가 아닌 한글이 붙으면 다른 단어
+    assert gazetteer.extract("홍길동이네 가게") == {}
+    assert gazetteer.extract("스타벅스 강남점 홍길동") == {MERCHANT: "스타벅스 강남점", CONTACT: "홍길동"}
+
+
+def test_gazetteer_follows_generations_and_lineages(holder, make_row):
+    gazetteer = Gazetteer(holder)
+    assert gazetteer.names(CONTACT) == ["김철수", "홍길동"]
+    assert gazetteer.extract("홍길동에게 5만원") == {CONTACT: "홍길동"}
+    assert gazetteer.extract("박영희에게 5만원") == {}
+
+    holder.repo = holder.repo.appended([
+        make_row(8, "2025-08-25", amount=-50000, type="송금", category="송금",
+                 recipient="박영희", bank="우리은행", account="1002-123-456789"),
+    ])
+    assert gazetteer.names(CONTACT) == ["김철수", "박영희", "홍길동"]
+    assert gazetteer.extract("박영희에게 5만원") == {CONTACT: "박영희"}
+
+    holder.repo = TransactionRepository([make_row(1, "2025-09-01", merchant="올리브영", category="쇼핑")])
+    assert gazetteer.names(CONTACT) == []
+    assert gazetteer.names(MERCHANT) == ["올리브영"]
+    assert gazetteer.extract("홍길동에게 5만원") == {}
+
+
+def test_person_fallback_skips_relationship_and_common_nouns(holder):
+    nlp = GeminiNLPService(Gazetteer(holder))
+    assert nlp._extract_transfer_entities("엄마 용돈 보내기") == {}
+    assert nlp._extract_transfer_entities("엄마한테 5만원 보내줘") == {"amount": 50000}
+    # 사전에 없는 이름은 호칭/금액을 건너뛰고 패턴으로 찾음
+    assert nlp._extract_transfer_entities("친구 박영희에게 3만원") == {"person": "박영희", "amount": 30000}
+    assert nlp._extract_transfer_entities("5만원 박영희한테 보내") == {"person": "박영희", "amount": 50000}
+    assert nlp._extract_transfer_entities("홍길동 5만원") == {"person": "홍길동", "amount": 50000}
+    assert nlp._extract_transfer_entities("스타벅스 송금") == {}
@@ -0,0 +1,69 @@
+"""로컬 의도 분류기 (문자 n-gram TF-IDF, temperature 보정, 저장/불러오기, 배포 모델)"""
+import math
+
+import pytest
+
+from app.services.intent_classifier import (
+    IntentClassifier, load_training_samples, normalize_query,
+)
+
+TOY_SAMPLES = [
+    ("홍길동에게 5만원 보내줘", "transfer"), ("김철수한테 송금", "transfer"), ("엄마에게 10만원 이체", "transfer"),
+    ("스타벅스 결제내역", "search"), ("지난달 쿠팡 내역", "search"), ("이마트 거래 조회", "search"),
+    ("환율 계산기", "menu"), ("카드 신청", "menu"), ("대출 상담", "menu"),
+]
+
+
+@pytest.fixture(scope="module")
+def shipped():
+    return IntentClassifier.load()
+
+
+def test_normalize_query_collapses_whitespace():
+    assert normalize_query("  GS25   결제내역 ") == "gs25 결제내역"
+
+
+def test_toy_model_predicts_calibrated_probabilities():
+    model = IntentClassifier.train(TOY_SAMPLES)
+    assert model.labels == ["menu", "search", "transfer"]
+
+    probabilities = model.predict_proba("박영희에게 3만원 보내")
+    assert math.isclose(sum(probabilities.values()), 1.0)
+    assert model.predict("박영희에게 3만원 보내")[0] == "transfer"
+    assert model.predict("스타벅스 내역")[0] == "search"
+    # 학습에 없는 문자만 있으면 모든 클래스 유사도가 0
+    assert set(model.scores("xyz").values()) == {0.0}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    model = IntentClassifier.train(TOY_SAMPLES)
+    path = tmp_path / "model.json"
+    model.save(str(path))
+    loaded = IntentClassifier.load(str(path))
+
+    assert loaded.temperature == model.temperature
+    assert loaded.ngram_range == model.ngram_range
+    for text, _ in TOY_SAMPLES:
+        assert loaded.predict_proba(text) == pytest.approx(model.predict_proba(text))
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("홍길동에게 5만원 보내줘", "transfer"),
+    ("스타벅스 결제내역", "search"),
+    ("환율 계산", "menu"),
+    ("월별 지출 통계", "analytics"),
+    ("카드 신청", "menu"),
+])
+def test_shipped_model_is_confident_on_typical_queries(shipped, text, intent):
+    label, confidence = shipped.predict(text)
+    assert label == intent
+    assert confidence >= 0.9
+
+
+def test_shipped_model_matches_training_data(shipped):
+    # 라벨 파일이나 메뉴 키워드를 바꾸고 재학습하지 않으면 실패
+    retrained = IntentClassifier.train(load_training_samples())
+    assert retrained.labels == shipped.labels
+    assert retrained.temperature == pytest.approx(shipped.temperature)
+    for text, _ in load_training_samples()[::10]:
+        assert retrained.predict_proba(text) == pytest.approx(shipped.predict_proba(text))
@@ -0,0 +1,169 @@
+"""LLM 게이트웨이 (동시 호출 제한, 우선순위 대기열, 마감 시각)"""
+import threading
+import time
+
+import pytest
+
+from app.services.llm_gateway import LLMGateway, LLMQueueTimeout, LLMRequestTimeout
+
+
+class FakeChatModel:
+    """prompt가 "block"이면 release될 때까지 기다린 뒤 응답"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls = []
+
+    def invoke(self, prompt):
+        self.calls.append(prompt)
+        if prompt == "block":
+            self.started.set()
+            self.release.wait(5)
+        elif prompt == "fail":
+            raise RuntimeError("gemini error")
+        return f"answer:{prompt}"
+
+    def stream(self, prompt):
+        self.calls.append(prompt)
+        yield "a"
+        if prompt == "block":
+            self.started.set()
+            self.release.wait(5)
+        yield "b"
+        self.stream_closed = True
+
+
+@pytest.fixture
+def chat_model():
+    return FakeChatModel()
+
+
+@pytest.fixture
+def gateway(chat_model):
+    gateway = LLMGateway(max_concurrency=1, api_key="test")
+    gateway._chat_model = lambda model, temperature: chat_model
+    return gateway
+
+
+def _call_in_thread(gateway, prompt, priority, results, deadline=None):
+    def run():
+        try:
+            results.append(gateway.invoke("m", 0.0, prompt, priority, deadline))
+        except Exception as e:
+            results.append(e)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def _wait_until(condition, timeout=2.0):
+    limit = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < limit
+        time.sleep(0.005)
+
+
+def test_higher_priority_waiter_gets_slot_first(gateway, chat_model):
+    results = []
+    holder = _call_in_thread(gateway, "block", "explanation", results)
+    assert chat_model.started.wait(2)
+
+    prefetch = _call_in_thread(gateway, "prefetch-call", "prefetch", results)
+    _wait_until(lambda: gateway.queue_depth() == 1)
+    search = _call_in_thread(gateway, "search-call", "search", results)
+    _wait_until(lambda: gateway.queue_depth() == 2)
+
+    chat_model.release.set()
+    for thread in (holder, prefetch, search):
+        thread.join(5)
+
+    # 나중에 들어온 검색이 먼저 기다리던 prefetch보다 먼저 실행됨
+    assert chat_model.calls == ["block", "search-call", "prefetch-call"]
+    assert gateway.metrics()["available_slots"] == 1
+
+
+def test_queue_timeout_respects_deadline(gateway, chat_model):
+    results = []
+    holder = _call_in_thread(gateway, "block", "explanation", results)
+    assert chat_model.started.wait(2)
+
+    started = time.monotonic()
+    with pytest.raises(LLMQueueTimeout):
+        gateway.invoke("m", 0.0, "search-call", "search", deadline=time.monotonic() + 0.05)
+    assert time.monotonic() - started < 0.5
+
+    chat_model.release.set()
+    holder.join(5)
+    metrics = gateway.metrics()
+    assert metrics["classes"]["search"]["timeouts"] == 1
+    assert metrics["queue_depth"] == 0
+    assert metrics["available_slots"] == 1
+    assert gateway.failure_ratio()[0] == 0.5
+
+
+def test_call_timeout_keeps_slot_until_call_finishes(gateway, chat_model):
+    started = time.monotonic()
+    with pytest.raises(LLMRequestTimeout):
+        gateway.invoke("m", 0.0, "block", "search", deadline=time.monotonic() + 0.1)
+    assert time.monotonic() - started < 1.0
+
+    # 기다림만 끊겼고 실제 호출은 아직 실행 중이므로 슬롯을 계속 잡고 있음
+    metrics = gateway.metrics()
+    assert metrics["available_slots"] == 0
+    assert metrics["classes"]["search"]["call_timeouts"] == 1
+    assert metrics["classes"]["search"]["abandoned"] == 1
+    assert metrics["classes"]["search"]["in_flight"] == 1
+    with pytest.raises(LLMQueueTimeout):
+        gateway.invoke("m", 0.0, "next", "search", deadline=time.monotonic() + 0.05)
+
+    chat_model.release.set()
+    _wait_until(lambda: gateway.metrics()["available_slots"] == 1)
+    assert gateway.metrics()["classes"]["search"]["abandoned"] == 0
+    assert gateway.invoke("m", 0.0, "next", "search") == "answer:next"
+
+
+def test_stream_respects_deadline(gateway, chat_model):
+    chunks = []
+    with pytest.raises(LLMRequestTimeout):
+        for chunk in gateway.stream("m", 0.0, "block", "explanation", deadline=time.monotonic() + 0.1):
+            chunks.append(chunk)
+    assert chunks == ["a"]
+    assert gateway.metrics()["classes"]["explanation"]["call_timeouts"] == 1
+    assert gateway.metrics()["available_slots"] == 0
+
+    # 스트림은 다음 조각에서 닫히고 그때 슬롯을 반납
+    chat_model.release.set()
+    _wait_until(lambda: gateway.metrics()["available_slots"] == 1)
+    assert not hasattr(chat_model, "stream_closed")
+
+
+def test_stream_stopped_by_caller_releases_slot_when_closed(gateway, chat_model):
+    stream = gateway.stream("m", 0.0, "block", "explanation")
+    assert next(stream) == "a"
+    stream.close()
+    assert gateway.metrics()["available_slots"] == 0
+
+    chat_model.release.set()
+    _wait_until(lambda: gateway.metrics()["available_slots"] == 1)
+    assert gateway.metrics()["classes"]["explanation"]["abandoned"] == 0
+
+
+def test_worker_threads_are_reused(gateway):
+    for index in range(5):
+        assert gateway.invoke("m", 0.0, f"call-{index}", "search") == f"answer:call-{index}"
+    assert len(gateway._workers) == gateway.max_concurrency
+
+
+def test_errors_are_counted_and_slot_released(gateway):
+    with pytest.raises(RuntimeError):
+        gateway.invoke("m", 0.0, "fail", "explanation")
+    assert gateway.metrics()["classes"]["explanation"]["errors"] == 1
+    assert gateway.metrics()["available_slots"] == 1
+    assert list(gateway.stream("m", 0.0, "x", "explanation")) == ["a", "b"]
+    assert gateway.metrics()["available_slots"] == 1
+
+
+def test_unknown_priority_class_is_rejected(gateway):
+    with pytest.raises(ValueError):
+        gateway.client(0.0, "batch")
@@ -0,0 +1,29 @@
+"""메뉴 레지스트리 키워드 매칭"""
+import pytest
+
+from app.services.menu_registry import menu_registry
+
+
+@pytest.mark.parametrize("text,menu_id", [
+    ("환율 알림설정", "exchangeAlerts"),
+    ("환율계산기", "exchangeCalculator"),
+    ("체크카드 신청", "cardApplication"),
+    ("대출서류 조회", "loanDocuments"),
+    ("이자 계산", "loanCalculator"),
+    # 별칭은 다른 메뉴 키워드가 없을 때만 사용
+    ("계산", "exchangeCalculator"),
+    ("알림", "exchangeAlerts"),
+    ("대출이자를 계산", "loan"),
+    ("카드 알림", "cardApplication"),
+    ("스타벅스 결제내역", None),
+])
+def test_match(text, menu_id):
+    menu = menu_registry.match(text)
+    assert (menu.id if menu else None) == menu_id
+
+
+def test_routes_and_prompt_cover_every_menu():
+    assert set(menu_registry.routes) == {menu.id for menu in menu_registry.menus}
+    for menu in menu_registry.menus:
+        assert menu_registry.get(menu.id) is menu
+        assert f'"{menu.id}"' in menu_registry.prompt_menu_types
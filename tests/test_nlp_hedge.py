@@ -0,0 +1,98 @@
+"""Gemini 의도 분석 hedge (규칙 기반 결과로 먼저 응답, 지연된 Gemini 결과는 의도 캐시로)"""
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.services.nlp_service import GeminiNLPService
+
+QUERY = "스타벅스 송금"
+
+
+class ScriptedGemini:
+    """delay초 뒤(또는 release될 때까지) 응답하는 Gemini 클라이언트, error가 있으면 에러"""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.release = threading.Event()
+        self.deadlines = []
+
+    def invoke(self, prompt, priority=None, deadline=None):
+        self.deadlines.append(deadline)
+        if self.delay:
+            self.release.wait(self.delay)
+        if self.error:
+            raise self.error
+        content = json.dumps({"intent": "search", "confidence": 0.95, "reasoning": "gemini",
+                              "entities": {"merchant": "스타벅스"}}, ensure_ascii=False)
+        return SimpleNamespace(content=content)
+
+
+@pytest.fixture
+def nlp(monkeypatch):
+    # 로컬 분류기로 끝나지 않고 항상 Gemini와 hedge 하도록
+    monkeypatch.setattr(settings, "NLP_CONFIDENCE_THRESHOLD", 1.01)
+    monkeypatch.setattr(settings, "SEARCH_HEDGE_SECONDS", 0.1)
+    service = GeminiNLPService()
+    yield service
+    service.close()
+
+
+def _wait_for_cache(nlp, timeout=2.0):
+    limit = time.monotonic() + timeout
+    while nlp.intent_cache.get(QUERY) is None:
+        assert time.monotonic() < limit
+        time.sleep(0.01)
+
+
+def test_fast_gemini_answer_is_used_and_cached(nlp):
+    nlp.llm = ScriptedGemini()
+    result = nlp.parse_query(QUERY)
+    assert result["used_model"] == "gemini-pro"
+    assert not result.get("hedged")
+    assert nlp.intent_cache.get(QUERY)["used_model"] == "gemini-pro"
+
+
+def test_slow_gemini_is_hedged_and_late_answer_fills_cache(nlp):
+    gemini = nlp.llm = ScriptedGemini(delay=5)
+    started = time.monotonic()
+    result = nlp.parse_query(QUERY)
+    assert time.monotonic() - started < 1.0
+    assert result["hedged"] and result["used_model"] == "fallback"
+    assert nlp.intent_cache.get(QUERY) is None
+
+    gemini.release.set()
+    _wait_for_cache(nlp)
+    assert nlp.parse_query(QUERY)["used_model"] == "gemini-pro"
+
+
+def test_hedge_never_waits_past_deadline(nlp, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_HEDGE_SECONDS", 5.0)
+    gemini = nlp.llm = ScriptedGemini(delay=5)
+    deadline = time.monotonic() + 0.1
+    started = time.monotonic()
+    result = nlp.parse_query(QUERY, deadline=deadline)
+    assert time.monotonic() - started < 1.0
+    assert result["hedged"]
+    # Gemini 호출도 같은 마감 시각을 받음
+    assert gemini.deadlines == [deadline]
+    gemini.release.set()
+
+
+def test_gemini_error_falls_back_without_caching(nlp):
+    nlp.llm = ScriptedGemini(error=RuntimeError("gemini error"))
+    result = nlp.parse_query(QUERY)
+    assert result["used_model"] == "fallback"
+    assert not result.get("hedged")
+    assert nlp.intent_cache.get(QUERY) is None
+
+
+def test_no_gemini_when_llm_not_allowed(nlp):
+    gemini = nlp.llm = ScriptedGemini()
+    result = nlp.parse_query(QUERY, allow_llm=False)
+    assert result["used_model"] == "fallback"
+    assert gemini.deadlines == []
@@ -0,0 +1,57 @@
+"""생성 중인 JSON 객체 읽기 (조각 경계와 상관없이 같은 값/이벤트)"""
+import json
+
+import pytest
+
+from app.services.partial_json import PartialJSONReader
+
+DOCUMENT = {
+    "title": "스타벅스 \"리워드\" 카드\n추천",
+    "summary": "카페 지출이 월 ₩8만원 이상이면 유리합니다 \\ 참고",
+    "benefits": ["카페 50% 할인", {"name": "적립", "rate": 0.05}, [1, 2]],
+    "details": {"annual_fee": 15000, "brand": "VISA, Master"},
+    "score": 4.5,
+    "recommended": True,
+    "note": None,
+}
+
+
+def _read(text: str, chunk_size: int):
+    reader = PartialJSONReader()
+    events = []
+    for start in range(0, len(text), chunk_size):
+        events.extend(reader.feed(text[start:start + chunk_size]))
+    return reader, events
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+def test_events_do_not_depend_on_chunk_boundaries(chunk_size):
+    # \uXXXX 이스케이프가 조각 사이에서 잘려도 같은 결과
+    text = "```json\n" + json.dumps(DOCUMENT, ensure_ascii=True, indent=2) + "\n```"
+    reader, events = _read(text, chunk_size)
+
+    assert reader.done
+    assert reader.value == DOCUMENT
+
+    deltas = {}
+    for kind, field, value in events:
+        if kind == "delta":
+            deltas[field] = deltas.get(field, "") + value
+    assert deltas == {"title": DOCUMENT["title"], "summary": DOCUMENT["summary"]}
+
+    items = [(field, value) for kind, field, value in events if kind == "item"]
+    assert items == [("benefits", "카페 50% 할인"), ("benefits", {"name": "적립", "rate": 0.05}),
+                     ("benefits", [1, 2]), ("details", {"annual_fee": 15000}),
+                     ("details", {"brand": "VISA, Master"})]
+
+    done = {field: value for kind, field, value in events if kind == "done"}
+    assert done == DOCUMENT
+
+
+def test_string_field_streams_before_it_is_complete():
+    reader = PartialJSONReader()
+    assert reader.feed('{"title": "신한') == [("delta", "title", "신한")]
+    assert reader.feed('카드", ') == [("delta", "title", "카드"), ("done", "title", "신한카드")]
+    assert not reader.done
+    assert reader.feed('"n": 1}') == [("done", "n", 1)]
+    assert reader.done
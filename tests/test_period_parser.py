@@ -0,0 +1,53 @@
+"""한국어 기간 표현 파서"""
+from datetime import date
+
+import pytest
+
+from app.services.period_parser import has_period_expression, parse_period
+
+TODAY = date(2025, 10, 15)
+
+
+@pytest.mark.parametrize("text,start,end,period_type", [
+    ("이번달 출금내역", "2025-10-01", "2025-10-15", "month"),
+    ("이번 달 카페", "2025-10-01", "2025-10-15", "month"),
+    ("지난달 송금", "2025-09-01", "2025-09-30", "month"),
+    ("올해 쇼핑", "2025-01-01", "2025-10-15", "custom"),
+    ("작년 지출", "2024-01-01", "2024-12-31", "custom"),
+    ("1월 결제", "2025-01-01", "2025-01-31", "month"),
+    ("11월 결제", "2024-11-01", "2024-11-30", "month"),
+    ("12월 결제", "2024-12-01", "2024-12-31", "month"),
+    ("10월 결제", "2025-10-01", "2025-10-31", "month"),
+    ("2023년 2월", "2023-02-01", "2023-02-28", "month"),
+    ("작년 12월 송금", "2024-12-01", "2024-12-31", "month"),
+    ("8월 15일 거래", "2025-08-15", "2025-08-15", "custom"),
+    ("8월 1일부터 15일까지", "2025-08-01", "2025-08-15", "custom"),
+    ("12월~1월 지출", "2024-12-01", "2025-01-31", "custom"),
+    ("2025-07-01 ~ 2025-08-15", "2025-07-01", "2025-08-15", "custom"),
+    ("최근 3개월", "2025-07-15", "2025-10-15", "recent"),
+    ("지난 두달 카페", "2025-08-15", "2025-10-15", "recent"),
+    ("최근 일주일", "2025-10-08", "2025-10-15", "recent"),
+    ("어제 결제", "2025-10-14", "2025-10-14", "custom"),
+    ("이번주 지출", "2025-10-13", "2025-10-15", "week"),
+])
+def test_parse_period(text, start, end, period_type):
+    period = parse_period(text, TODAY)
+    assert (period["start_date"], period["end_date"], period["period_type"]) == (start, end, period_type)
+
+
+def test_month_description_and_invalid_dates():
+    assert parse_period("11월", TODAY)["description"] == "2024년 11월"
+    assert parse_period("13월", TODAY) is None
+    assert parse_period("2월 30일", TODAY) is None
+    assert parse_period("스타벅스 결제내역", TODAY) is None
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("상반기 지출", True),     # 규칙으로 바꿀 수 없지만 기간 표현 (Gemini로 넘김)
+    ("8월 출금", True),
+    ("5만원 이상 송금", False),
+    ("3일 이상 연체", False),
+    ("홍길동 송금", False),
+])
+def test_has_period_expression(text, expected):
+    assert has_period_expression(text) is expected
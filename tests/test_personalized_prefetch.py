@@ -0,0 +1,34 @@
+"""맞춤 설명 선행 생성 (이미 캐시된 설명은 다시 만들지 않음)"""
+import pytest
+
+from app.services.personalized_service import PersonalizedService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = PersonalizedService()
+    calls = []
+
+    def generate(product_type, product_id, user_info, priority="explanation"):
+        calls.append((product_type, product_id, priority))
+        return {"explanation": f"{product_id} 설명"}
+
+    monkeypatch.setattr(service, "_generate_ai_explanation", generate)
+    service.calls = calls
+    return service
+
+
+def test_prefetch_generates_and_caches(service):
+    service._prefetch_explanation("default_user", "card", "card_1")
+    assert service.calls == [("card", "card_1", "prefetch")]
+    assert service.explanation_cache.get(("default_user", "card", "card_1")) == {"explanation": "card_1 설명"}
+
+
+def test_queued_prefetch_skips_already_cached_key(service):
+    # 대기열에 있는 동안 사용자 요청이 먼저 설명을 만들어 캐시에 넣은 경우
+    cached = {"explanation": "사용자 요청으로 만든 설명"}
+    service.explanation_cache.set(("default_user", "card", "card_1"), cached)
+
+    service._prefetch_explanation("default_user", "card", "card_1")
+    assert service.calls == []
+    assert service.explanation_cache.get(("default_user", "card", "card_1")) is cached
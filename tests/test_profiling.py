@@ -0,0 +1,88 @@
+"""요청별 프로파일링 미들웨어 (헤더 토큰, 1-in-N 샘플링, 스레드 풀 처리 포함)"""
+import asyncio
+import os
+import pstats
+import time
+
+import pytest
+from starlette.concurrency import run_in_threadpool
+
+from app.profiling import ProfilingMiddleware, follow_profile
+
+
+def busy_search_work(seconds=0.1):
+    """샘플러가 잡을 수 있도록 CPU를 쓰는 처리"""
+    limit = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < limit:
+        total += sum(range(100))
+    return total
+
+
+async def endpoint(scope, receive, send):
+    await run_in_threadpool(follow_profile(busy_search_work))
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _call(middleware, path="/api/search", headers=()):
+    """요청 하나를 보내고 응답 헤더 반환"""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": path, "headers": [(name.encode(), value.encode()) for name, value in headers]}
+    asyncio.run(middleware(scope, receive, send))
+    return dict(sent[0]["headers"])
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / "profiles")
+
+
+def _files(directory):
+    return sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+
+def test_header_token_profiles_with_sampler(directory):
+    middleware = ProfilingMiddleware(endpoint, token="secret", directory=directory)
+    headers = _call(middleware, headers=[("x-profile", "secret")])
+
+    profile_id = headers[b"x-profile-id"].decode()
+    assert _files(directory) == [f"{profile_id}.collapsed"]
+    with open(os.path.join(directory, f"{profile_id}.collapsed"), encoding="utf-8") as f:
+        stacks = f.read()
+    # 스레드 풀에서 실행한 처리도 스택에 포함
+    assert "busy_search_work" in stacks
+
+
+def test_cprofile_mode_writes_pstats(directory):
+    middleware = ProfilingMiddleware(endpoint, token="secret", directory=directory)
+    headers = _call(middleware, headers=[("x-profile", "secret"), ("x-profile-mode", "cprofile")])
+
+    path = os.path.join(directory, f"{headers[b'x-profile-id'].decode()}.prof")
+    functions = {name for _, _, name in pstats.Stats(path).stats}
+    assert "busy_search_work" in functions
+
+
+def test_wrong_token_and_other_paths_are_not_profiled(directory):
+    middleware = ProfilingMiddleware(endpoint, token="secret", directory=directory)
+    assert b"x-profile-id" not in _call(middleware, headers=[("x-profile", "guess")])
+    assert b"x-profile-id" not in _call(middleware, path="/api/search/suggest", headers=[("x-profile", "secret")])
+    assert _files(directory) == []
+
+
+def test_sample_every_n_requests(directory):
+    middleware = ProfilingMiddleware(endpoint, sample_every=2, directory=directory)
+    profiled = [b"x-profile-id" in _call(middleware) for _ in range(4)]
+    assert profiled == [False, True, False, True]
+    assert len(_files(directory)) == 2
+
+
+def test_follow_profile_is_noop_outside_profiled_request():
+    assert follow_profile(busy_search_work) is busy_search_work
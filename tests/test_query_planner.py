@@ -0,0 +1,139 @@
+"""다중 조건 쿼리 플래너 (인덱스 경로 결과를 전체 순회 필터와 비교)"""
+import itertools
+import random
+
+import pytest
+
+from app.repositories.transaction_repo import TransactionRepository
+
+MERCHANTS = ["스타벅스 강남점", "스타벅스 역삼점", "이마트 성수점", "쿠팡", "GS25"]
+CONTACTS = [("홍길동", "신한은행", "110-111-111111"), ("김철수", "국민은행", "123-45-678901")]
+
+
+@pytest.fixture(scope="module")
+def rows():
+    rng = random.Random(7)
+    rows = []
+    for rowid in range(1, 401):
+        date = f"2025-{rng.randint(1, 8):02d}-{rng.randint(1, 28):02d}"
+        time = f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+        if rng.random() < 0.25:
+            name, bank, account = rng.choice(CONTACTS)
+            rows.append({"id": rowid, "date": date, "time": time, "merchant": None, "category": "송금",
+                         "amount": -rng.randint(1, 50) * 10000, "type": "송금", "balance": 0, "memo": None,
+                         "recipient_name": name, "recipient_account": account, "recipient_bank": bank})
+        else:
+            merchant = rng.choice(MERCHANTS)
+            rows.append({"id": rowid, "date": date, "time": time, "merchant": merchant,
+                         "category": "카페" if "스타벅스" in merchant else "쇼핑",
+                         "amount": -rng.randint(1, 2000) * 100, "type": "결제", "balance": 0, "memo": None,
+                         "recipient_name": None, "recipient_account": None, "recipient_bank": None})
+    return rows
+
+
+@pytest.fixture(scope="module")
+def repo(rows):
+    return TransactionRepository(rows)
+
+
+def _brute_force(repo, filters):
+    def matches(record):
+        if filters.get("merchant") and not any(
+                filters["merchant"].lower() in (name or "").lower() for name in (record.merchant, record.description)):
+            return False
+        if filters.get("recipient") and not (record.is_transfer and filters["recipient"] in record.description):
+            return False
+        if filters.get("date_from") and record.date < filters["date_from"]:
+            return False
+        if filters.get("date_to") and record.date > filters["date_to"]:
+            return False
+        if filters.get("type") and record.type != filters["type"]:
+            return False
+        if filters.get("category") and record.category != filters["category"]:
+            return False
+        if filters.get("bank") and record.bank != filters["bank"]:
+            return False
+        if filters.get("min_amount") is not None and abs(record.amount) < filters["min_amount"]:
+            return False
+        if filters.get("max_amount") is not None and abs(record.amount) > filters["max_amount"]:
+            return False
+        return True
+    return [record.id for record in repo.iter_recent() if matches(record)]
+
+
+FILTER_OPTIONS = [
+    {"merchant": "스타벅스"},
+    {"recipient": "홍길동"},
+    {"date_from": "2025-03-01", "date_to": "2025-05-31"},
+    {"type": "송금"},
+    {"category": "쇼핑"},
+    {"bank": "국민은행"},
+    {"min_amount": 50000},
+    {"max_amount": 20000},
+]
+
+
+@pytest.mark.parametrize("combination", [
+    dict(itertools.chain.from_iterable(option.items() for option in options))
+    for size in (1, 2, 3) for options in itertools.combinations(FILTER_OPTIONS, size)
+])
+def test_query_matches_full_scan(repo, combination):
+    expected = _brute_force(repo, combination)
+    result = repo.query(combination, 0, 10)
+
+    assert result["total_count"] == len(expected)
+    assert [record.id for record in result["transactions"]] == expected[:10]
+    assert repo.count(combination) == len(expected)
+
+
+def test_pagination_and_facets(repo):
+    filters = {"date_from": "2025-02-01", "date_to": "2025-07-31", "category": "카페"}
+    expected = _brute_force(repo, filters)
+    page = repo.query(filters, 5, 5, with_facets=True)
+
+    assert [record.id for record in page["transactions"]] == expected[5:10]
+    assert page["facets"]["category"] == {"카페": len(expected)}
+    assert sum(page["facets"]["type"].values()) == len(expected)
+
+
+def test_plan_starts_from_most_selective_index(repo):
+    plan = repo.planner.plan({"type": "결제", "bank": "신한은행", "min_amount": 1000})
+    assert plan[0].name == "bank"
+    assert plan[-1].fetch is None or plan[-1].estimate >= plan[0].estimate
+
+    explain = repo.query({"type": "결제", "bank": "신한은행"})["explain"]
+    assert explain["indexes_used"][0] == "bank"
+    assert explain["order"] == "top-k-heap"
+
+
+def test_no_filters_uses_ordered_scan(repo, rows):
+    result = repo.query({}, 0, 3)
+    assert result["explain"]["order"] == "ordered-scan"
+    assert result["total_count"] == len(rows)
+    assert [record.id for record in result["transactions"]] == [record.id for record in repo.iter_recent()][:3]
+
+
+@pytest.mark.parametrize("date_from, date_to", [
+    ("2025-03-01", "2025-05-31"),      # 온전한 달만
+    ("2025-02-15", "2025-06-10"),      # 처음/마지막 달이 걸침
+    ("2025-04-03", "2025-04-20"),      # 한 달 안
+    ("2025-07-20", "2025-08-05"),      # 이웃한 두 달
+    (None, "2025-02-10"),
+    ("2025-06-28", None),
+    ("2026-01-01", "2026-02-01"),      # 데이터 없음
+])
+def test_date_access_path_matches_date_filter(repo, date_from, date_to):
+    path = repo.date_access_path(date_from, date_to)
+    expected = {rowid for rowid in range(len(repo))
+                if (date_from or "") <= repo.row(rowid).date <= (date_to or "9999")}
+
+    assert set(path.fetch()) == expected
+    assert path.estimate == len(expected)
+
+
+def test_search_helpers_use_indexes(repo):
+    assert [t.id for t in repo.search_by_merchant("스타벅스")] == _brute_force(repo, {"merchant": "스타벅스"})
+    assert [t.id for t in repo.search_by_type("송금")] == _brute_force(repo, {"type": "송금"})
+    assert [t.id for t in repo.search_by_category("쇼핑")] == _brute_force(repo, {"category": "쇼핑"})
+    assert repo.search_by_type("입금") == []
+    assert repo.search_by_category("") == []
@@ -0,0 +1,144 @@
+"""검색 결과 캐시 (데이터 스냅샷이 바뀌거나 hedge/폴백 결과면 저장된 결과를 쓰지 않음)"""
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.services.search_service import SearchService
+
+
+@pytest.fixture
+def service():
+    service = SearchService()
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def counted(service, monkeypatch):
+    """의도별 처리를 건너뛰고 처리 횟수만 세는 서비스"""
+    calls = []
+
+    def process(query, allow_llm, deadline):
+        calls.append(query)
+        return {"success": True, "action_type": "search", "message": f"{len(calls)}번째 처리"}, "search", True
+
+    monkeypatch.setattr(service, "_process_query", process)
+    service.calls = calls
+    return service
+
+
+class SlowGemini:
+    """release 될 때까지 응답하지 않는 Gemini 클라이언트 (검색 의도 분석 결과 반환)"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def invoke(self, prompt, priority=None, deadline=None):
+        self.calls += 1
+        self.release.wait(5)
+        content = json.dumps({"intent": "search", "confidence": 0.95, "reasoning": "gemini",
+                              "entities": {"merchant": "스타벅스"}}, ensure_ascii=False)
+        return SimpleNamespace(content=content)
+
+
+class FailingGemini:
+    """항상 에러를 내는 Gemini 클라이언트"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt, priority=None, deadline=None):
+        self.calls += 1
+        raise RuntimeError("gemini error")
+
+
+def test_same_normalized_query_uses_cached_result(counted):
+    first = counted.process_query("스타벅스 결제내역", log_query=False)
+    second = counted.process_query("  스타벅스   결제내역 ", log_query=False)
+    assert second is first
+    assert len(counted.calls) == 1
+
+
+def test_new_generation_invalidates_cached_result(counted):
+    first = counted.process_query("스타벅스 결제내역", log_query=False)
+    snapshot = counted.transaction_repo.snapshot
+
+    # 캐시를 비우지 않고 참조만 교체해도 스냅샷 비교로 걸러짐
+    counted._transaction_repo = counted._transaction_repo.appended([{
+        "id": 9001, "date": "2025-08-30", "time": "10:00", "merchant": "스타벅스 판교점", "category": "카페",
+        "amount": -6000, "type": "결제", "balance": 0, "memo": None,
+        "recipient_name": None, "recipient_account": None, "recipient_bank": None,
+    }])
+    assert counted.transaction_repo.snapshot != snapshot
+
+    second = counted.process_query("스타벅스 결제내역", log_query=False)
+    assert second is not first
+    assert len(counted.calls) == 2
+    # 새 스냅샷으로 다시 저장된 결과는 재사용
+    assert counted.process_query("스타벅스 결제내역", log_query=False) is second
+
+
+def test_append_transactions_clears_cache(counted):
+    counted.process_query("스타벅스 결제내역", log_query=False)
+    counted.append_transactions([{
+        "id": 9002, "date": "2025-08-31", "time": "09:00", "merchant": "GS25", "category": "편의점",
+        "amount": -3000, "type": "결제", "balance": 0, "memo": None,
+        "recipient_name": None, "recipient_account": None, "recipient_bank": None,
+    }])
+    counted.process_query("스타벅스 결제내역", log_query=False)
+    assert len(counted.calls) == 2
+
+
+def test_degraded_results_are_not_cached(counted):
+    degraded = counted.process_query("스타벅스 결제내역", log_query=False, allow_llm=False)
+    assert degraded["degraded"]
+    counted.process_query("스타벅스 결제내역", log_query=False, allow_llm=False)
+    assert len(counted.calls) == 2
+
+
+def test_hedged_result_is_not_cached_and_late_gemini_answer_is_used(service, monkeypatch):
+    gemini = SlowGemini()
+    service.nlp_service.llm = gemini
+    # 로컬 분류기로 끝나지 않고 Gemini와 hedge 하도록
+    monkeypatch.setattr(settings, "NLP_CONFIDENCE_THRESHOLD", 1.01)
+    monkeypatch.setattr(settings, "SEARCH_HEDGE_SECONDS", 0.05)
+
+    started = time.monotonic()
+    first = service.process_query("스타벅스 송금", log_query=False)
+    assert time.monotonic() - started < 2
+    assert first["success"]
+    assert service.result_cache.get("스타벅스 송금") is None
+
+    # 지연된 Gemini 결과가 의도 캐시에 들어온 뒤에는 규칙 기반 결과 대신 Gemini 결과로 처리
+    gemini.release.set()
+    limit = time.monotonic() + 2
+    while service.nlp_service.intent_cache.get("스타벅스 송금") is None:
+        assert time.monotonic() < limit
+        time.sleep(0.01)
+
+    second = service.process_query("스타벅스 송금", log_query=False)
+    assert second is not first
+    assert second["action_type"] == "search"
+    assert gemini.calls == 1
+    assert service.result_cache.get("스타벅스 송금") is not None
+
+
+def test_fallback_result_after_gemini_error_is_not_cached(service, monkeypatch):
+    gemini = FailingGemini()
+    service.nlp_service.llm = gemini
+    monkeypatch.setattr(settings, "NLP_CONFIDENCE_THRESHOLD", 1.01)
+
+    first = service.process_query("스타벅스 송금", log_query=False)
+    assert first["success"]
+    assert service.result_cache.get("스타벅스 송금") is None
+    assert service.nlp_service.intent_cache.get("스타벅스 송금") is None
+
+    # 다음 같은 검색은 캐시된 폴백 결과 대신 Gemini를 다시 시도
+    second = service.process_query("스타벅스 송금", log_query=False)
+    assert second is not first
+    assert gemini.calls == 2
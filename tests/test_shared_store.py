@@ -0,0 +1,80 @@
+"""공유 메모리 거래내역 저장소 (게시 → 워커 연결 → 버전 교체)"""
+import os
+import uuid
+
+import pytest
+
+from app.repositories.shared_store import SharedRepositoryProvider, SharedStorePublisher
+from app.repositories.transaction_repo import TransactionRepository
+
+
+@pytest.fixture
+def prefix():
+    return f"soltest_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def publisher(prefix):
+    publisher = SharedStorePublisher(prefix)
+    yield publisher
+    publisher.close()
+
+
+@pytest.fixture
+def provider(prefix, publisher):
+    provider = SharedRepositoryProvider(prefix)
+    yield provider
+    provider.close()
+
+
+def _ids(records):
+    return [record.id for record in records]
+
+
+def test_attached_repository_matches_local_repository(publisher, provider, sample_rows):
+    publisher.publish(sample_rows)
+    shared = provider.get()
+    local = TransactionRepository(sample_rows)
+
+    assert len(shared) == len(local)
+    assert _ids(shared.find_all()) == _ids(local.find_all())
+    assert [t.to_dict() for t in shared.find_all()] == [t.to_dict() for t in local.find_all()]
+    for filters in ({"merchant": "스타벅스"}, {"type": "송금"}, {"date_from": "2025-08-01", "min_amount": 10000}):
+        assert _ids(shared.query(filters)["transactions"]) == _ids(local.query(filters)["transactions"])
+    assert shared.get_recent_transfer_contacts() == local.get_recent_transfer_contacts()
+    # 같은 버전이면 레포지토리를 다시 만들지 않음
+    assert provider.get() is shared
+
+
+def test_shared_repository_is_read_only(publisher, provider, sample_rows, make_row):
+    publisher.publish(sample_rows)
+    repo = provider.get()
+    with pytest.raises(RuntimeError):
+        repo.append(make_row(99, "2025-09-01"))
+    with pytest.raises(RuntimeError):
+        repo.appended([make_row(99, "2025-09-01")])
+
+
+def test_new_version_swaps_repository_and_old_one_stays_readable(publisher, provider, sample_rows, make_row):
+    publisher.publish(sample_rows)
+    old = provider.get()
+    old_ids = _ids(old.find_all())
+
+    publisher.publish(sample_rows + [make_row(8, "2025-09-01", merchant="올리브영")])
+    new = provider.get()
+    assert new is not old
+    assert len(new) == len(sample_rows) + 1
+    assert new.find_all()[0].merchant == "올리브영"
+
+    # 이전 버전 세그먼트를 지워도 이미 매핑한 레포지토리는 계속 읽힘
+    publisher.retire_old_versions(grace_seconds=0)
+    assert _ids(old.find_all()) == old_ids
+
+
+def test_get_before_publish_raises(prefix, publisher):
+    provider = SharedRepositoryProvider(prefix)
+    try:
+        with pytest.raises(FileNotFoundError):
+            provider.get()
+    finally:
+        provider.close()
@@ -0,0 +1,92 @@
+"""검색어 자동완성 (자모/초성 매칭, 단어 시작 매칭, frecency 순위, 검색어 정리)"""
+import pytest
+
+from app.repositories.transaction_repo import TransactionRepository
+from app.services import suggest_service as suggest_module
+from app.services.hangul import choseong, decompose, is_choseong_query
+from app.services.suggest_service import PrefixTrie, SuggestionEntry, SuggestService, frecency_weight
+
+
+@pytest.fixture
+def service(sample_rows):
+    return SuggestService(TransactionRepository(sample_rows))
+
+
+def _texts(suggestions):
+    return [item["text"] for item in suggestions]
+
+
+def test_hangul_decomposition():
+    assert decompose("김처") == "ㄱㅣㅁㅊㅓ"
+    assert decompose("김철수").startswith(decompose("김처"))
+    assert choseong("김철수") == "ㄱㅊㅅ"
+    assert is_choseong_query("ㄱㅊㅅ")
+    assert not is_choseong_query("김ㅊ")
+
+
+def test_partial_syllable_and_choseong_match_contacts(service):
+    assert _texts(service.suggest("김처")) == ["김철수"]
+    assert service.suggest("김처")[0]["query"] == "김철수 송금"
+    assert _texts(service.suggest("ㄱㅊㅅ")) == ["김철수"]
+    assert _texts(service.suggest("ㅎㄱㄷ")) == ["홍길동"]
+
+
+def test_word_start_and_ignores_spaces(service):
+    assert "스타벅스 강남점" in _texts(service.suggest("강남"))
+    assert "스타벅스 강남점" in _texts(service.suggest("스타벅스강"))
+    assert service.suggest("   ") == []
+    assert service.suggest("없는가게") == []
+
+
+def test_frecency_prefers_recent_and_frequent_usage(service):
+    def queries(prefix):
+        return [item["text"] for item in service.suggest(prefix) if item["type"] == "query"]
+
+    now = suggest_module._EPOCH + 400 * 86400
+    month_ago = now - 30 * 86400
+    service.record_query("홍길동 송금 내역", timestamp=month_ago)
+    service.record_query("홍길동 3만원", timestamp=now)
+    assert queries("홍길동 ") == ["홍길동 3만원", "홍길동 송금 내역"]
+
+    # 30일 전 사용 한 번은 반감기(14일) 두 번 남짓 감쇠 → 다섯 번이면 최근 한 번보다 앞섬
+    for _ in range(4):
+        service.record_query("홍길동 송금 내역", timestamp=month_ago)
+    assert queries("홍길동 ") == ["홍길동 송금 내역", "홍길동 3만원"]
+    assert frecency_weight(now) == pytest.approx(2 * frecency_weight(now - 14 * 86400))
+
+
+def test_new_transaction_becomes_suggestion(service, make_row):
+    service.add_transaction(TransactionRepository([
+        make_row(9, "2025-08-30", amount=-30000, type="송금", category="송금",
+                 recipient="박영희", bank="우리은행", account="1002"),
+    ]).row(0))
+    assert _texts(service.suggest("ㅂㅇㅎ")) == ["박영희"]
+
+
+def test_query_entries_are_evicted_by_lowest_score(service, monkeypatch):
+    monkeypatch.setattr(suggest_module, "MAX_QUERY_ENTRIES", 3)
+    monkeypatch.setattr(suggest_module, "QUERY_EVICTION_SLACK", 0.0)
+    base = suggest_module._EPOCH + 100 * 86400
+    for index, query in enumerate(["가계부 1", "가계부 2", "가계부 3", "가계부 4"]):
+        service.record_query(query, timestamp=base + index * 86400)
+
+    assert _texts(service.suggest("가계부")) == ["가계부 4", "가계부 3", "가계부 2"]
+    assert service._query_count == 3
+
+
+def test_trie_keeps_top_k_and_recomputes_after_remove():
+    trie = PrefixTrie(top_k=2)
+    entries = []
+    for index, name in enumerate(["abc", "abd", "abe"]):
+        entry = SuggestionEntry("query", name, name)
+        entry.score = index + 1
+        trie.insert(name, entry)
+        entries.append(entry)
+
+    assert [entry.text for entry in trie.search("ab")] == ["abe", "abd"]
+    trie.remove("abe", entries[2])
+    assert [entry.text for entry in trie.search("ab")] == ["abd", "abc"]
+    # 점수가 오르면 경로의 상위 K에 바로 반영
+    entries[0].score = 10
+    trie.update("abc", entries[0])
+    assert [entry.text for entry in trie.search("a")] == ["abc", "abd"]
@@ -0,0 +1,93 @@
+"""요청별 구간 계측 (Server-Timing 헤더, Chrome trace 파일)"""
+import asyncio
+import json
+import threading
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from app.tracing import Trace, TracingMiddleware, current_trace, span, traced
+
+
+@traced("repo.lookup")
+def lookup():
+    time.sleep(0.002)
+    return "found"
+
+
+def handle_search():
+    """검색 처리처럼 구간을 나눠 기록 (같은 이름 구간 두 번)"""
+    with span("nlp"):
+        time.sleep(0.002)
+    lookup()
+    lookup()
+
+
+async def endpoint(scope, receive, send):
+    await run_in_threadpool(handle_search)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _call(middleware, path="/api/search"):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware({"type": "http", "method": "POST", "path": path, "headers": []}, receive, send))
+    return dict(sent[0]["headers"])
+
+
+def _entries(header: bytes):
+    return {entry.split(";")[0]: entry for entry in header.decode().split(", ")}
+
+
+def test_span_outside_request_is_noop():
+    assert current_trace() is None
+    with span("nlp"):
+        pass
+    assert lookup() == "found"
+
+
+def test_server_timing_sums_repeated_spans():
+    trace = Trace("POST /api/search")
+    trace.spans = [("nlp", 1.0, 0.010, 1), ("repo.lookup", 1.1, 0.002, 1), ("repo.lookup", 1.2, 0.003, 2)]
+    header = trace.server_timing()
+    assert header.startswith('nlp;dur=10.00, repo.lookup;dur=5.00;desc="x2", total;dur=')
+
+
+def test_middleware_adds_server_timing_with_thread_pool_spans():
+    headers = _call(TracingMiddleware(endpoint))
+    entries = _entries(headers[b"server-timing"])
+    assert list(entries) == ["nlp", "repo.lookup", "total"]
+    assert 'desc="x2"' in entries["repo.lookup"]
+    assert headers[b"timing-allow-origin"] == b"*"
+
+
+def test_untraced_path_has_no_header():
+    assert b"server-timing" not in _call(TracingMiddleware(endpoint), path="/api/search/suggest")
+
+
+def test_chrome_trace_export(tmp_path):
+    path = tmp_path / "traces" / "search.json"
+    middleware = TracingMiddleware(endpoint, server_timing=False, export_path=str(path))
+    threads = [threading.Thread(target=_call, args=(middleware,)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert b"server-timing" not in _call(middleware, path="/api/search")
+
+    # 닫는 ]가 없는 JSON 배열 (trace 뷰어 형식)
+    text = path.read_text(encoding="utf-8")
+    assert text.startswith("[\n")
+    events = json.loads(text.rstrip().rstrip(",") + "]")
+    requests = [event for event in events if event["cat"] == "request"]
+    assert len(requests) == 3
+    assert all(event["args"] == {"status": 200} for event in requests)
+    assert {event["name"] for event in events} == {"POST /api/search", "nlp", "repo.lookup"}
+    assert all(event["ph"] == "X" and event["dur"] > 0 for event in events)
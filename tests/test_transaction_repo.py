@@ -0,0 +1,68 @@
+"""TransactionRepository 세대 교체 (copy-on-write)"""
+from app.repositories.transaction_repo import TransactionRepository
+
+
+def _ids(records):
+    return [record.id for record in records]
+
+
+def test_appended_returns_next_generation_without_touching_current(sample_rows, make_row):
+    repo = TransactionRepository(sample_rows)
+    successor = repo.appended([make_row(8, "2025-08-25", merchant="스타벅스 판교점", category="카페")])
+
+    assert successor.lineage == repo.lineage
+    assert successor.generation == repo.generation + 1
+    assert successor.snapshot != repo.snapshot
+    assert len(repo) == 7 and len(successor) == 8
+    assert repo.query({"merchant": "스타벅스"})["total_count"] == 2
+    assert successor.query({"merchant": "스타벅스"})["total_count"] == 3
+
+
+def test_reader_holding_old_generation_keeps_consistent_snapshot(sample_rows, make_row):
+    repo = TransactionRepository(sample_rows)
+    before = _ids(repo.iter_recent())
+    facets_before = repo.facet_counts()
+
+    # 읽는 쪽이 앞 세대를 잡고 있는 동안 거래 추가 (같은 카테고리/타입 비트맵을 건드림)
+    successor = repo.appended([
+        make_row(8, "2025-08-25", amount=-7000, merchant="스타벅스 판교점", category="카페"),
+        make_row(9, "2025-06-30", amount=-30000, type="송금", category="송금",
+                 recipient="홍길동", bank="신한은행", account="110-111-111111"),
+    ])
+
+    assert _ids(repo.iter_recent()) == before
+    assert repo.facet_counts() == facets_before
+    assert repo.query({"category": "카페"})["total_count"] == 2
+    assert repo.query({"date_from": "2025-06-01", "date_to": "2025-06-30"})["total_count"] == 0
+    assert repo.find_contact_by_name("홍길동") == successor.find_contact_by_name("홍길동")
+
+    assert _ids(successor.iter_recent())[0] == "8"
+    assert _ids(successor.iter_recent())[-1] == "9"
+    assert successor.query({"category": "카페"})["total_count"] == 3
+    assert successor.facet_counts()["type"]["송금"] == facets_before["type"]["송금"] + 1
+
+
+def test_writable_bitmap_copies_shared_bitmaps_once(sample_rows, make_row):
+    repo = TransactionRepository(sample_rows)
+    successor = repo.appended([make_row(8, "2025-08-25", merchant="쿠팡", category="쇼핑")])
+
+    # 건드린 비트맵만 복사하고, 건드리지 않은 비트맵은 앞 세대와 공유
+    assert successor._by_category["쇼핑"] is not repo._by_category["쇼핑"]
+    assert successor._by_category["카페"] is repo._by_category["카페"]
+    assert 7 not in repo._by_category["쇼핑"]
+    assert 7 in successor._by_category["쇼핑"]
+
+    # 이미 이 세대가 복사한 비트맵은 다시 복사하지 않음
+    owned = successor._writable_bitmap(successor._by_category, "쇼핑")
+    assert owned is successor._by_category["쇼핑"]
+    assert successor._writable_bitmap(successor._by_category, "쇼핑") is owned
+
+    # 다음 세대는 다시 자기 복사본을 만듦
+    third = successor.appended([make_row(9, "2025-08-26", merchant="쿠팡", category="쇼핑")])
+    assert third._by_category["쇼핑"] is not successor._by_category["쇼핑"]
+    assert len(successor._by_category["쇼핑"]) == 2
+    assert len(third._by_category["쇼핑"]) == 3
+
+
+def test_new_lineage_for_independent_repository(sample_rows):
+    assert TransactionRepository(sample_rows).lineage != TransactionRepository(sample_rows).lineage